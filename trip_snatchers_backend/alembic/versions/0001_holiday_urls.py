@@ -0,0 +1,130 @@
+"""Share one holiday_urls row between every track of the same canonical URL
+
+Revision ID: 0001_holiday_urls
+Revises:
+Create Date: 2026-10-17
+
+"""
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+from scraping_scripts.url_utils import canonicalize_url
+
+revision = "0001_holiday_urls"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+holiday_urls = sa.Table(
+    "holiday_urls",
+    sa.MetaData(),
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("url", sa.String),
+    sa.Column("latest_price", sa.Float),
+    sa.Column("created_at", sa.DateTime),
+)
+
+
+def _columns(table):
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _indexes(table):
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _backfill(has_price):
+    """Point every track at the holiday_urls row of its canonical URL, creating rows as needed"""
+    bind = op.get_bind()
+    tracks = sa.table(
+        "holiday_tracks",
+        sa.column("id", sa.Integer),
+        sa.column("url", sa.String),
+        sa.column("holiday_url_id", sa.Integer),
+        sa.column("current_price", sa.Float),
+        sa.column("created_at", sa.DateTime),
+    )
+    columns = [tracks.c.id, tracks.c.url]
+    if has_price:
+        columns.append(tracks.c.current_price)
+    # Oldest first, so the most recently created track's price ends up on the shared row
+    rows = bind.execute(
+        sa.select(*columns).where(tracks.c.holiday_url_id.is_(None)).order_by(tracks.c.created_at, tracks.c.id)
+    ).fetchall()
+    url_ids = dict(bind.execute(sa.select(holiday_urls.c.url, holiday_urls.c.id)).fetchall())
+
+    for row in rows:
+        canonical = canonicalize_url(row.url)
+        if not canonical:
+            continue
+        url_id = url_ids.get(canonical)
+        if url_id is None:
+            url_id = bind.execute(
+                holiday_urls.insert().values(url=canonical, created_at=datetime.utcnow())
+            ).inserted_primary_key[0]
+            url_ids[canonical] = url_id
+        if has_price and row.current_price is not None:
+            bind.execute(
+                holiday_urls.update().where(holiday_urls.c.id == url_id).values(latest_price=row.current_price)
+            )
+        bind.execute(tracks.update().where(tracks.c.id == row.id).values(holiday_url_id=url_id))
+
+
+def upgrade() -> None:
+    # The app's create_all may already have created the new table on startup
+    if "holiday_urls" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "holiday_urls",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("url", sa.String(), nullable=True),
+            sa.Column("latest_price", sa.Float(), nullable=True),
+            sa.Column("departure_date", sa.String(), nullable=True),
+            sa.Column("last_scraped_at", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_holiday_urls_id", "holiday_urls", ["id"])
+        op.create_index("ix_holiday_urls_url", "holiday_urls", ["url"], unique=True)
+
+    track_columns = _columns("holiday_tracks")
+    if "holiday_url_id" not in track_columns:
+        with op.batch_alter_table("holiday_tracks") as batch:
+            batch.add_column(sa.Column("holiday_url_id", sa.Integer(), nullable=True))
+            batch.create_index("ix_holiday_tracks_holiday_url_id", ["holiday_url_id"])
+            batch.create_foreign_key(
+                "fk_holiday_tracks_holiday_url_id", "holiday_urls", ["holiday_url_id"], ["id"]
+            )
+
+    _backfill(has_price="current_price" in track_columns)
+
+    # Price and canonical URL now live on holiday_urls only
+    obsolete = [column for column in ("current_price", "canonical_url") if column in track_columns]
+    if obsolete:
+        with op.batch_alter_table("holiday_tracks") as batch:
+            if "ix_holiday_tracks_canonical_url" in _indexes("holiday_tracks"):
+                batch.drop_index("ix_holiday_tracks_canonical_url")
+            for column in obsolete:
+                batch.drop_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("holiday_tracks") as batch:
+        batch.add_column(sa.Column("current_price", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("canonical_url", sa.String(), nullable=True))
+
+    op.execute("""
+        UPDATE holiday_tracks
+        SET current_price = (SELECT latest_price FROM holiday_urls WHERE holiday_urls.id = holiday_tracks.holiday_url_id),
+            canonical_url = (SELECT url FROM holiday_urls WHERE holiday_urls.id = holiday_tracks.holiday_url_id)
+    """)
+
+    with op.batch_alter_table("holiday_tracks") as batch:
+        batch.create_index("ix_holiday_tracks_canonical_url", ["canonical_url"])
+        batch.drop_constraint("fk_holiday_tracks_holiday_url_id", type_="foreignkey")
+        batch.drop_index("ix_holiday_tracks_holiday_url_id")
+        batch.drop_column("holiday_url_id")
+
+    op.drop_index("ix_holiday_urls_url", table_name="holiday_urls")
+    op.drop_index("ix_holiday_urls_id", table_name="holiday_urls")
+    op.drop_table("holiday_urls")
@@ -0,0 +1,59 @@
+"""Append-only price observations and their hourly/daily rollups
+
+Revision ID: 0002_price_history
+Revises: 0001_holiday_urls
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002_price_history"
+down_revision = "0001_holiday_urls"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if "price_observations" not in tables:
+        op.create_table(
+            "price_observations",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("holiday_url_id", sa.Integer(), sa.ForeignKey("holiday_urls.id"), nullable=False),
+            sa.Column("observed_at", sa.DateTime(), nullable=False),
+            sa.Column("price", sa.Float(), nullable=False),
+        )
+        op.create_index("ix_price_observations_url_time", "price_observations", ["holiday_url_id", "observed_at"])
+
+        # The latest price of each URL is the only history there is so far
+        op.execute("""
+            INSERT INTO price_observations (holiday_url_id, observed_at, price)
+            SELECT id, COALESCE(last_scraped_at, created_at), latest_price
+            FROM holiday_urls
+            WHERE latest_price IS NOT NULL
+        """)
+
+    if "price_rollups" not in tables:
+        op.create_table(
+            "price_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("holiday_url_id", sa.Integer(), sa.ForeignKey("holiday_urls.id"), nullable=False),
+            sa.Column("resolution", sa.String(), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(), nullable=False),
+            sa.Column("min_price", sa.Float(), nullable=False),
+            sa.Column("max_price", sa.Float(), nullable=False),
+            sa.Column("last_price", sa.Float(), nullable=False),
+            sa.Column("last_observed_at", sa.DateTime(), nullable=False),
+            sa.Column("samples", sa.Integer(), nullable=False),
+        )
+        op.create_index(
+            "ix_price_rollups_url_bucket", "price_rollups", ["holiday_url_id", "resolution", "bucket_start"], unique=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_price_rollups_url_bucket", table_name="price_rollups")
+    op.drop_table("price_rollups")
+    op.drop_index("ix_price_observations_url_time", table_name="price_observations")
+    op.drop_table("price_observations")
@@ -0,0 +1,26 @@
+"""Index active tracks of each URL by target price
+
+Revision ID: 0003_track_target_index
+Revises: 0002_price_history
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0003_track_target_index"
+down_revision = "0002_price_history"
+branch_labels = None
+depends_on = None
+
+INDEX = "ix_holiday_tracks_url_active_target"
+
+
+def upgrade() -> None:
+    indexes = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("holiday_tracks")}
+    if INDEX not in indexes:
+        op.create_index(INDEX, "holiday_tracks", ["holiday_url_id", "is_active", "target_price"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="holiday_tracks")
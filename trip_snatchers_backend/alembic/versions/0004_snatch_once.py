@@ -0,0 +1,47 @@
+"""Link each snatched deal to its track, at most one deal per track
+
+Revision ID: 0004_snatch_once
+Revises: 0003_track_target_index
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_snatch_once"
+down_revision = "0003_track_target_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("snatched_deals")}
+    if "holiday_track_id" in columns:
+        return
+    with op.batch_alter_table("snatched_deals") as batch:
+        batch.add_column(sa.Column("holiday_track_id", sa.Integer(), nullable=True))
+
+    # Only the first deal of a track is linked; duplicates from earlier races stay unlinked
+    op.execute("""
+        UPDATE snatched_deals
+        SET holiday_track_id = (
+            SELECT holiday_tracks.id FROM holiday_tracks
+            WHERE holiday_tracks.user_id = snatched_deals.user_id
+              AND holiday_tracks.url = snatched_deals.holiday_url
+              AND holiday_tracks.created_at = snatched_deals.date_tracked
+            ORDER BY holiday_tracks.id
+            LIMIT 1
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM snatched_deals GROUP BY user_id, holiday_url, date_tracked
+        )
+    """)
+
+    with op.batch_alter_table("snatched_deals") as batch:
+        batch.create_unique_constraint("uq_snatched_deals_holiday_track_id", ["holiday_track_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("snatched_deals") as batch:
+        batch.drop_constraint("uq_snatched_deals_holiday_track_id", type_="unique")
+        batch.drop_column("holiday_track_id")
@@ -0,0 +1,40 @@
+"""Outbox of emails waiting to be sent
+
+Revision ID: 0005_email_outbox
+Revises: 0004_snatch_once
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_email_outbox"
+down_revision = "0004_snatch_once"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "email_outbox" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("to_email", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_email_outbox_id", "email_outbox", ["id"])
+    op.create_index("ix_email_outbox_status_due", "email_outbox", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_status_due", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_id", table_name="email_outbox")
+    op.drop_table("email_outbox")
@@ -0,0 +1,36 @@
+"""Snatch alerts waiting to be combined into per-user digests
+
+Revision ID: 0006_pending_alerts
+Revises: 0005_email_outbox
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_pending_alerts"
+down_revision = "0005_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "pending_alerts" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "pending_alerts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("to_email", sa.String(), nullable=False),
+        sa.Column("holiday_url", sa.String(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_pending_alerts_id", "pending_alerts", ["id"])
+    op.create_index("ix_pending_alerts_created_at", "pending_alerts", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pending_alerts_created_at", table_name="pending_alerts")
+    op.drop_index("ix_pending_alerts_id", table_name="pending_alerts")
+    op.drop_table("pending_alerts")
@@ -0,0 +1,38 @@
+"""Keep a URL as entered on each holiday URL, fetched instead of the canonical key
+
+Revision ID: 0007_holiday_url_fetch_url
+Revises: 0006_pending_alerts
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_holiday_url_fetch_url"
+down_revision = "0006_pending_alerts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("holiday_urls")}
+    if "fetch_url" not in columns:
+        with op.batch_alter_table("holiday_urls") as batch:
+            batch.add_column(sa.Column("fetch_url", sa.String(), nullable=True))
+
+    # The oldest track's URL stands for the search; rows without tracks keep fetching the canonical URL
+    op.execute("""
+        UPDATE holiday_urls
+        SET fetch_url = (
+            SELECT holiday_tracks.url FROM holiday_tracks
+            WHERE holiday_tracks.holiday_url_id = holiday_urls.id
+            ORDER BY holiday_tracks.id
+            LIMIT 1
+        )
+        WHERE fetch_url IS NULL
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("holiday_urls") as batch:
+        batch.drop_column("fetch_url")
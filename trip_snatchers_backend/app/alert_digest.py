@@ -0,0 +1,67 @@
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from . import models
+from .email_utils import price_alert_digest_email, price_alert_email
+
+logger = logging.getLogger("AlertDigest")
+
+# Longest a snatch alert waits for more of the same user's snatches to share its email;
+# 0 mails every snatch batch straight away
+DIGEST_MAX_DELAY_SECONDS = float(os.getenv("ALERT_DIGEST_MAX_DELAY_SECONDS", "300"))
+
+
+def flush_alert_digests(db: Session, force: bool = False, now: datetime = None):
+    """
+    Turn pending alerts into outbox emails, one per user. A user's alerts are mailed once
+    the oldest has waited DIGEST_MAX_DELAY_SECONDS, or straight away when ``force`` is set
+    (e.g. at the end of an update cycle, when no more snatches are coming).
+
+    The emails are queued and their alerts deleted in one transaction, and the delete must
+    remove every alert read, so two flushes never mail the same snatch. Returns the number
+    of emails queued.
+    """
+    now = now or datetime.utcnow()
+    alerts = db.query(models.PendingAlert).order_by(models.PendingAlert.created_at, models.PendingAlert.id).all()
+    by_user = defaultdict(list)
+    for alert in alerts:
+        by_user[alert.user_id].append(alert)
+
+    cutoff = now - timedelta(seconds=DIGEST_MAX_DELAY_SECONDS)
+    due = [user_alerts for user_alerts in by_user.values() if force or user_alerts[0].created_at <= cutoff]
+    if not due:
+        return 0
+
+    emails = []
+    ids = []
+    for user_alerts in due:
+        if len(user_alerts) == 1:
+            subject, body = price_alert_email(user_alerts[0].holiday_url, user_alerts[0].price)
+        else:
+            subject, body = price_alert_digest_email([(alert.holiday_url, alert.price) for alert in user_alerts])
+        emails.append({"to_email": user_alerts[-1].to_email, "subject": subject, "body": body})
+        ids.extend(alert.id for alert in user_alerts)
+
+    try:
+        deleted = db.execute(
+            delete(models.PendingAlert)
+            .where(models.PendingAlert.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if deleted != len(ids):
+            # Another flush got to some of these first; leave them to it
+            db.rollback()
+            return 0
+        db.execute(insert(models.EmailOutbox), emails)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"Queued {len(emails)} alert email(s) for {len(ids)} snatch(es)")
+    return len(emails)
@@ -0,0 +1,176 @@
+"""Async versions of the crud functions the API routes use, on an AsyncSession"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models, schemas
+from scraping_scripts.url_utils import canonicalize_url
+
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.get(models.User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(models.User).where(models.User.email == email))
+
+async def create_user(
+    db: AsyncSession,
+    user: schemas.UserCreate,
+    hashed_password: str,
+    verification_token: str,
+    verification_token_expires: datetime
+):
+    db_user = models.User(
+        first_name=user.first_name,
+        last_name=user.last_name,
+        email=user.email,
+        phone=user.phone,
+        country=user.country,
+        age=user.age,
+        gender=user.gender,
+        hashed_password=hashed_password,
+        verification_token=verification_token,
+        verification_token_expires=verification_token_expires,
+        is_verified=False
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def get_user_by_verification_token(db: AsyncSession, token: str):
+    return await db.scalar(select(models.User).where(models.User.verification_token == token))
+
+async def verify_user(db: AsyncSession, user_id: int):
+    db_user = await get_user(db, user_id)
+    if db_user:
+        db_user.is_verified = True
+        db_user.verification_token = None
+        db_user.verification_token_expires = None
+        await db.commit()
+        await db.refresh(db_user)
+    return db_user
+
+async def update_user(db: AsyncSession, user_id: int, user: schemas.UserUpdate):
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return None
+    
+    update_data = user.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_user, field, value)
+    
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_password_hash(db: AsyncSession, user_id: int, hashed_password: str):
+    await db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(hashed_password=hashed_password)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+async def update_verification_token(db: AsyncSession, user_id: int, token: str, expires: datetime):
+    db_user = await get_user(db, user_id)
+    if db_user:
+        db_user.verification_token = token
+        db_user.verification_token_expires = expires
+        await db.commit()
+        await db.refresh(db_user)
+    return db_user
+
+async def get_user_stats(db: AsyncSession, user_id: int):
+    """Active track count and total savings, counted in the database rather than by loading every row"""
+    active_tracks = await db.scalar(
+        select(func.count(models.HolidayTrack.id))
+        .where(models.HolidayTrack.user_id == user_id, models.HolidayTrack.is_active == True)
+    )
+    total_savings = await db.scalar(
+        select(func.coalesce(func.sum(models.SnatchedDeal.initial_price - models.SnatchedDeal.snatched_price), 0.0))
+        .where(models.SnatchedDeal.user_id == user_id)
+    )
+    return {"active_tracks": active_tracks, "total_savings": total_savings}
+
+async def get_or_create_holiday_url(db: AsyncSession, url: str):
+    canonical = canonicalize_url(url)
+    query = select(models.HolidayUrl).where(models.HolidayUrl.url == canonical)
+    db_url = await db.scalar(query)
+    if db_url:
+        return db_url
+    try:
+        async with db.begin_nested():
+            db_url = models.HolidayUrl(url=canonical, fetch_url=url.strip())
+            db.add(db_url)
+    except IntegrityError:
+        # Another request tracked the same URL first
+        db_url = await db.scalar(query)
+    return db_url
+
+async def create_holiday_track(
+    db: AsyncSession, holiday: schemas.HolidayTrackCreate, user_id: int, current_price: Optional[float] = None
+):
+    holiday_data = holiday.model_dump()
+    submitted_price = holiday_data.pop('current_price', None)
+    if current_price is None:
+        current_price = submitted_price
+    
+    holiday_url = await get_or_create_holiday_url(db, holiday.url)
+    # A price the user supplied only seeds URLs that have never been scraped
+    if current_price is not None and holiday_url.last_scraped_at is None:
+        holiday_url.latest_price = current_price
+    
+    db_holiday = models.HolidayTrack(
+        **holiday_data,
+        holiday_url=holiday_url,
+        user_id=user_id
+    )
+    db.add(db_holiday)
+    await db.commit()
+    await db.refresh(db_holiday)
+    return db_holiday
+
+async def get_user_holiday_tracks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100):
+    result = await db.scalars(
+        select(models.HolidayTrack)
+        .where(models.HolidayTrack.user_id == user_id, models.HolidayTrack.is_active == True)
+        .offset(skip).limit(limit)
+    )
+    return result.all()
+
+async def get_holiday_track(db: AsyncSession, holiday_id: int, user_id: int):
+    return await db.scalar(
+        select(models.HolidayTrack)
+        .where(models.HolidayTrack.id == holiday_id, models.HolidayTrack.user_id == user_id)
+    )
+
+async def delete_holiday_track(db: AsyncSession, holiday_id: int, user_id: int):
+    db_holiday = await get_holiday_track(db, holiday_id, user_id)
+    if db_holiday:
+        # SQLite may hand a deleted track's id to the next track, which must still be snatchable
+        await db.execute(
+            update(models.SnatchedDeal)
+            .where(models.SnatchedDeal.holiday_track_id == holiday_id)
+            .values(holiday_track_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        await db.delete(db_holiday)
+        await db.commit()
+        return True
+    return False
+
+async def get_user_snatched_deals(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100):
+    result = await db.scalars(
+        select(models.SnatchedDeal)
+        .where(models.SnatchedDeal.user_id == user_id)
+        .offset(skip).limit(limit)
+    )
+    return result.all()
+
+async def get_all_snatched_deals(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.scalars(select(models.SnatchedDeal).offset(skip).limit(limit))
+    return result.all()
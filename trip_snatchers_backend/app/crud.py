@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from . import models, schemas
 from datetime import datetime
 from typing import List, Optional
+from scraping_scripts.url_utils import canonicalize_url
 
 def get_user(db: Session, user_id: int):
     return db.query(models.User).filter(models.User.id == user_id).first()
@@ -78,15 +80,36 @@ def update_verification_token(db: Session, user_id: int, token: str, expires: da
         db.refresh(db_user)
     return db_user
 
+def get_or_create_holiday_url(db: Session, url: str):
+    canonical = canonicalize_url(url)
+    db_url = db.query(models.HolidayUrl).filter(models.HolidayUrl.url == canonical).first()
+    if db_url:
+        return db_url
+    try:
+        with db.begin_nested():
+            db_url = models.HolidayUrl(url=canonical, fetch_url=url.strip())
+            db.add(db_url)
+    except IntegrityError:
+        # Another request tracked the same URL first
+        db_url = db.query(models.HolidayUrl).filter(models.HolidayUrl.url == canonical).first()
+    return db_url
+
 def create_holiday_track(
     db: Session, holiday: schemas.HolidayTrackCreate, user_id: int, current_price: Optional[float] = None
 ):
     holiday_data = holiday.model_dump()
-    if current_price is not None:
-        holiday_data['current_price'] = current_price
+    submitted_price = holiday_data.pop('current_price', None)
+    if current_price is None:
+        current_price = submitted_price
+    
+    holiday_url = get_or_create_holiday_url(db, holiday.url)
+    # A price the user supplied only seeds URLs that have never been scraped
+    if current_price is not None and holiday_url.last_scraped_at is None:
+        holiday_url.latest_price = current_price
     
     db_holiday = models.HolidayTrack(
         **holiday_data,
+        holiday_url=holiday_url,
         user_id=user_id
     )
     db.add(db_holiday)
@@ -94,6 +117,47 @@ def create_holiday_track(
     db.refresh(db_holiday)
     return db_holiday
 
+def update_holiday_url_price(
+    db: Session, holiday_url_id: int, price: float, departure_date: Optional[str] = None,
+    scraped_at: Optional[datetime] = None
+):
+    """
+    One write updates the price seen by every track of the URL. A price scraped no later
+    than the stored one (e.g. served again from the scrape cache) is not recorded twice.
+    Returns whether the price was written.
+    """
+    scraped_at = scraped_at or datetime.utcnow()
+    values = {
+        models.HolidayUrl.latest_price: price,
+        models.HolidayUrl.last_scraped_at: scraped_at
+    }
+    if departure_date:
+        values[models.HolidayUrl.departure_date] = departure_date
+    updated = db.query(models.HolidayUrl)\
+        .filter(
+            models.HolidayUrl.id == holiday_url_id,
+            or_(models.HolidayUrl.last_scraped_at.is_(None), models.HolidayUrl.last_scraped_at < scraped_at)
+        )\
+        .update(values, synchronize_session=False)
+    if not updated:
+        return False
+    db.add(models.PriceObservation(
+        holiday_url_id=holiday_url_id,
+        observed_at=scraped_at,
+        price=price
+    ))
+    db.commit()
+    return True
+
+def update_holiday_price(db: Session, holiday_id: int, current_price: float):
+    db_holiday = db.query(models.HolidayTrack).filter(models.HolidayTrack.id == holiday_id).first()
+    if not db_holiday:
+        return None
+    update_holiday_url_price(db, db_holiday.holiday_url_id, current_price)
+    db.refresh(db_holiday)
+    db.refresh(db_holiday.holiday_url)
+    return db_holiday
+
 def get_user_holiday_tracks(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.HolidayTrack)\
         .filter(models.HolidayTrack.user_id == user_id, models.HolidayTrack.is_active == True)\
@@ -111,35 +175,15 @@ def get_holiday_track(db: Session, holiday_id: int, user_id: int):
 def delete_holiday_track(db: Session, holiday_id: int, user_id: int):
     db_holiday = get_holiday_track(db, holiday_id, user_id)
     if db_holiday:
+        # SQLite may hand a deleted track's id to the next track, which must still be snatchable
+        db.query(models.SnatchedDeal)\
+            .filter(models.SnatchedDeal.holiday_track_id == holiday_id)\
+            .update({models.SnatchedDeal.holiday_track_id: None}, synchronize_session=False)
         db.delete(db_holiday)
         db.commit()
         return True
     return False
 
-def create_snatched_deal(
-    db: Session,
-    user_id: int,
-    holiday_track: models.HolidayTrack,
-    snatched_price: float
-):
-    db_snatched = models.SnatchedDeal(
-        user_id=user_id,
-        holiday_url=holiday_track.url,
-        initial_price=holiday_track.current_price,
-        target_price=holiday_track.target_price,
-        snatched_price=snatched_price,
-        date_tracked=holiday_track.created_at,
-        date_snatched=datetime.utcnow()
-    )
-    db.add(db_snatched)
-    
-    # Deactivate the holiday track
-    holiday_track.is_active = False
-    
-    db.commit()
-    db.refresh(db_snatched)
-    return db_snatched
-
 def get_user_snatched_deals(db: Session, user_id: int, skip: int = 0, limit: int = 100):
     return db.query(models.SnatchedDeal)\
         .filter(models.SnatchedDeal.user_id == user_id)\
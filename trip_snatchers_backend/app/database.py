@@ -1,14 +1,21 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./trip_snatchers.db"
+# Same database through aiosqlite, for the API routes
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./trip_snatchers.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+# Objects stay readable after commit, since an async session can't lazily reload them
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency
@@ -17,4 +24,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency for async routes: queries run on aiosqlite's thread, not the event loop
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from . import models
+from .alert_digest import flush_alert_digests
+from .database import SessionLocal
+from .email_utils import deliver_email
+from .smtp_pool import SMTP_POOL_SIZE
+
+logger = logging.getLogger("EmailOutbox")
+
+# How often the dispatcher looks for due emails when nothing wakes it
+POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "10"))
+# Emails claimed per pass, sent over up to SMTP_POOL_SIZE pooled connections at once
+BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+# Sends attempted before an email is marked failed
+MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+# Retry delay after the first failure, doubled after each further one up to the cap
+BACKOFF_SECONDS = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "30"))
+MAX_BACKOFF_SECONDS = float(os.getenv("EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+# A claimed email not marked sent or failed within this long (e.g. the process died) is retried
+LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next send of an email that has failed ``attempts`` times"""
+    return min(BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS)
+
+
+def claim_due_emails(db: Session, now: datetime = None, limit: int = BATCH_SIZE):
+    """
+    Claim up to ``limit`` due emails by pushing their next attempt past the lease, so
+    another dispatcher (or this one after a crash) only picks them up once it expires.
+    The claim is a compare-and-set on status and due time; only emails it moved are returned.
+    """
+    now = now or datetime.utcnow()
+    due = db.query(models.EmailOutbox.id).filter(
+        models.EmailOutbox.status == PENDING,
+        models.EmailOutbox.next_attempt_at <= now
+    ).order_by(models.EmailOutbox.next_attempt_at).limit(limit)
+    ids = [row.id for row in due]
+    if not ids:
+        return []
+    try:
+        claimed = list(db.execute(
+            update(models.EmailOutbox)
+            .where(
+                models.EmailOutbox.id.in_(ids),
+                models.EmailOutbox.status == PENDING,
+                models.EmailOutbox.next_attempt_at <= now
+            )
+            .values(
+                attempts=models.EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=LEASE_SECONDS)
+            )
+            .returning(
+                models.EmailOutbox.id,
+                models.EmailOutbox.to_email,
+                models.EmailOutbox.subject,
+                models.EmailOutbox.body,
+                models.EmailOutbox.attempts
+            )
+            .execution_options(synchronize_session=False)
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return claimed
+
+
+def record_result(db: Session, email_id: int, attempts: int, error: str = None, now: datetime = None):
+    """Mark a claimed email sent, or schedule its retry with backoff, or give up after MAX_ATTEMPTS"""
+    now = now or datetime.utcnow()
+    if error is None:
+        values = {"status": SENT, "sent_at": now, "last_error": None}
+    elif attempts >= MAX_ATTEMPTS:
+        values = {"status": FAILED, "last_error": error}
+    else:
+        values = {"next_attempt_at": now + timedelta(seconds=retry_delay(attempts)), "last_error": error}
+    try:
+        db.query(models.EmailOutbox).filter(models.EmailOutbox.id == email_id)\
+            .update(values, synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+class EmailDispatcher:
+    """
+    Background thread draining the outbox; wake() starts a pass early. Each claimed batch
+    is sent by ``senders`` threads sharing the SMTP pool, while results are recorded here.
+    """
+
+    def __init__(self, poll_seconds=POLL_SECONDS, senders=SMTP_POOL_SIZE):
+        self.poll_seconds = poll_seconds
+        self._senders = ThreadPoolExecutor(max_workers=senders, thread_name_prefix="email-send")
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def dispatch_once(self):
+        """Queue the alert digests that are due, then send every email due now; returns how many were sent"""
+        sent = 0
+        db = SessionLocal()
+        try:
+            flush_alert_digests(db)
+            while not self._closed:
+                batch = claim_due_emails(db)
+                sends = [
+                    (email, self._senders.submit(deliver_email, email.to_email, email.subject, email.body))
+                    for email in batch
+                ]
+                for email, send in sends:
+                    error = send.exception()
+                    if error is not None:
+                        error = str(error) or error.__class__.__name__
+                        logger.warning(f"Email {email.id} to {email.to_email} failed (attempt {email.attempts}): {error}")
+                    record_result(db, email.id, email.attempts, error)
+                    sent += error is None
+                if len(batch) < BATCH_SIZE:
+                    break
+        finally:
+            db.close()
+        return sent
+
+    def _run(self):
+        while not self._closed:
+            try:
+                sent = self.dispatch_once()
+                if sent:
+                    logger.info(f"Sent {sent} email(s)")
+            except Exception:
+                logger.exception("Email outbox pass failed")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def shutdown(self, wait=True):
+        """Stop after the batch being sent; anything still pending is sent on the next start"""
+        self._closed = True
+        self._wake.set()
+        if wait:
+            self._thread.join()
+        self._senders.shutdown(wait=wait)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_email_dispatcher():
+    """Process-wide dispatcher, started on first use"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = EmailDispatcher()
+        return _dispatcher
+
+
+def wake_email_dispatcher():
+    """Have the dispatcher send newly committed emails now rather than at its next poll"""
+    get_email_dispatcher().wake()
+
+
+def shutdown_email_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is not None:
+            _dispatcher.shutdown()
+            _dispatcher = None
@@ -0,0 +1,100 @@
+from functools import lru_cache
+from html import escape
+from string import Formatter
+
+# Inline styles shared by every email; mail clients ignore <style> blocks, so they go on the tags
+BRAND_COLOR = "#0066cc"
+BODY_STYLE = "font-family: Arial, sans-serif; line-height: 1.6; color: #333;"
+CONTAINER_STYLE = "max-width: 600px; margin: 0 auto; padding: 20px;"
+HEADING_STYLE = f"color: {BRAND_COLOR};"
+BUTTON_STYLE = (
+    f"background-color: {BRAND_COLOR}; color: white; padding: 12px 24px; text-decoration: none; "
+    "border-radius: 4px; display: inline-block; font-weight: bold;"
+)
+CELL_STYLE = "padding: 8px; border-bottom: 1px solid #eee;"
+
+# Built once; every email body is HEADER + rendered content + FOOTER
+HEADER = f'<html><body style="{BODY_STYLE}"><div style="{CONTAINER_STYLE}">'
+FOOTER = "</div></body></html>"
+
+
+class EmailTemplate:
+    """
+    An email subject and HTML body compiled once into static chunks and the fields between them.
+
+    Rendering only escapes the context values and joins the pieces. Fields whose name ends
+    in ``_html`` are inserted as they are, for markup rendered by another template.
+    """
+
+    def __init__(self, subject, body, wrap=True):
+        self.subject = subject
+        self._chunks = self._compile(HEADER + body + FOOTER if wrap else body)
+
+    @staticmethod
+    def _compile(source):
+        chunks = []
+        for literal, field, _, _ in Formatter().parse(source):
+            chunks.append((literal, field, bool(field) and field.endswith("_html")))
+        return tuple(chunks)
+
+    def render_body(self, **context):
+        parts = []
+        for literal, field, raw in self._chunks:
+            parts.append(literal)
+            if field:
+                value = context[field]
+                parts.append(value if raw else escape(str(value)))
+        return "".join(parts)
+
+    def render(self, **context):
+        """Return (subject, html_body)"""
+        return self.subject.format(**context), self.render_body(**context)
+
+
+VERIFICATION = EmailTemplate(
+    "Verify Your Trip Snatchers Account",
+    f'<h2 style="{HEADING_STYLE}">Welcome to Trip Snatchers! ✈️</h2>'
+    "<p>Thank you for registering. Please verify your email address to start tracking holiday deals.</p>"
+    "<p>Click the button below to verify your email:</p>"
+    f'<p style="text-align: center;"><a href="{{link}}" style="{BUTTON_STYLE}">Verify Email</a></p>'
+    "<p>Or copy and paste this link in your browser:</p>"
+    '<p style="background-color: #f5f5f5; padding: 10px; border-radius: 4px; word-break: break-all;">{link}</p>'
+    "<p><strong>Note:</strong> This link will expire in 24 hours.</p>"
+    '<p style="color: #666; font-size: 0.9em;">'
+    "If you didn't create an account with Trip Snatchers, please ignore this email.</p>"
+)
+
+PRICE_ALERT = EmailTemplate(
+    "Your Trip Snatchers Alert!",
+    f'<h2 style="{HEADING_STYLE}">Great news! 🎉</h2>'
+    "<p>Your tracked holiday has reached your target price of €{price}!</p>"
+    f'<p style="text-align: center;"><a href="{{url}}" style="{BUTTON_STYLE}">View Holiday Deal</a></p>'
+    "<p><strong>Don't wait too long</strong> - prices can change quickly!</p>"
+)
+
+PRICE_ALERT_ROW = EmailTemplate(
+    "",
+    f'<tr><td style="{CELL_STYLE}">€{{price}}</td>'
+    f'<td style="{CELL_STYLE} text-align: right;">'
+    f'<a href="{{url}}" style="color: {BRAND_COLOR}; font-weight: bold;">View Holiday Deal</a></td></tr>',
+    wrap=False
+)
+
+PRICE_ALERT_DIGEST = EmailTemplate(
+    "Your Trip Snatchers Alert: {count} holidays hit your target price!",
+    f'<h2 style="{HEADING_STYLE}">Great news! 🎉</h2>'
+    "<p>{count} of your tracked holidays have reached your target price:</p>"
+    '<table style="width: 100%; border-collapse: collapse;">{rows_html}</table>'
+    "<p><strong>Don't wait too long</strong> - prices can change quickly!</p>"
+)
+
+
+@lru_cache(maxsize=1024)
+def render_price_alert(url, price):
+    """Every user snatching the same URL at the same price gets the same email, so it is rendered once"""
+    return PRICE_ALERT.render(url=url, price=price)
+
+
+def render_price_alert_digest(alerts):
+    rows = "".join(PRICE_ALERT_ROW.render_body(url=url, price=price) for url, price in alerts)
+    return PRICE_ALERT_DIGEST.render(count=len(alerts), rows_html=rows)
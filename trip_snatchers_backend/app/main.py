@@ -1,13 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from . import models
-from .database import engine
+from .database import async_engine
+from .migrations import upgrade_schema
 from .routes import auth, users, holidays, snatched
 from .scheduler import start_scheduler
+from scraping_scripts.driver_pool import shutdown_driver_pool
+from scraping_scripts.domain_scheduler import shutdown_domain_scheduler
+from scraping_scripts.site_memory import get_site_memory
+from scraping_scripts.fetch_engine import shutdown_extract_pool
+from scraping_scripts.chromedriver import shutdown_chrome_service
+from .email_outbox import get_email_dispatcher, shutdown_email_dispatcher
+from .smtp_pool import shutdown_smtp_pool
+from .password_hasher import shutdown_password_hasher
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Migrate an existing database to the latest schema, or create a new one
+upgrade_schema()
 
 app = FastAPI(
     title="Trip Snatchers API",
@@ -38,6 +46,26 @@ app.include_router(snatched.router)
 
 # Start the scheduler
 scheduler = start_scheduler()
+# Send queued emails, including any left pending when the API last stopped
+get_email_dispatcher()
+
+@app.on_event("shutdown")
+def shutdown_scrapers():
+    # Stop queueing scrapes, then quit the pooled Chrome instances so no orphaned browsers outlive the API
+    shutdown_domain_scheduler()
+    shutdown_driver_pool()
+    shutdown_chrome_service()
+    shutdown_extract_pool()
+    # Persist what was learned about each site (e.g. which fetch tier works)
+    get_site_memory().save()
+    # Emails not yet sent stay in the outbox for the next start
+    shutdown_email_dispatcher()
+    shutdown_smtp_pool()
+    shutdown_password_hasher()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
 
 @app.get("/")
 async def root():
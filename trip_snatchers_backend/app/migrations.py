@@ -1,5 +1,27 @@
-from sqlalchemy import create_engine, text
-from app.database import SQLALCHEMY_DATABASE_URL
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+from app import models
+from app.database import SQLALCHEMY_DATABASE_URL, engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+def upgrade_schema():
+    """
+    Run ``alembic upgrade head`` on an existing database, then create any missing tables.
+    A new database is created from the models and stamped at head, since the migrations
+    only alter tables that already exist.
+    """
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    existing = "holiday_tracks" in inspect(engine).get_table_names()
+    if existing:
+        command.upgrade(config, "head")
+    models.Base.metadata.create_all(bind=engine)
+    if not existing:
+        command.stamp(config, "head")
 
 def migrate():
     engine = create_engine(SQLALCHEMY_DATABASE_URL)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Index, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -23,24 +23,88 @@ class User(Base):
     holiday_tracks = relationship("HolidayTrack", back_populates="user")
     snatched_deals = relationship("SnatchedDeal", back_populates="user")
 
+class HolidayUrl(Base):
+    __tablename__ = "holiday_urls"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, index=True)  # canonical URL, shared by every track of the same search
+    fetch_url = Column(String, nullable=True)  # the first tracker's URL as entered; scraped instead of the canonical key
+    latest_price = Column(Float, nullable=True)
+    departure_date = Column(String, nullable=True)
+    last_scraped_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    tracks = relationship("HolidayTrack", back_populates="holiday_url")
+
 class HolidayTrack(Base):
     __tablename__ = "holiday_tracks"
+    # Active tracks of a URL sorted by target price: a new price finds every track it satisfies by range scan
+    __table_args__ = (Index("ix_holiday_tracks_url_active_target", "holiday_url_id", "is_active", "target_price"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    url = Column(String)
+    holiday_url_id = Column(Integer, ForeignKey("holiday_urls.id"), index=True)
+    url = Column(String)  # as the user entered it
     target_price = Column(Float)
-    current_price = Column(Float, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="holiday_tracks")
+    # Joined on every load so reads get the shared price without a query per track
+    holiday_url = relationship("HolidayUrl", back_populates="tracks", lazy="joined")
+
+    @property
+    def canonical_url(self):
+        return self.holiday_url.url if self.holiday_url else None
+
+    @property
+    def current_price(self):
+        return self.holiday_url.latest_price if self.holiday_url else None
+
+    @property
+    def departure_date(self):
+        return self.holiday_url.departure_date if self.holiday_url else None
+
+    @property
+    def last_scraped_at(self):
+        return self.holiday_url.last_scraped_at if self.holiday_url else None
+
+class PriceObservation(Base):
+    """One scraped price; append-only, compacted into PriceRollup rows once old"""
+    __tablename__ = "price_observations"
+    __table_args__ = (Index("ix_price_observations_url_time", "holiday_url_id", "observed_at"),)
+
+    id = Column(Integer, primary_key=True)
+    holiday_url_id = Column(Integer, ForeignKey("holiday_urls.id"), nullable=False)
+    observed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    price = Column(Float, nullable=False)
+
+class PriceRollup(Base):
+    """Min/max/last of a URL's prices over one hour or one day"""
+    __tablename__ = "price_rollups"
+    __table_args__ = (
+        Index("ix_price_rollups_url_bucket", "holiday_url_id", "resolution", "bucket_start", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    holiday_url_id = Column(Integer, ForeignKey("holiday_urls.id"), nullable=False)
+    resolution = Column(String, nullable=False)  # "hour" or "day"
+    bucket_start = Column(DateTime, nullable=False)
+    min_price = Column(Float, nullable=False)
+    max_price = Column(Float, nullable=False)
+    last_price = Column(Float, nullable=False)
+    last_observed_at = Column(DateTime, nullable=False)
+    samples = Column(Integer, default=1, nullable=False)
 
 class SnatchedDeal(Base):
     __tablename__ = "snatched_deals"
+    # One deal per track, however many workers see its target met
+    __table_args__ = (UniqueConstraint("holiday_track_id", name="uq_snatched_deals_holiday_track_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
+    # Not a foreign key: the deal outlives its track
+    holiday_track_id = Column(Integer, nullable=True)
     holiday_url = Column(String)
     initial_price = Column(Float)
     target_price = Column(Float)
@@ -48,4 +112,31 @@ class SnatchedDeal(Base):
     date_tracked = Column(DateTime)
     date_snatched = Column(DateTime, default=datetime.utcnow)
 
-    user = relationship("User", back_populates="snatched_deals") 
\ No newline at end of file
+    user = relationship("User", back_populates="snatched_deals")
+
+class EmailOutbox(Base):
+    """An email written in the same transaction as the change that caused it, sent later by the dispatcher"""
+    __tablename__ = "email_outbox"
+    __table_args__ = (Index("ix_email_outbox_status_due", "status", "next_attempt_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, sent or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+class PendingAlert(Base):
+    """A snatch waiting to be mailed, so snatches close together reach a user as one digest"""
+    __tablename__ = "pending_alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    to_email = Column(String, nullable=False)
+    holiday_url = Column(String, nullable=False)
+    price = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
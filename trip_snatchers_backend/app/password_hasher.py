@@ -0,0 +1,127 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+# bcrypt releases the GIL, so threads hash in parallel; more than the CPU count only queues
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Cost of new hashes. Hashes below it are flagged deprecated and replaced at the next login
+BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+
+
+def build_context(rounds=BCRYPT_ROUNDS):
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds
+    )
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash and verify on a bounded thread pool so a burst of logins never stalls
+    the event loop, and keeps counts of how busy the pool is.
+    """
+
+    def __init__(self, workers=HASH_WORKERS, context=None):
+        self.workers = workers
+        self.context = context or build_context()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0  # submitted and not finished, running or queued
+        self._running = 0
+        self._completed = 0
+        self._rehashed = 0
+        self._wait_seconds = 0.0
+        self._work_seconds = 0.0
+
+    async def _run(self, fn, *args):
+        # All bookkeeping happens on the pool's side, so a request cancelled while it waits
+        # for the result leaves the counts right: a running job is still counted when it ends
+        submitted = time.monotonic()
+
+        def timed():
+            started = time.monotonic()
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += started - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._work_seconds += time.monotonic() - started
+
+        def dropped(job):
+            # A job cancelled while still queued never reaches timed()
+            if job.cancelled():
+                with self._lock:
+                    self._pending -= 1
+
+        with self._lock:
+            self._pending += 1
+        try:
+            job = self._executor.submit(timed)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        job.add_done_callback(dropped)
+        return await asyncio.wrap_future(job)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str):
+        """
+        Return (valid, new_hash). new_hash is set when the password is right but its stored
+        hash is deprecated (e.g. fewer rounds than BCRYPT_ROUNDS) and should be replaced.
+        """
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash:
+            with self._lock:
+                self._rehashed += 1
+        return valid, new_hash
+
+    def stats(self):
+        with self._lock:
+            done = self._completed or 1
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rehashed": self._rehashed,
+                "avg_wait_ms": round(self._wait_seconds / done * 1000, 1),
+                "avg_hash_ms": round(self._work_seconds / done * 1000, 1),
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher():
+    """Process-wide hasher shared by registration and login"""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+        return _hasher
+
+
+def shutdown_password_hasher():
+    global _hasher
+    with _hasher_lock:
+        if _hasher is not None:
+            _hasher.shutdown()
+            _hasher = None
@@ -0,0 +1,171 @@
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from . import models
+
+logger = logging.getLogger("PriceHistory")
+
+# Raw observations older than this are rolled into hourly min/max/last rows
+RAW_RETENTION_DAYS = float(os.getenv("PRICE_HISTORY_RAW_DAYS", "7"))
+# Hourly rows older than this are rolled into daily rows
+HOURLY_RETENTION_DAYS = float(os.getenv("PRICE_HISTORY_HOURLY_DAYS", "90"))
+# Daily rows older than this are deleted; 0 keeps them forever
+DAILY_RETENTION_DAYS = float(os.getenv("PRICE_HISTORY_DAILY_DAYS", "0"))
+
+HOUR = "hour"
+DAY = "day"
+
+
+def _bucket_start(timestamp, resolution):
+    if resolution == HOUR:
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class _Bucket:
+    """Running min/max/last of the points folded into one time bucket"""
+
+    def __init__(self, start, min_price, max_price, last_price, last_at, samples):
+        self.start = start
+        self.min_price = min_price
+        self.max_price = max_price
+        self.last_price = last_price
+        self.last_at = last_at
+        self.samples = samples
+
+    def add(self, min_price, max_price, last_price, last_at, samples):
+        self.min_price = min(self.min_price, min_price)
+        self.max_price = max(self.max_price, max_price)
+        if last_at >= self.last_at:
+            self.last_price = last_price
+            self.last_at = last_at
+        self.samples += samples
+
+
+def _fold(db: Session, points, resolution):
+    """
+    Merge (holiday_url_id, time, min, max, last, last_at, samples) points into the
+    PriceRollup rows of ``resolution``, creating rows for new buckets.
+    """
+    buckets = {}
+    for url_id, timestamp, min_price, max_price, last_price, last_at, samples in points:
+        key = (url_id, _bucket_start(timestamp, resolution))
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = _Bucket(key[1], min_price, max_price, last_price, last_at, samples)
+        else:
+            bucket.add(min_price, max_price, last_price, last_at, samples)
+
+    for (url_id, start), bucket in buckets.items():
+        row = db.query(models.PriceRollup).filter(
+            models.PriceRollup.holiday_url_id == url_id,
+            models.PriceRollup.resolution == resolution,
+            models.PriceRollup.bucket_start == start
+        ).first()
+        if row is None:
+            db.add(models.PriceRollup(
+                holiday_url_id=url_id,
+                resolution=resolution,
+                bucket_start=start,
+                min_price=bucket.min_price,
+                max_price=bucket.max_price,
+                last_price=bucket.last_price,
+                last_observed_at=bucket.last_at,
+                samples=bucket.samples
+            ))
+            continue
+        merged = _Bucket(start, row.min_price, row.max_price, row.last_price, row.last_observed_at, row.samples)
+        merged.add(bucket.min_price, bucket.max_price, bucket.last_price, bucket.last_at, bucket.samples)
+        row.min_price = merged.min_price
+        row.max_price = merged.max_price
+        row.last_price = merged.last_price
+        row.last_observed_at = merged.last_at
+        row.samples = merged.samples
+    return len(buckets)
+
+
+def compact_price_history(db: Session, now: datetime = None):
+    """
+    Apply retention: raw observations past RAW_RETENTION_DAYS become hourly rollups, hourly
+    rollups past HOURLY_RETENTION_DAYS become daily ones, and expired daily rollups are dropped.
+    """
+    now = now or datetime.utcnow()
+    try:
+        # Cutoffs fall on bucket boundaries so a bucket is never split between two resolutions
+        raw_cutoff = _bucket_start(now - timedelta(days=RAW_RETENTION_DAYS), HOUR)
+        old_raw = db.query(models.PriceObservation)\
+            .filter(models.PriceObservation.observed_at < raw_cutoff)
+        hours = _fold(db, (
+            (o.holiday_url_id, o.observed_at, o.price, o.price, o.price, o.observed_at, 1)
+            for o in old_raw.all()
+        ), HOUR)
+        old_raw.delete(synchronize_session=False)
+
+        hourly_cutoff = _bucket_start(now - timedelta(days=HOURLY_RETENTION_DAYS), DAY)
+        old_hourly = db.query(models.PriceRollup).filter(
+            models.PriceRollup.resolution == HOUR,
+            models.PriceRollup.bucket_start < hourly_cutoff
+        )
+        db.flush()
+        days = _fold(db, (
+            (r.holiday_url_id, r.bucket_start, r.min_price, r.max_price, r.last_price, r.last_observed_at, r.samples)
+            for r in old_hourly.all()
+        ), DAY)
+        old_hourly.delete(synchronize_session=False)
+
+        expired = 0
+        if DAILY_RETENTION_DAYS > 0:
+            expired = db.query(models.PriceRollup).filter(
+                models.PriceRollup.resolution == DAY,
+                models.PriceRollup.bucket_start < now - timedelta(days=DAILY_RETENTION_DAYS)
+            ).delete(synchronize_session=False)
+        db.commit()
+        logger.info(f"Price history compacted: {hours} hourly and {days} daily bucket(s) written, {expired} expired")
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _series_rows(db: Session, holiday_url_id: int, since: datetime):
+    """Every stored point for a URL as (time, min, max, last, last_at), oldest first"""
+    rollups = db.query(models.PriceRollup).filter(
+        models.PriceRollup.holiday_url_id == holiday_url_id,
+        models.PriceRollup.bucket_start >= _bucket_start(since, DAY)
+    ).all()
+    observations = db.query(models.PriceObservation.observed_at, models.PriceObservation.price).filter(
+        models.PriceObservation.holiday_url_id == holiday_url_id,
+        models.PriceObservation.observed_at >= since
+    ).all()
+    rows = [(r.bucket_start, r.min_price, r.max_price, r.last_price, r.last_observed_at) for r in rollups]
+    rows.extend((at, price, price, price, at) for at, price in observations)
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def get_price_series(db: Session, holiday_url_id: int, points: int, since: datetime = None):
+    """
+    A URL's price history reduced to at most ``points`` min/max/last buckets of equal width.
+
+    Returns (bucket_seconds, [(timestamp, min, max, last)]); bucket_seconds is 0 when the
+    stored points already fit the budget and are returned as they are.
+    """
+    rows = _series_rows(db, holiday_url_id, since or datetime.min)
+    if len(rows) <= points:
+        return 0, [(at, low, high, last) for at, low, high, last, _ in rows]
+
+    first = rows[0][0]
+    span = (rows[-1][0] - first).total_seconds()
+    bucket_seconds = max(int(math.ceil((span + 1) / points)), 1)
+    buckets = []
+    for at, low, high, last, last_at in rows:
+        index = int((at - first).total_seconds() // bucket_seconds)
+        start = first + timedelta(seconds=index * bucket_seconds)
+        if buckets and buckets[-1].start == start:
+            buckets[-1].add(low, high, last, last_at, 1)
+        else:
+            buckets.append(_Bucket(start, low, high, last, last_at, 1))
+    return bucket_seconds, [(b.start, b.min_price, b.max_price, b.last_price) for b in buckets]
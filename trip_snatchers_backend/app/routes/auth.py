@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from typing import Optional
 
-from .. import crud, models, schemas
-from ..database import get_db
-from ..email_utils import send_verification_email, generate_verification_token
+from .. import async_crud, models, schemas
+from ..database import get_async_db
+from ..email_utils import queue_verification_email, generate_verification_token
+from ..email_outbox import wake_email_dispatcher
+from ..password_hasher import get_password_hasher
 
 # to get a string like this run:
 # openssl rand -hex 32
@@ -16,7 +17,6 @@ SECRET_KEY = "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 router = APIRouter(
@@ -24,12 +24,6 @@ router = APIRouter(
     tags=["auth"]
 )
 
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -42,7 +36,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,7 +51,7 @@ async def get_current_user(
         token_data = schemas.TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = crud.get_user_by_email(db, email=token_data.email)
+    user = await async_crud.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
     
@@ -71,18 +65,20 @@ async def get_current_user(
     return user
 
 @router.post("/register", response_model=schemas.User)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = crud.get_user_by_email(db, email=user.email)
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await async_crud.get_user_by_email(db, email=user.email)
     if db_user:
         if not db_user.is_verified:
             # If user exists but not verified, generate new token and send email
             token, expires = generate_verification_token()
-            crud.update_verification_token(db, db_user.id, token, expires)
-            if send_verification_email(user.email, token):
-                raise HTTPException(
-                    status_code=status.HTTP_202_ACCEPTED,
-                    detail="Account exists but not verified. New verification email sent."
-                )
+            # Queued first so the token update commits the email with it
+            queue_verification_email(db, user.email, token)
+            await async_crud.update_verification_token(db, db_user.id, token, expires)
+            wake_email_dispatcher()
+            raise HTTPException(
+                status_code=status.HTTP_202_ACCEPTED,
+                detail="Account exists but not verified. New verification email sent."
+            )
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
@@ -91,9 +87,10 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     # Generate verification token
     token, expires = generate_verification_token()
     
-    # Create user with verification token
-    hashed_password = get_password_hash(user.password)
-    db_user = crud.create_user(
+    # Create user with verification token, and queue the verification email in the same commit
+    hashed_password = await get_password_hasher().hash(user.password)
+    queue_verification_email(db, user.email, token)
+    db_user = await async_crud.create_user(
         db=db,
         user=user,
         hashed_password=hashed_password,
@@ -101,10 +98,8 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
         verification_token_expires=expires
     )
     
-    # Send verification email
-    if not send_verification_email(user.email, token):
-        # If email fails, still create the user but log the error
-        print(f"Failed to send verification email to {user.email}")
+    # Sent in the background, and retried if SMTP fails
+    wake_email_dispatcher()
     
     raise HTTPException(
         status_code=status.HTTP_201_CREATED,
@@ -114,15 +109,22 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=schemas.Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = crud.get_user_by_email(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await async_crud.get_user_by_email(db, email=form_data.username)
+    valid, new_hash = False, None
+    if user:
+        # bcrypt runs on the hasher's threads, not the event loop
+        valid, new_hash = await get_password_hasher().verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored with an outdated cost; replaced now that the plain password is at hand
+        await async_crud.update_password_hash(db, user.id, new_hash)
     
     # Check if user is verified
     if not user.is_verified:
@@ -141,15 +143,20 @@ async def login_for_access_token(
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
+@router.get("/password-hasher-stats")
+async def read_password_hasher_stats(current_user: models.User = Depends(get_current_user)):
+    """How busy the bcrypt pool is: running and queued hashes, average wait and hash time"""
+    return get_password_hasher().stats()
+
 @router.post("/resend-verification")
 async def resend_verification_email(
     email: str = Body(..., embed=True),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Resend verification email"""
     print(f"Resending verification email to: {email}")  # Debug log
     
-    user = crud.get_user_by_email(db, email=email)
+    user = await async_crud.get_user_by_email(db, email=email)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -162,23 +169,19 @@ async def resend_verification_email(
             detail="Email already verified"
         )
     
-    # Generate new verification token
+    # Generate new verification token, committed together with the email carrying it
     token, expires = generate_verification_token()
-    crud.update_verification_token(db, user.id, token, expires)
+    queue_verification_email(db, user.email, token)
+    await async_crud.update_verification_token(db, user.id, token, expires)
     
-    # Send new verification email
-    if send_verification_email(user.email, token):
-        return {"message": "Verification email sent successfully"}
-    else:
-        raise HTTPException(
-            status_code=500,
-            detail="Failed to send verification email"
-        )
+    # Sent in the background, and retried if SMTP fails
+    wake_email_dispatcher()
+    return {"message": "Verification email sent successfully"}
 
 @router.get("/verify-email/{token}")
-async def verify_email(token: str, db: Session = Depends(get_db)):
+async def verify_email(token: str, db: AsyncSession = Depends(get_async_db)):
     """Verify user's email address"""
-    user = crud.get_user_by_verification_token(db, token)
+    user = await async_crud.get_user_by_verification_token(db, token)
     if not user:
         raise HTTPException(
             status_code=400,
@@ -193,6 +196,6 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
         )
     
     # Mark user as verified and clear token
-    crud.verify_user(db, user.id)
+    await async_crud.verify_user(db, user.id)
     
     return {"message": "Email verified successfully"} 
\ No newline at end of file
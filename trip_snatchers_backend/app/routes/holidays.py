@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, timedelta
 
-from .. import crud, models, schemas
-from ..database import get_db
+from .. import async_crud, crud, models, schemas
+from ..database import get_async_db
+from ..price_history import get_price_series
+from ..snatch_engine import snatch_for_price
 from .auth import get_current_user
 # from ..scheduler import scrape_holiday_price  # Removed, no longer needed
 import asyncio
 from scraping_scripts.scraper import update_all_tracked_holiday_prices, scrape_and_update_single_holiday
+from scraping_scripts.domain_scheduler import get_domain_scheduler
+from scraping_scripts.driver_pool import get_driver_pool
+from scraping_scripts.result_cache import get_result_cache
+from scraping_scripts.selector_stats import get_selector_stats
 import threading
 
 router = APIRouter(
@@ -19,14 +26,17 @@ router = APIRouter(
 async def track_holiday(
     holiday: schemas.HolidayTrackCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    new_holiday = crud.create_holiday_track(
+    # A URL scraped recently (by the scheduler or another user's track) already has a current price
+    cached = get_result_cache().get(holiday.url)
+    new_holiday = await async_crud.create_holiday_track(
         db=db,
         holiday=holiday,
-        user_id=current_user.id
+        user_id=current_user.id,
+        current_price=cached.price if cached else None
     )
-    # Start a background thread to scrape and update this holiday's price
+    # Start a background thread to scrape and update this holiday's price (served from the cache when fresh)
     threading.Thread(target=scrape_and_update_single_holiday, args=(new_holiday.id,), daemon=True).start()
     return new_holiday
 
@@ -35,34 +45,19 @@ async def update_holiday_price(
     holiday_id: int,
     current_price: float,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update the current price of a tracked holiday"""
-    holiday = crud.get_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id)
+    holiday = await async_crud.get_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id)
     if holiday is None:
         raise HTTPException(status_code=404, detail="Holiday not found")
     
-    updated_holiday = crud.update_holiday_price(
-        db=db,
-        holiday_id=holiday_id,
-        current_price=current_price
-    )
+    # Same write as a scrape, so the price history and last_scraped_at treat it as one
+    updated_holiday = await db.run_sync(crud.update_holiday_price, holiday_id, current_price)
     
-    # Check if target price is met
-    if current_price <= holiday.target_price:
-        # Send email alert to user
-        from ..email_utils import send_price_alert
-        send_price_alert(
-            user_email=current_user.email,
-            holiday_url=holiday.holiday_url,
-            target_price=current_price
-        )
-        crud.create_snatched_deal(
-            db=db,
-            user_id=current_user.id,
-            holiday_track=holiday,
-            snatched_price=current_price
-        )
+    # Snatch every track of this URL whose target price is now met; the snatch engine is synchronous
+    await db.run_sync(snatch_for_price, holiday.holiday_url_id, current_price)
+    await db.refresh(updated_holiday)
     
     return updated_holiday
 
@@ -71,31 +66,65 @@ async def read_user_holidays(
     skip: int = 0,
     limit: int = 100,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    holidays = crud.get_user_holiday_tracks(
+    holidays = await async_crud.get_user_holiday_tracks(
         db, user_id=current_user.id, skip=skip, limit=limit
     )
     return holidays
 
+@router.get("/scraper-stats")
+async def read_scraper_stats(current_user: models.User = Depends(get_current_user)):
+    """Per-domain queue depth and wait times, browser pool usage, cache and selector hit rates, for tuning scrapers"""
+    return {
+        "domains": get_domain_scheduler().stats(),
+        "driver_pool": get_driver_pool().stats(),
+        "result_cache": get_result_cache().stats(),
+        "selectors": get_selector_stats().report()
+    }
+
 @router.get("/{holiday_id}", response_model=schemas.HolidayTrack)
 async def read_holiday(
     holiday_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    holiday = crud.get_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id)
+    holiday = await async_crud.get_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id)
     if holiday is None:
         raise HTTPException(status_code=404, detail="Holiday not found")
     return holiday
 
+@router.get("/{holiday_id}/price-history", response_model=schemas.PriceSeries)
+async def read_holiday_price_history(
+    holiday_id: int,
+    points: int = Query(200, ge=2, le=5000),
+    days: Optional[int] = Query(None, ge=1),
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Price series of a tracked holiday, downsampled to at most ``points`` min/max/last buckets"""
+    holiday = await async_crud.get_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id)
+    if holiday is None:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    bucket_seconds, series = await db.run_sync(get_price_series, holiday.holiday_url_id, points, since)
+    return {
+        "holiday_id": holiday.id,
+        "canonical_url": holiday.canonical_url,
+        "bucket_seconds": bucket_seconds,
+        "points": [
+            {"timestamp": at, "min_price": low, "max_price": high, "last_price": last}
+            for at, low, high, last in series
+        ]
+    }
+
 @router.delete("/{holiday_id}")
 async def delete_holiday(
     holiday_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    if crud.delete_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id):
+    if await async_crud.delete_holiday_track(db, holiday_id=holiday_id, user_id=current_user.id):
         return {"message": "Holiday tracking removed successfully"}
     raise HTTPException(status_code=404, detail="Holiday not found") 
 
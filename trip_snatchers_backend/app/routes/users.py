@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from .. import crud, models, schemas
-from ..database import get_db
+from .. import async_crud, models, schemas
+from ..database import get_async_db
 from .auth import get_current_user
 
 router = APIRouter(
@@ -22,10 +22,10 @@ async def read_current_user(
 async def update_current_user(
     user_update: schemas.UserUpdate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's profile"""
-    updated_user = crud.update_user(db, user_id=current_user.id, user=user_update)
+    updated_user = await async_crud.update_user(db, user_id=current_user.id, user=user_update)
     if updated_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return updated_user
@@ -33,19 +33,8 @@ async def update_current_user(
 @router.get("/me/stats", response_model=schemas.UserStats)
 async def get_user_stats(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's statistics"""
-    # Get active holiday tracks
-    active_tracks = len([h for h in current_user.holiday_tracks if h.is_active])
-    
-    # Calculate total savings from snatched deals
-    total_savings = sum(
-        deal.initial_price - deal.snatched_price 
-        for deal in current_user.snatched_deals
-    )
-    
-    return {
-        "active_tracks": active_tracks,
-        "total_savings": total_savings
-    } 
\ No newline at end of file
+    # Active tracks and total savings from snatched deals, counted by the database
+    return await async_crud.get_user_stats(db, user_id=current_user.id) 
\ No newline at end of file
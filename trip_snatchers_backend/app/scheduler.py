@@ -3,6 +3,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 from . import crud, email_utils
 from .database import SessionLocal
+from .price_history import compact_price_history
 import logging
 from scraping_scripts.scraper import update_all_tracked_holiday_prices
 
@@ -14,6 +15,17 @@ def check_holiday_prices():
     update_all_tracked_holiday_prices()
 
 
+def compact_prices():
+    """
+    Roll old price observations into hourly and daily min/max/last rows
+    """
+    db: Session = SessionLocal()
+    try:
+        compact_price_history(db)
+    finally:
+        db.close()
+
+
 def start_scheduler():
     scheduler = BackgroundScheduler()
     
@@ -28,5 +40,13 @@ def start_scheduler():
         name='Check holiday prices every 6 hours',
         replace_existing=True
     )
+    
+    scheduler.add_job(
+        func=compact_prices,
+        trigger=IntervalTrigger(hours=24),
+        id='compact_prices',
+        name='Compact price history daily',
+        replace_existing=True
+    )
     scheduler.start()
     return scheduler 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -45,13 +45,28 @@ class HolidayTrackCreate(HolidayTrackBase):
 class HolidayTrack(HolidayTrackBase):
     id: int
     user_id: int
+    canonical_url: Optional[str] = None
     current_price: Optional[float] = None
+    departure_date: Optional[str] = None
+    last_scraped_at: Optional[datetime] = None
     is_active: bool = True
     created_at: datetime
 
     class Config:
         from_attributes = True
 
+class PricePoint(BaseModel):
+    timestamp: datetime
+    min_price: float
+    max_price: float
+    last_price: float
+
+class PriceSeries(BaseModel):
+    holiday_id: int
+    canonical_url: Optional[str] = None
+    bucket_seconds: int
+    points: List[PricePoint]
+
 class SnatchedDealBase(BaseModel):
     holiday_url: str
     initial_price: float
@@ -63,6 +78,7 @@ class SnatchedDealBase(BaseModel):
 class SnatchedDeal(SnatchedDealBase):
     id: int
     user_id: int
+    holiday_track_id: Optional[int] = None
 
     class Config:
         from_attributes = True
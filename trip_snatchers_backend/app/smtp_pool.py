@@ -0,0 +1,185 @@
+import logging
+import os
+import queue
+import smtplib
+import threading
+import time
+
+logger = logging.getLogger("SmtpPool")
+
+# Authenticated connections kept open, which is also the number of messages sent at once
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+# Servers cap messages per session; reconnect before hitting the cap
+SMTP_MAX_MESSAGES = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+# Servers drop idle sessions; an idle connection older than this is replaced rather than tried
+SMTP_MAX_IDLE_SECONDS = float(os.getenv("SMTP_MAX_IDLE_SECONDS", "60"))
+SMTP_ACQUIRE_TIMEOUT = float(os.getenv("SMTP_ACQUIRE_TIMEOUT", "120"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+
+# Failures that mean the session is gone, not that the message was refused
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class _PooledConnection:
+    """Bookkeeping wrapper around a logged-in smtplib.SMTP session"""
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.idle_since = time.monotonic()
+
+
+class SmtpPool:
+    """
+    Bounded pool of authenticated SMTP sessions shared by every email sender.
+
+    Sessions are opened lazily up to ``size`` and reused for many messages, so a burst of
+    alerts costs one STARTTLS and login per session instead of one per message. A session
+    is replaced after ``max_messages`` messages, after sitting idle past ``max_idle_seconds``,
+    or as soon as it turns out to be disconnected.
+    """
+
+    def __init__(self, host, port, username, password, size=SMTP_POOL_SIZE,
+                 max_messages=SMTP_MAX_MESSAGES, max_idle_seconds=SMTP_MAX_IDLE_SECONDS):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.max_messages = max_messages
+        self.max_idle_seconds = max_idle_seconds
+        self._idle = queue.LifoQueue()  # LIFO keeps the most recently used session warm
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._open = 0
+        self._sent = 0
+        self._reconnects = 0
+        self._closed = False
+
+    def send(self, msg, timeout=SMTP_ACQUIRE_TIMEOUT):
+        """
+        Send one message, raising on failure. A reused session found dead is replaced and
+        the message retried once on a fresh one; a refused message is not retried.
+        """
+        if self._closed:
+            raise RuntimeError("SMTP pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No SMTP connection became available within {timeout}s")
+        try:
+            pooled = self._take()
+            try:
+                self._send_on(pooled, msg)
+            except _CONNECTION_ERRORS as e:
+                if pooled.messages_sent == 0:
+                    raise
+                logger.info(f"Reconnecting SMTP session after: {str(e) or e.__class__.__name__}")
+                with self._lock:
+                    self._reconnects += 1
+                pooled = self._create()
+                self._send_on(pooled, msg)
+        finally:
+            self._slots.release()
+
+    def _send_on(self, pooled, msg):
+        try:
+            pooled.smtp.send_message(msg)
+        except _CONNECTION_ERRORS:
+            self._destroy(pooled)
+            raise
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # The message was refused; clear the transaction so the session stays usable
+            self._release(pooled, reset=True)
+            raise
+        except Exception:
+            self._destroy(pooled)
+            raise
+        pooled.messages_sent += 1
+        with self._lock:
+            self._sent += 1
+        self._release(pooled)
+
+    def _take(self):
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if time.monotonic() - pooled.idle_since <= self.max_idle_seconds:
+                return pooled
+            self._destroy(pooled)
+
+    def _release(self, pooled, reset=False):
+        if reset:
+            try:
+                pooled.smtp.rset()
+            except Exception:
+                self._destroy(pooled)
+                return
+        if self._closed or pooled.messages_sent >= self.max_messages:
+            self._destroy(pooled)
+            return
+        pooled.idle_since = time.monotonic()
+        self._idle.put(pooled)
+
+    def _create(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        try:
+            smtp.starttls()
+            smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self._open += 1
+        return _PooledConnection(smtp)
+
+    def _destroy(self, pooled):
+        with self._lock:
+            self._open -= 1
+        try:
+            pooled.smtp.quit()
+        except Exception:
+            pooled.smtp.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "connections": self._open,
+                "idle": self._idle.qsize(),
+                "sent": self._sent,
+                "reconnects": self._reconnects,
+            }
+
+    def close(self):
+        """Log out of every idle session; borrowed ones are closed when they are returned"""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._destroy(pooled)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool():
+    """Process-wide pool shared by the email dispatcher and direct sends"""
+    from .email_utils import SMTP_PASSWORD, SMTP_PORT, SMTP_SERVER, SMTP_USERNAME
+
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = SmtpPool(SMTP_SERVER, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD)
+        return _pool
+
+
+def shutdown_smtp_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,127 @@
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import insert, literal, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .email_outbox import wake_email_dispatcher
+
+logger = logging.getLogger("SnatchEngine")
+
+
+def _snatch(db: Session, matches):
+    """
+    Deactivate the tracks of ``matches`` and insert their SnatchedDeal and PendingAlert rows
+    in one transaction, so a committed snatch always gets its alert and a rolled-back one never
+    does. The dispatcher mails the alerts, combining each user's into a digest.
+    Each match has id, user_id, url, target_price, created_at, email and price.
+
+    Deactivation is a compare-and-set on is_active: only the tracks this call flips are
+    snatched, so a track another worker got to first gets no second deal or alert.
+    """
+    if not matches:
+        return 0
+
+    snatched_at = datetime.utcnow()
+    try:
+        claimed = set(db.execute(
+            update(models.HolidayTrack)
+            .where(
+                models.HolidayTrack.id.in_([match.id for match in matches]),
+                models.HolidayTrack.is_active == True
+            )
+            .values(is_active=False)
+            .returning(models.HolidayTrack.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+        if len(claimed) < len(matches):
+            logger.info(f"{len(matches) - len(claimed)} track(s) already snatched by another worker")
+        matches = [match for match in matches if match.id in claimed]
+        if not matches:
+            db.rollback()
+            return 0
+        db.execute(insert(models.SnatchedDeal), [
+            {
+                "user_id": match.user_id,
+                "holiday_track_id": match.id,
+                "holiday_url": match.url,
+                "initial_price": match.price,
+                "target_price": match.target_price,
+                "snatched_price": match.price,
+                "date_tracked": match.created_at,
+                "date_snatched": snatched_at
+            }
+            for match in matches
+        ])
+        db.execute(insert(models.PendingAlert), [
+            {
+                "user_id": match.user_id,
+                "to_email": match.email,
+                "holiday_url": match.url,
+                "price": match.price,
+                "created_at": snatched_at
+            }
+            for match in matches
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for match in matches:
+        logger.info(f"Snatched: {match.url} at {match.price} for {match.email}")
+    wake_email_dispatcher()
+    return len(matches)
+
+
+def _track_columns():
+    return (
+        models.HolidayTrack.id,
+        models.HolidayTrack.user_id,
+        models.HolidayTrack.url,
+        models.HolidayTrack.target_price,
+        models.HolidayTrack.created_at,
+        models.User.email
+    )
+
+
+def snatch_for_price(db: Session, holiday_url_id: int, price: float):
+    """
+    Snatch every active track of one URL that ``price`` satisfies, as one batch.
+
+    The tracks are found with a range scan of the (holiday_url_id, is_active, target_price)
+    index, so the cost depends on how many tracks are snatched, not how many track the URL.
+    Returns the number of tracks snatched.
+    """
+    matches = db.query(*_track_columns(), literal(price).label("price"))\
+        .join(models.User, models.HolidayTrack.user_id == models.User.id)\
+        .filter(
+            models.HolidayTrack.holiday_url_id == holiday_url_id,
+            models.HolidayTrack.is_active == True,
+            models.HolidayTrack.target_price >= price
+        ).all()
+    return _snatch(db, matches)
+
+
+def evaluate_snatches(db: Session, holiday_url_ids: Optional[Iterable[int]] = None):
+    """
+    Snatch every active track whose URL's latest price is at or below its target.
+
+    Matches come from one query joining tracks to their URL and user. Their SnatchedDeal
+    rows and pending alerts are written and the tracks deactivated in a single transaction.
+    ``holiday_url_ids`` limits the check to tracks of those URLs. Returns the number of
+    tracks snatched.
+    """
+    query = db.query(*_track_columns(), models.HolidayUrl.latest_price.label("price"))\
+        .join(models.HolidayUrl, models.HolidayTrack.holiday_url_id == models.HolidayUrl.id)\
+        .join(models.User, models.HolidayTrack.user_id == models.User.id)\
+        .filter(
+            models.HolidayTrack.is_active == True,
+            models.HolidayUrl.latest_price.isnot(None),
+            models.HolidayUrl.latest_price <= models.HolidayTrack.target_price
+        )
+    if holiday_url_ids is not None:
+        query = query.filter(models.HolidayTrack.holiday_url_id.in_(list(holiday_url_ids)))
+    return _snatch(db, query.all())
@@ -29,47 +29,24 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app import models
-from app.email_utils import send_price_alert
-from app.crud import create_snatched_deal
+from app.alert_digest import flush_alert_digests
+from app.email_outbox import shutdown_email_dispatcher
+from app.snatch_engine import evaluate_snatches
 import logging
 
 logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s')
 logger = logging.getLogger("SnatchLogicOnly")
 
 def run_snatch_logic():
-    db: Session = SessionLocal()
+    db = SessionLocal()
     try:
-        holidays = db.query(models.HolidayTrack).filter(models.HolidayTrack.is_active == True).all()
-        logger.info(f"Found {len(holidays)} active holidays to check for snatching.")
-
-        for holiday in holidays:
-            if holiday.current_price is None:
-                logger.info(f"Skipping {holiday.url} (no current price set).")
-                continue
-
-            if holiday.current_price <= holiday.target_price:
-                user = db.query(models.User).filter(models.User.id == holiday.user_id).first()
-                if user:
-                    logger.info(f"Snatched: {holiday.url} at {holiday.current_price} for {user.email}")
-                    send_price_alert(
-                        user_email=user.email,
-                        holiday_url=holiday.url,
-                        target_price=holiday.current_price
-                    )
-                    create_snatched_deal(
-                        db=db,
-                        user_id=user.id,
-                        holiday_track=holiday,
-                        snatched_price=holiday.current_price
-                    )
-            else:
-                logger.info(f"No snatch: {holiday.url} is {holiday.current_price} (target was {holiday.target_price})")
-
+        snatched = evaluate_snatches(db)
+        logger.info(f"Snatched {snatched} holiday(s).")
+        flush_alert_digests(db, force=True)
     finally:
         db.close()
+        shutdown_email_dispatcher()
 
 if __name__ == "__main__":
     run_snatch_logic()
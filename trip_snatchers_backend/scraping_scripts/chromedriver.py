@@ -0,0 +1,106 @@
+import atexit
+import logging
+import os
+import shutil
+import threading
+
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+logger = logging.getLogger('ChromeDriverResolver')
+
+# A local chromedriver binary; when set no version lookup or download ever happens (air-gapped workers)
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+# Pin the chromedriver version webdriver-manager installs instead of resolving the latest one
+CHROMEDRIVER_VERSION = os.getenv("CHROMEDRIVER_VERSION")
+# Never reach out to the network; only CHROMEDRIVER_PATH or a chromedriver on PATH are used
+CHROMEDRIVER_OFFLINE = os.getenv("CHROMEDRIVER_OFFLINE", "0") == "1"
+# Run one long-lived chromedriver for every browser session in the process
+SHARED_CHROMEDRIVER = os.getenv("SCRAPER_SHARED_CHROMEDRIVER", "1") == "1"
+
+_driver_path = None
+_path_lock = threading.Lock()
+_service = None
+_service_lock = threading.Lock()
+
+
+def _resolve_chromedriver_path():
+    if CHROMEDRIVER_PATH:
+        if not os.path.isfile(CHROMEDRIVER_PATH):
+            raise FileNotFoundError(f"CHROMEDRIVER_PATH does not exist: {CHROMEDRIVER_PATH}")
+        return CHROMEDRIVER_PATH
+
+    if not CHROMEDRIVER_OFFLINE:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager(driver_version=CHROMEDRIVER_VERSION).install()
+        except Exception as e:
+            logger.warning(f"webdriver-manager could not provide chromedriver: {str(e)}")
+
+    local = shutil.which("chromedriver")
+    if local:
+        return local
+    raise RuntimeError("No chromedriver available; set CHROMEDRIVER_PATH to a local binary")
+
+
+def resolve_chromedriver_path():
+    """Resolve the chromedriver binary once per process and reuse it for every browser"""
+    global _driver_path
+    with _path_lock:
+        if _driver_path is None:
+            _driver_path = _resolve_chromedriver_path()
+            logger.info(f"Using chromedriver at {_driver_path}")
+        return _driver_path
+
+
+class SharedChromeService(ChromeService):
+    """
+    A chromedriver process started once and reused by every browser session.
+
+    Selenium starts the service in each ``webdriver.Chrome()`` and stops it in
+    ``quit()``; here start is a no-op while the process is alive and stop is
+    deferred to ``shutdown()`` so sessions come and go without respawning it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._start_lock = threading.Lock()
+
+    def is_running(self):
+        process = getattr(self, "process", None)
+        return process is not None and process.poll() is None
+
+    def start(self):
+        with self._start_lock:
+            if not self.is_running():
+                logger.info("Starting shared chromedriver")
+                super().start()
+
+    def stop(self):
+        pass
+
+    def shutdown(self):
+        if self.is_running():
+            super().stop()
+
+
+def get_chrome_service():
+    """Service for a new browser session: the shared chromedriver, or a private one if sharing is off"""
+    global _service
+    path = resolve_chromedriver_path()
+    if not SHARED_CHROMEDRIVER:
+        return ChromeService(executable_path=path)
+    with _service_lock:
+        if _service is None:
+            _service = SharedChromeService(executable_path=path)
+        return _service
+
+
+def shutdown_chrome_service():
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.shutdown()
+            _service = None
+
+
+atexit.register(shutdown_chrome_service)
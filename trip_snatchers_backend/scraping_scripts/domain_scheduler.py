@@ -0,0 +1,252 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from .driver_pool import DRIVER_POOL_SIZE
+
+logger = logging.getLogger('ScraperDomainScheduler')
+
+# Default per-domain limits; SCRAPER_DOMAIN_LIMITS overrides them per site with
+# "domain=rate_per_min:burst:max_concurrency" pairs, e.g. "tui.co.uk=4:1:1,jet2.com=10:2:2".
+# A rate of 0 pauses a domain: once its burst is spent, its scrapes fail instead of queueing.
+DEFAULT_RATE_PER_MIN = float(os.getenv("SCRAPER_DOMAIN_RATE_PER_MIN", "6"))
+DEFAULT_BURST = int(os.getenv("SCRAPER_DOMAIN_BURST", "2"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("SCRAPER_DOMAIN_MAX_CONCURRENCY", "2"))
+
+
+class DomainLimits:
+    """Rate and concurrency settings for one domain"""
+
+    def __init__(self, rate_per_min=DEFAULT_RATE_PER_MIN, burst=DEFAULT_BURST,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        self.rate_per_min = rate_per_min
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+
+    def __repr__(self):
+        return f"DomainLimits({self.rate_per_min}/min, burst={self.burst}, concurrency={self.max_concurrency})"
+
+
+def _parse_domain_limits(raw):
+    limits = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        domain, values = item.split("=", 1)
+        try:
+            rate, burst, concurrency = values.split(":")
+            limits[domain.strip().lower()] = DomainLimits(float(rate), int(burst), int(concurrency))
+        except ValueError:
+            logger.warning(f"Ignoring malformed domain limit: {item}")
+    return limits
+
+
+DOMAIN_LIMITS = _parse_domain_limits(os.getenv("SCRAPER_DOMAIN_LIMITS"))
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate_per_min``"""
+
+    def __init__(self, rate_per_min, burst):
+        self.rate = rate_per_min / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def try_take(self):
+        """
+        Take a token and return 0, or return the seconds until one is available, or None
+        when the bucket is empty and never refills (a rate of 0)
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self.rate <= 0:
+            return None
+        return (1 - self.tokens) / self.rate
+
+
+class _DomainQueue:
+    def __init__(self, limits):
+        self.limits = limits
+        self.bucket = TokenBucket(limits.rate_per_min, limits.burst)
+        self.jobs = deque()
+        self.active = 0
+        self.dispatched = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class _Job:
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class DomainScheduler:
+    """
+    Work scheduler keeping one queue per domain.
+
+    A fixed set of workers (one per pooled browser by default) serves all domains
+    round-robin; a domain's next job only runs when its token bucket has a token and
+    it is below its own concurrency cap, so many sites scrape in parallel while each
+    one sees a bounded request rate.
+    """
+
+    def __init__(self, workers=DRIVER_POOL_SIZE, limits=None, default_limits=None):
+        self.workers = workers
+        self.limits = dict(DOMAIN_LIMITS if limits is None else limits)
+        self.default_limits = default_limits or DomainLimits()
+        self._cond = threading.Condition()
+        self._domains = {}
+        self._order = deque()
+        self._threads = []
+        self._closed = False
+
+    def limits_for(self, domain):
+        """Operator overrides first, then the limits the site's scraper declares, then the default"""
+        for key, limits in self.limits.items():
+            if domain == key or domain.endswith("." + key):
+                return limits
+        from .sites import get_site_scraper
+        site_limits = get_site_scraper(domain).rate_limits
+        if site_limits:
+            return DomainLimits(**site_limits)
+        return self.default_limits
+
+    def submit(self, domain, fn, *args, **kwargs):
+        """Queue ``fn`` under ``domain`` and return a Future for its result"""
+        domain = (domain or "").lower()
+        job = _Job(fn, args, kwargs)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Domain scheduler is shut down")
+            queue = self._domains.get(domain)
+            if queue is None:
+                queue = self._domains[domain] = _DomainQueue(self.limits_for(domain))
+                self._order.append(domain)
+            queue.jobs.append(job)
+            self._ensure_workers()
+            self._cond.notify_all()
+        return job.future
+
+    def _ensure_workers(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"scrape-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self):
+        """Pick the next runnable job round-robin across domains, or the time to wait for one"""
+        soonest = None
+        for _ in range(len(self._order)):
+            domain = self._order[0]
+            self._order.rotate(-1)
+            queue = self._domains[domain]
+            if not queue.jobs or queue.active >= queue.limits.max_concurrency:
+                continue
+            delay = queue.bucket.try_take()
+            if delay is None:
+                self._fail_paused(domain, queue)
+                continue
+            if delay > 0:
+                soonest = delay if soonest is None else min(soonest, delay)
+                continue
+
+            job = queue.jobs.popleft()
+            waited = time.monotonic() - job.enqueued_at
+            queue.active += 1
+            queue.dispatched += 1
+            queue.total_wait += waited
+            queue.max_wait = max(queue.max_wait, waited)
+            return domain, job, None
+        return None, None, soonest
+
+    def _fail_paused(self, domain, queue):
+        """Fail the queued jobs of a paused domain so their callers don't wait forever"""
+        logger.warning(f"Scraping {domain} is paused; failing {len(queue.jobs)} queued job(s)")
+        while queue.jobs:
+            job = queue.jobs.popleft()
+            if job.future.set_running_or_notify_cancel():
+                job.future.set_exception(RuntimeError(f"Scraping {domain} is paused (rate 0)"))
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    domain, job, wait = self._next_job()
+                    if job is not None:
+                        break
+                    if self._closed and not any(q.jobs for q in self._domains.values()):
+                        return
+                    self._cond.wait(timeout=wait)
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn(*job.args, **job.kwargs))
+                except BaseException as e:
+                    job.future.set_exception(e)
+
+            with self._cond:
+                self._domains[domain].active -= 1
+                self._cond.notify_all()
+
+    def stats(self):
+        """Queue depth, in-flight count and queueing delay per domain, for tuning limits"""
+        with self._cond:
+            now = time.monotonic()
+            result = {}
+            for domain, queue in self._domains.items():
+                oldest = now - queue.jobs[0].enqueued_at if queue.jobs else 0.0
+                result[domain] = {
+                    "queued": len(queue.jobs),
+                    "active": queue.active,
+                    "dispatched": queue.dispatched,
+                    "avg_wait_s": round(queue.total_wait / queue.dispatched, 2) if queue.dispatched else 0.0,
+                    "max_wait_s": round(queue.max_wait, 2),
+                    "oldest_queued_s": round(oldest, 2),
+                    "rate_per_min": queue.limits.rate_per_min,
+                    "max_concurrency": queue.limits.max_concurrency,
+                }
+            return result
+
+    def shutdown(self, wait=True):
+        """Stop accepting work; workers exit once every queue has drained"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_domain_scheduler():
+    """Process-wide scheduler shared by the update cycle and single-holiday scrapes"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler._closed:
+            _scheduler = DomainScheduler()
+        return _scheduler
+
+
+def shutdown_domain_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is not None:
+            _scheduler.shutdown(wait=False)
+            _scheduler = None
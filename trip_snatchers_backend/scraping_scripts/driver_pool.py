@@ -0,0 +1,238 @@
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from .test import FixedHolidayPriceScraper
+
+try:
+    import psutil
+except ImportError:  # RSS based recycling is skipped when psutil is unavailable
+    psutil = None
+
+logger = logging.getLogger('ScraperDriverPool')
+
+DRIVER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "4"))
+DRIVER_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES_PER_DRIVER", "50"))
+DRIVER_MAX_RSS_MB = float(os.getenv("SCRAPER_MAX_DRIVER_RSS_MB", "1500"))
+# Long-lived Chrome sessions accumulate cookies, caches and leaks; 0 disables age based recycling
+DRIVER_MAX_AGE_MINUTES = float(os.getenv("SCRAPER_MAX_DRIVER_AGE_MINUTES", "60"))
+DRIVER_ACQUIRE_TIMEOUT = float(os.getenv("SCRAPER_POOL_ACQUIRE_TIMEOUT", "900"))
+# Each pool slot reuses its own Chrome profile under this directory; empty disables persistent profiles
+DRIVER_PROFILE_DIR = os.getenv("SCRAPER_PROFILE_DIR", ".scraper_profiles")
+
+
+class _PooledScraper:
+    """Bookkeeping wrapper around a warm FixedHolidayPriceScraper"""
+
+    def __init__(self, scraper, slot=None):
+        self.scraper = scraper
+        self.slot = slot
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+
+
+class DriverPool:
+    """
+    Bounded pool of warm Chrome browsers shared by every scraping worker.
+
+    Browsers are created lazily up to ``size``, health-checked between uses and
+    recycled after ``max_pages`` page loads, after ``max_age_minutes`` or once their
+    process tree grows past ``max_rss_mb``.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES,
+                 max_rss_mb=DRIVER_MAX_RSS_MB, headless=True, profile_dir=DRIVER_PROFILE_DIR,
+                 max_age_minutes=DRIVER_MAX_AGE_MINUTES):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_age_seconds = max_age_minutes * 60
+        self.headless = headless
+        self.profile_dir = profile_dir
+        self._free_slots = list(range(size))  # Chrome can't share a profile between live browsers
+        self._idle = queue.LifoQueue()  # LIFO keeps the most recently used browser hot
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._members = set()
+        self._closed = False
+
+    @contextmanager
+    def scraper(self, timeout=DRIVER_ACQUIRE_TIMEOUT):
+        """Borrow a warm scraper for the duration of the ``with`` block"""
+        pooled = self._acquire(timeout)
+        healthy = True
+        try:
+            yield pooled.scraper
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            pooled.pages_served += 1
+            self._release(pooled, healthy)
+
+    def _acquire(self, timeout):
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser became available within {timeout}s")
+
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+
+                if self._is_healthy(pooled):
+                    return pooled
+                logger.warning("Discarding unhealthy browser from pool")
+                self._destroy(pooled)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, pooled, healthy):
+        try:
+            if healthy:
+                healthy = self._reset(pooled)
+
+            if self._closed or not healthy:
+                self._destroy(pooled)
+            elif pooled.pages_served >= self.max_pages:
+                logger.info(f"Recycling browser after {pooled.pages_served} pages")
+                self._destroy(pooled)
+            elif self.max_age_seconds and self._age(pooled) >= self.max_age_seconds:
+                logger.info(f"Recycling browser after {self._age(pooled) / 60:.0f} minutes")
+                self._destroy(pooled)
+            elif self._rss_mb(pooled) > self.max_rss_mb:
+                logger.info(f"Recycling browser above RSS ceiling of {self.max_rss_mb} MB")
+                self._destroy(pooled)
+            else:
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    def _create(self):
+        logger.info("Launching new pooled browser")
+        with self._lock:
+            slot = self._free_slots.pop() if self._free_slots else None
+        profile = None
+        if self.profile_dir and slot is not None:
+            profile = os.path.join(self.profile_dir, f"slot-{slot}")
+        try:
+            pooled = _PooledScraper(FixedHolidayPriceScraper(headless=self.headless, profile_dir=profile), slot)
+        except Exception:
+            self._free_slot(slot)
+            raise
+        with self._lock:
+            self._members.add(pooled)
+        return pooled
+
+    def _destroy(self, pooled):
+        with self._lock:
+            self._members.discard(pooled)
+        pooled.scraper.close()
+        self._free_slot(pooled.slot)
+
+    def _free_slot(self, slot):
+        if slot is not None:
+            with self._lock:
+                self._free_slots.append(slot)
+
+    def _age(self, pooled):
+        return time.monotonic() - pooled.created_at
+
+    def _is_healthy(self, pooled):
+        try:
+            return pooled.scraper.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, pooled):
+        """Park the browser on a blank page so the last site's DOM is released"""
+        try:
+            pooled.scraper.driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"Browser failed to reset after use: {str(e)}")
+            return False
+
+    def _rss_mb(self, pooled):
+        """Resident memory of this browser's Chrome process tree"""
+        if psutil is None:
+            return 0.0
+        try:
+            driver = pooled.scraper.driver
+            root = psutil.Process(driver.service.process.pid)
+            # chromedriver may be shared by every pooled browser, so pick out this
+            # session's Chrome by its user data directory
+            user_data_dir = driver.capabilities.get("chrome", {}).get("userDataDir")
+            browsers = [
+                child for child in root.children()
+                if user_data_dir and any(user_data_dir in arg for arg in self._cmdline(child))
+            ]
+            processes = []
+            for browser in browsers:
+                processes += [browser] + browser.children(recursive=True)
+            rss = 0
+            for process in processes:
+                try:
+                    rss += process.memory_info().rss
+                except psutil.Error:
+                    continue
+            return rss / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def _cmdline(self, process):
+        try:
+            return process.cmdline()
+        except psutil.Error:
+            return []
+
+    def stats(self):
+        with self._lock:
+            members = len(self._members)
+            oldest = max((self._age(pooled) for pooled in self._members), default=0.0)
+        return {
+            "size": self.size,
+            "browsers": members,
+            "idle": self._idle.qsize(),
+            "oldest_browser_s": round(oldest, 1),
+        }
+
+    def close(self):
+        """Quit every idle browser; borrowed ones are quit when they are returned"""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._destroy(pooled)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Process-wide pool shared by the scheduler, API endpoints and background threads"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = DriverPool()
+        return _pool
+
+
+def shutdown_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .driver_pool import get_driver_pool
+from .http_fetch import scrape_http_sync
+from .selector_stats import get_selector_stats
+from .site_memory import get_site_memory
+from .sites import get_site_scraper
+from .test import extract_from_snapshot, lxml_html
+from .url_utils import registrable_domain, url_domain
+
+logger = logging.getLogger('TieredFetchEngine')
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+# How long a domain stays pinned to the browser tier before the HTTP tier is probed again
+TIER_REPROBE_SECONDS = float(os.getenv("SCRAPER_TIER_REPROBE_HOURS", "24")) * 3600
+# Consecutive HTTP misses before a domain that used to work over HTTP is moved to the browser tier
+HTTP_MISSES_BEFORE_DEMOTION = int(os.getenv("SCRAPER_HTTP_MISSES_BEFORE_DEMOTION", "2"))
+# Capture page_source, hand the browser straight back to the pool and extract in a worker process
+SNAPSHOT_EXTRACTION = os.getenv("SCRAPER_SNAPSHOT_EXTRACTION", "1") == "1" and lxml_html is not None
+EXTRACT_PROCESSES = int(os.getenv("SCRAPER_EXTRACT_PROCESSES", "2"))
+
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+
+
+def _get_extract_pool():
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_PROCESSES)
+        return _extract_pool
+
+
+def shutdown_extract_pool():
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is not None:
+            _extract_pool.shutdown(wait=False, cancel_futures=True)
+            _extract_pool = None
+
+
+def _preferred_tier(domain):
+    declared = get_site_scraper(domain).tier
+    if declared:
+        return declared
+    memory = get_site_memory()
+    tier = memory.get(domain, "tier")
+    if tier == TIER_BROWSER:
+        decided_at = memory.get(domain, "tier_decided_at", 0)
+        if time.time() - decided_at >= TIER_REPROBE_SECONDS:
+            return None
+    return tier
+
+
+def _record_tier(domain, tier):
+    memory = get_site_memory()
+    if memory.get(domain, "tier") != tier:
+        logger.info(f"Domain {domain} now scraped via the {tier} tier")
+    memory.set(domain, "tier", tier)
+    memory.set(domain, "tier_decided_at", time.time())
+    memory.set(domain, "http_misses", 0)
+
+
+def _record_http_miss(domain):
+    """Returns True when the domain should go straight to the browser from now on"""
+    memory = get_site_memory()
+    misses = memory.get(domain, "http_misses", 0) + 1
+    memory.set(domain, "http_misses", misses)
+    return memory.get(domain, "tier") != TIER_HTTP or misses >= HTTP_MISSES_BEFORE_DEMOTION
+
+
+def _scrape_with_browser(url):
+    if not SNAPSHOT_EXTRACTION:
+        with get_driver_pool().scraper() as scraper:
+            return scraper._scrape_price_and_date(url)
+
+    # The browser is only busy while the page loads; parsing happens after it is released
+    with get_driver_pool().scraper() as scraper:
+        snapshot = scraper._capture_snapshot(url)
+    price, departure_date, selector_outcomes = _get_extract_pool().submit(extract_from_snapshot, snapshot).result()
+    get_selector_stats().record(registrable_domain(snapshot.domain), selector_outcomes)
+    return price, departure_date
+
+
+def fetch_price_and_date(url):
+    """
+    Scrape ``url`` with the cheapest tier that yields a confident price.
+
+    A plain HTTP GET with embedded-data parsing is tried first unless the domain
+    is known to need a browser; the pooled Chrome scraper is the fallback. The
+    tier that worked is remembered per domain.
+    """
+    domain = url_domain(url)
+    tier = _preferred_tier(domain)
+
+    if tier != TIER_BROWSER:
+        result = scrape_http_sync(url)
+        if result.confident:
+            logger.info(f"HTTP tier found {result.price} for {url} via {result.source}")
+            _record_tier(domain, TIER_HTTP)
+            return result.price, result.departure_date
+        logger.info(f"HTTP tier not confident for {url}, falling back to browser")
+        if _record_http_miss(domain):
+            _record_tier(domain, TIER_BROWSER)
+
+    return _scrape_with_browser(url)
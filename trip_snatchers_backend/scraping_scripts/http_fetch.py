@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+import os
+import re
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger('HttpPriceFetcher')
+
+HTTP_TIMEOUT = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "15"))
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+MIN_PLAUSIBLE_PRICE = 50
+MAX_PLAUSIBLE_PRICE = 50000
+CURRENCY_SYMBOLS = {"GBP": "£", "EUR": "€", "USD": "$"}
+
+# Keys in embedded app state that hold a whole-holiday price rather than a per-night or per-person figure
+TOTAL_PRICE_KEYS = {"totalprice", "total_price", "totalamount", "grandtotal", "pricetotal", "totalcost"}
+DATE_KEYS = ("departureDate", "departure_date", "startDate", "checkIn", "validFrom")
+URL_DATE_PATTERNS = [
+    r'(?:date|departureDate|dateFrom|chkin|startDate)=(\d{4}-\d{2}-\d{2})',
+    r'/(\d{4}-\d{2}-\d{2})/\d{4}-\d{2}-\d{2}',
+]
+
+
+class HttpScrapeResult:
+    """Outcome of the cheap tier; ``confident`` means no browser render is needed"""
+
+    def __init__(self, price=None, departure_date="date not found", confident=False, source=None):
+        self.price = price
+        self.departure_date = departure_date
+        self.confident = confident
+        self.source = source
+
+    def __repr__(self):
+        return f"HttpScrapeResult({self.price!r}, {self.departure_date!r}, confident={self.confident}, source={self.source})"
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = re.search(r'\d[\d,]*\.?\d*', value)
+        if match:
+            try:
+                return float(match.group().replace(',', ''))
+            except ValueError:
+                return None
+    return None
+
+
+def _format_price(amount, currency="GBP"):
+    symbol = CURRENCY_SYMBOLS.get((currency or "GBP").upper())
+    if symbol:
+        return f"{symbol}{amount:,.2f}"
+    return f"{currency} {amount:,.2f}"
+
+
+def _plausible(amount):
+    return amount is not None and MIN_PLAUSIBLE_PRICE <= amount <= MAX_PLAUSIBLE_PRICE
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk(item)
+
+
+def _load_json(text):
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_date(nodes):
+    for node in nodes:
+        for key in DATE_KEYS:
+            value = node.get(key)
+            if isinstance(value, str):
+                match = re.match(r'\d{4}-\d{2}-\d{2}', value)
+                if match:
+                    return match.group()
+    return None
+
+
+def _date_from_url(url):
+    for pattern in URL_DATE_PATTERNS:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return "date not found"
+
+
+def _extract_json_ld(soup):
+    """Offer prices published as schema.org JSON-LD; these are explicit, so always trusted"""
+    for script in soup.find_all("script", type="application/ld+json"):
+        data = _load_json(script.string)
+        if data is None:
+            continue
+        nodes = list(_walk(data))
+        for node in nodes:
+            node_type = node.get("@type")
+            if node_type not in ("Offer", "AggregateOffer"):
+                continue
+            amount = _to_number(node.get("price", node.get("lowPrice")))
+            if _plausible(amount):
+                return _format_price(amount, node.get("priceCurrency")), _find_date(nodes)
+    return None, None
+
+
+def _extract_microdata(soup):
+    element = soup.find(attrs={"itemprop": "price"})
+    if element is None:
+        return None
+    amount = _to_number(element.get("content") or element.get_text())
+    if not _plausible(amount):
+        return None
+    currency = soup.find(attrs={"itemprop": "priceCurrency"})
+    return _format_price(amount, currency.get("content") if currency else "GBP")
+
+
+def _extract_app_state(soup):
+    """
+    Total-price fields in embedded app state such as Next.js' ``__NEXT_DATA__``.
+
+    Only trusted when every total-price field on the page agrees, since search
+    pages embed prices for many holidays at once.
+    """
+    scripts = soup.select('script#__NEXT_DATA__, script[type="application/json"]')
+    candidates = set()
+    nodes = []
+    for script in scripts:
+        data = _load_json(script.string)
+        if data is None:
+            continue
+        for node in _walk(data):
+            nodes.append(node)
+            for key, value in node.items():
+                if key.lower() not in TOTAL_PRICE_KEYS:
+                    continue
+                if isinstance(value, dict):
+                    amount = _to_number(value.get("amount", value.get("value")))
+                    currency = value.get("currency") or value.get("currencyCode") or "GBP"
+                else:
+                    amount = _to_number(value)
+                    currency = node.get("currency") or node.get("currencyCode") or "GBP"
+                if _plausible(amount):
+                    candidates.add((round(amount, 2), str(currency).upper()))
+    if len(candidates) == 1:
+        amount, currency = candidates.pop()
+        return _format_price(amount, currency), _find_date(nodes), True
+    if candidates:
+        amount, currency = min(candidates)
+        return _format_price(amount, currency), _find_date(nodes), False
+    return None, None, False
+
+
+def parse_html(html, url):
+    """Extract a price and departure date from server-rendered HTML"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    price, date = _extract_json_ld(soup)
+    if price:
+        return HttpScrapeResult(price, date or _date_from_url(url), confident=True, source="json-ld")
+
+    price = _extract_microdata(soup)
+    if price:
+        return HttpScrapeResult(price, _date_from_url(url), confident=True, source="microdata")
+
+    price, date, confident = _extract_app_state(soup)
+    if price:
+        return HttpScrapeResult(price, date or _date_from_url(url), confident=confident, source="app-state")
+
+    return HttpScrapeResult(departure_date=_date_from_url(url))
+
+
+async def fetch_html(url, session=None):
+    """GET a page without a browser; returns None on block pages, redirects to errors or timeouts"""
+    owns_session = session is None
+    if owns_session:
+        session = aiohttp.ClientSession(
+            headers=REQUEST_HEADERS, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+    try:
+        async with session.get(url, allow_redirects=True) as response:
+            if response.status != 200:
+                logger.info(f"HTTP fetch of {url} returned {response.status}")
+                return None
+            return await response.text(errors="replace")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.info(f"HTTP fetch of {url} failed: {str(e)}")
+        return None
+    finally:
+        if owns_session:
+            await session.close()
+
+
+async def scrape_http(url, session=None):
+    html = await fetch_html(url, session=session)
+    if not html:
+        return HttpScrapeResult(departure_date=_date_from_url(url))
+    return parse_html(html, url)
+
+
+def scrape_http_sync(url):
+    """Blocking wrapper for scheduler worker threads, which have no running event loop"""
+    return asyncio.run(scrape_http(url))
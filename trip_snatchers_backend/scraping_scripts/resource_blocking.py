@@ -0,0 +1,68 @@
+import logging
+import os
+
+logger = logging.getLogger('ScraperResourceBlocking')
+
+# URL patterns (DevTools Network.setBlockedURLs wildcards) for each blockable resource category
+RESOURCE_CATEGORIES = {
+    "images": ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.bmp", "*.ico", "*.jpg?*", "*.jpeg?*", "*.png?*", "*.webp?*"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.ts?*", "*.mp3", "*.ogg", "*.mov"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*use.typekit.net*"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+        "*adservice.google.*", "*facebook.net*", "*connect.facebook.*", "*hotjar.com*", "*clarity.ms*",
+        "*bat.bing.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*", "*tiktok.com*", "*snapchat.com*",
+        "*pinterest.com/ct*", "*quantserve.com*", "*scorecardresearch.com*", "*segment.io*", "*segment.com*",
+        "*newrelic.com*", "*nr-data.net*", "*optimizely.com*", "*mouseflow.com*", "*fullstory.com*",
+        "*trustpilot.com*", "*adnxs.com*", "*rlcdn.com*", "*demdex.net*", "*everesttech.net*",
+    ],
+}
+
+# Comma separated categories to block; empty disables blocking
+BLOCKED_CATEGORIES = [
+    c.strip() for c in os.getenv("SCRAPER_BLOCK_RESOURCES", "images,media,fonts,trackers").split(",") if c.strip()
+]
+
+
+def _parse_allow_list(raw):
+    """
+    "domain=pattern|pattern" pairs exempting patterns (or whole categories, or '*')
+    from blocking on one site, e.g. "skyscanner.pk=fonts|*clarity.ms*,tui.co.uk=*".
+    """
+    allow = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        domain, patterns = item.split("=", 1)
+        allow[domain.strip().lower()] = {p.strip() for p in patterns.split("|") if p.strip()}
+    return allow
+
+
+RESOURCE_ALLOW_LIST = _parse_allow_list(os.getenv("SCRAPER_RESOURCE_ALLOW"))
+
+
+def blocked_patterns_for(domain, categories=None, allow_list=None):
+    """URL patterns to block while scraping ``domain``, after its allow-list exemptions"""
+    domain = (domain or "").strip().lower()
+    if domain.startswith("www."):
+        domain = domain[4:]
+    categories = BLOCKED_CATEGORIES if categories is None else categories
+    allow_list = RESOURCE_ALLOW_LIST if allow_list is None else allow_list
+
+    allowed = set()
+    for key, patterns in allow_list.items():
+        if domain == key or domain.endswith("." + key):
+            allowed |= patterns
+    if "*" in allowed:
+        return []
+
+    blocked = []
+    for category in categories:
+        if category in allowed:
+            continue
+        patterns = RESOURCE_CATEGORIES.get(category)
+        if patterns is None:
+            logger.warning(f"Unknown resource category to block: {category}")
+            continue
+        blocked.extend(p for p in patterns if p not in allowed)
+    return blocked
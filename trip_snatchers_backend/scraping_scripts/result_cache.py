@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .url_utils import canonicalize_url
+
+# How long a scraped price is served without scraping the URL again; 0 disables the cache
+RESULT_CACHE_TTL = float(os.getenv("SCRAPER_RESULT_CACHE_TTL_MINUTES", "30")) * 60
+# Most URLs kept; the least recently used one is evicted beyond this
+RESULT_CACHE_SIZE = int(os.getenv("SCRAPER_RESULT_CACHE_SIZE", "2000"))
+
+
+class ScrapeResult:
+    """A successful scrape of one URL"""
+
+    def __init__(self, price, raw_price, departure_date, scraped_at=None):
+        self.price = price
+        self.raw_price = raw_price
+        self.departure_date = departure_date
+        self.scraped_at = scraped_at or time.time()
+
+    def age(self):
+        return time.time() - self.scraped_at
+
+    def __repr__(self):
+        return f"ScrapeResult({self.raw_price!r}, {self.departure_date!r}, age={self.age():.0f}s)"
+
+
+class ScrapeResultCache:
+    """
+    Recent scrape results keyed by canonical URL, with a TTL and LRU eviction.
+
+    Shared by the API routes and the scheduler's update cycle, which both run in
+    the API process, so a URL scraped for one user is not scraped again for the next.
+    """
+
+    def __init__(self, ttl=RESULT_CACHE_TTL, max_size=RESULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, url):
+        """The cached result for ``url`` if it is younger than the TTL, else None"""
+        key = canonicalize_url(url)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None or result.age() >= self.ttl:
+                if result is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, url, result):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        key = canonicalize_url(url)
+        if not key:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url):
+        with self._lock:
+            self._entries.pop(canonicalize_url(url), None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_s": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Process-wide scrape result cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScrapeResultCache()
+        return _cache
@@ -1,116 +1,181 @@
 import logging
+import re
 from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app import models
+from app import crud, models
+from app.alert_digest import flush_alert_digests
+from app.email_outbox import wake_email_dispatcher
+from app.snatch_engine import evaluate_snatches, snatch_for_price
 from app.database import SessionLocal
-from .test import FixedHolidayPriceScraper
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from .domain_scheduler import get_domain_scheduler
+from .fetch_engine import fetch_price_and_date
+from .result_cache import ScrapeResult, get_result_cache
+from .url_utils import url_domain
+from concurrent.futures import Future, as_completed
 
 # Configure logging
 logger = logging.getLogger('HolidayPriceUpdater')
 
 
+def _parse_price(price_str):
+    """
+    Turn a scraped price string such as '£1,498.00' into a float, or None if no price was found.
+    """
+    if not price_str or not isinstance(price_str, str):
+        return None
+    match = re.search(r'[\d,.]+', price_str.replace(',', ''))
+    if not match:
+        return None
+    try:
+        return float(match.group().replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _parse_departure_date(date_str):
+    """
+    The scraped departure date if it is an ISO date, else None (e.g. 'date not found').
+    """
+    if date_str and isinstance(date_str, str) and re.match(r'\d{4}-\d{2}-\d{2}$', date_str):
+        return date_str
+    return None
+
+
+def _scrape_url(url):
+    """
+    Scrape a single URL with the cheapest tier that works for its site and return
+    (numeric_price, raw_price, departure_date, scraped_at).
+    """
+    price_str, date_str = fetch_price_and_date(url)
+    numeric_price = _parse_price(price_str)
+    result = ScrapeResult(numeric_price, price_str, date_str)
+    if numeric_price:
+        get_result_cache().put(url, result)
+    return numeric_price, price_str, date_str, datetime.utcfromtimestamp(result.scraped_at)
+
+
+def _submit_scrape(url):
+    """
+    Queue a scrape on the per-domain scheduler so every caller shares the same site rate limits.
+    A URL scraped within the result cache TTL is answered from the cache without queueing,
+    with the time of the original scrape so it is not recorded again as a new one.
+    """
+    cached = get_result_cache().get(url)
+    if cached:
+        logger.info(f"Using price scraped {cached.age():.0f}s ago for {url}")
+        future = Future()
+        future.set_result((
+            cached.price, cached.raw_price, cached.departure_date, datetime.utcfromtimestamp(cached.scraped_at)
+        ))
+        return future
+    return get_domain_scheduler().submit(url_domain(url), _scrape_url, url)
+
+
 def scrape_and_update_single_holiday(holiday_id: int):
     """
     Scrape and update the price for a single holiday by its ID.
     """
     db: Session = SessionLocal()
-    scraper = FixedHolidayPriceScraper(headless=True)
     try:
         holiday = db.query(models.HolidayTrack).filter(models.HolidayTrack.id == holiday_id).first()
         if not holiday:
             logger.warning(f"Holiday with ID {holiday_id} not found.")
             return
-        logger.info(f"Scraping price for new holiday: {holiday.url}")
-        price_str, date_str = scraper._scrape_price_and_date(holiday.url)
+        # The canonical URL is only a key; the site is fetched with the search as a user entered it
+        url = holiday.holiday_url.fetch_url or holiday.url
+        logger.info(f"Scraping price for new holiday: {url}")
+        numeric_price, price_str, date_str, scraped_at = _submit_scrape(url).result()
         logger.info(f"Scraped price: {price_str}, date: {date_str}")
-        numeric_price = None
-        if price_str and isinstance(price_str, str):
-            import re
-            match = re.search(r'[\d,.]+', price_str.replace(',', ''))
-            if match:
-                try:
-                    numeric_price = float(match.group().replace(',', ''))
-                except Exception:
-                    numeric_price = None
         if numeric_price:
-            holiday.current_price = numeric_price
-            holiday.updated_at = datetime.utcnow() if hasattr(holiday, 'updated_at') else holiday.created_at
-            db.commit()
-            logger.info(f"Updated DB: {holiday.url} -> {numeric_price}")
-
-            # Snatching logic: if price is at or below target and holiday is still active
-            if holiday.is_active and numeric_price <= holiday.target_price:
-                from app.email_utils import send_price_alert
-                from app.crud import create_snatched_deal
-                user = db.query(models.User).filter(models.User.id == holiday.user_id).first()
-                if user:
-                    send_price_alert(
-                        user_email=user.email,
-                        holiday_url=holiday.url,
-                        target_price=numeric_price
-                    )
-                    create_snatched_deal(
-                        db=db,
-                        user_id=user.id,
-                        holiday_track=holiday,
-                        snatched_price=numeric_price
-                    )
+            if crud.update_holiday_url_price(
+                db, holiday.holiday_url_id, numeric_price, _parse_departure_date(date_str), scraped_at
+            ):
+                db.refresh(holiday.holiday_url)
+                logger.info(f"Updated DB: {url} -> {numeric_price}")
+            # Every track of this URL is checked, not just the new one
+            snatch_for_price(db, holiday.holiday_url_id, numeric_price)
         else:
             logger.warning(f"Could not extract numeric price for {holiday.url}: {price_str}")
     finally:
-        scraper.close()
+        db.close()
+
+
+def _active_holiday_urls(db: Session):
+    """
+    Map the URL to fetch for each holiday_urls row with at least one active holiday track to
+    the row's ID. That is the URL as first entered, not the canonical key.
+    """
+    fetch_url = func.coalesce(models.HolidayUrl.fetch_url, models.HolidayUrl.url)
+    rows = db.query(fetch_url, models.HolidayUrl.id, func.count(models.HolidayTrack.id))\
+        .join(models.HolidayTrack, models.HolidayTrack.holiday_url_id == models.HolidayUrl.id)\
+        .filter(models.HolidayTrack.is_active == True)\
+        .group_by(models.HolidayUrl.id).all()
+    logger.info(f"Found {sum(count for _, _, count in rows)} active holidays across {len(rows)} unique URLs.")
+    return {url: holiday_url_id for url, holiday_url_id, _ in rows}
+
+
+def _apply_price_to_url(holiday_url_id, numeric_price, date_str, scraped_at):
+    """
+    Write one scraped price to the shared URL row every track of that URL reads from, and
+    snatch the tracks it satisfies straight away. Returns the number snatched.
+
+    A price already recorded, e.g. one served from the scrape cache, is not written again,
+    but the tracks it satisfies are still snatched.
+    """
+    db: Session = SessionLocal()
+    try:
+        crud.update_holiday_url_price(
+            db, holiday_url_id, numeric_price, _parse_departure_date(date_str), scraped_at
+        )
+        return snatch_for_price(db, holiday_url_id, numeric_price)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
         db.close()
 
 
 def update_all_tracked_holiday_prices():
     """
-    Multi-threaded: Scrape and update current prices for all active tracked holidays in the database,
-    using threads for each user and for each holiday of that user.
+    Scrape every distinct tracked URL once and fan the price out to all active holiday tracks
+    sharing that URL, so the cost of a cycle scales with unique URLs rather than tracks.
     """
     db: Session = SessionLocal()
     try:
-        users = db.query(models.User).all()
-        logger.info(f"Found {len(users)} users to update.")
-        def update_user_holidays(user):
-            user_db = SessionLocal()
-            try:
-                holidays = user_db.query(models.HolidayTrack).filter(models.HolidayTrack.user_id == user.id, models.HolidayTrack.is_active == True).all()
-                logger.info(f"User {user.email}: {len(holidays)} holidays to update.")
-                def update_holiday(holiday):
-                    scraper = FixedHolidayPriceScraper(headless=True)
-                    try:
-                        logger.info(f"User {user.email}: Scraping {holiday.url}")
-                        price_str = scraper._scrape_price(holiday.url)
-                        logger.info(f"User {user.email}: Scraped price: {price_str}")
-                        numeric_price = None
-                        if price_str and isinstance(price_str, str):
-                            import re
-                            match = re.search(r'[\d,.]+', price_str.replace(',', ''))
-                            if match:
-                                try:
-                                    numeric_price = float(match.group().replace(',', ''))
-                                except Exception:
-                                    numeric_price = None
-                        if numeric_price:
-                            holiday.current_price = numeric_price
-                            holiday.updated_at = datetime.utcnow() if hasattr(holiday, 'updated_at') else holiday.created_at
-                            user_db.commit()
-                            logger.info(f"User {user.email}: Updated DB: {holiday.url} -> {numeric_price}")
-                        else:
-                            logger.warning(f"User {user.email}: Could not extract numeric price for {holiday.url}: {price_str}")
-                    finally:
-                        scraper.close()
-                with ThreadPoolExecutor(max_workers=4) as holiday_executor:
-                    holiday_futures = [holiday_executor.submit(update_holiday, h) for h in holidays]
-                    for f in as_completed(holiday_futures):
-                        pass  # Just wait for all to finish
-            finally:
-                user_db.close()
-        with ThreadPoolExecutor(max_workers=4) as user_executor:
-            user_futures = [user_executor.submit(update_user_holidays, u) for u in users]
-            for f in as_completed(user_futures):
-                pass  # Wait for all users to finish
-        logger.info("Multi-threaded holiday price update complete.")
+        holiday_urls = _active_holiday_urls(db)
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+    if not holiday_urls:
+        return
+
+    started = datetime.utcnow()
+    futures = {_submit_scrape(url): url for url in holiday_urls}
+    for future in as_completed(futures):
+        url = futures[future]
+        try:
+            numeric_price, price_str, date_str, scraped_at = future.result()
+        except Exception as e:
+            logger.error(f"Scraping failed for {url}: {str(e)}")
+            continue
+        if not numeric_price:
+            logger.warning(f"Could not extract numeric price for {url}: {price_str}")
+            continue
+        snatched = _apply_price_to_url(holiday_urls[url], numeric_price, date_str, scraped_at)
+        logger.info(f"Updated {url} -> {numeric_price}, snatched {snatched} holiday(s)")
+
+    # Catch tracks whose target was met by a price written outside this cycle
+    db = SessionLocal()
+    try:
+        snatched = evaluate_snatches(db)
+        logger.info(f"Snatched {snatched} more holiday(s) at the end of the cycle.")
+        # No more snatches are coming this cycle, so each user's digest can go now
+        flush_alert_digests(db, force=True)
+    finally:
+        db.close()
+    wake_email_dispatcher()
+
+    for domain, stats in get_domain_scheduler().stats().items():
+        logger.info(f"Domain {domain}: {stats}")
+    logger.info(f"Holiday price update complete in {(datetime.utcnow() - started).total_seconds():.0f}s.")
@@ -0,0 +1,107 @@
+import copy
+import os
+import threading
+import time
+
+from .site_memory import get_site_memory
+
+# Hits and tries lose half their weight after this long, so ordering follows site redesigns
+SELECTOR_HALF_LIFE_SECONDS = float(os.getenv("SCRAPER_SELECTOR_HALF_LIFE_DAYS", "14")) * 86400
+# A selector tried this many (decayed) times without a hit is reported as dead
+DEAD_SELECTOR_TRIES = float(os.getenv("SCRAPER_DEAD_SELECTOR_TRIES", "10"))
+# Unseen selectors start at a 50% hit rate and keep their declared order among themselves
+PRIOR_HITS = 1.0
+PRIOR_TRIES = 2.0
+
+MEMORY_KEY = "selector_stats"
+
+
+def _decayed(entry, now):
+    """(hits, tries) of a stored [hits, tries, updated_at] entry, decayed to ``now``"""
+    hits, tries, updated_at = entry
+    factor = 0.5 ** (max(now - updated_at, 0) / SELECTOR_HALF_LIFE_SECONDS)
+    return hits * factor, tries * factor
+
+
+def hit_rate(entry, now=None):
+    if not entry:
+        return PRIOR_HITS / PRIOR_TRIES
+    hits, tries = _decayed(entry, now or time.time())
+    return (hits + PRIOR_HITS) / (tries + PRIOR_TRIES)
+
+
+def order_selectors(field_stats, selectors):
+    """``selectors`` sorted by decayed hit rate, best first; ties keep the declared order"""
+    now = time.time()
+    rates = {selector: hit_rate(field_stats.get(selector), now) for selector in selectors}
+    return sorted(selectors, key=lambda selector: -rates[selector])
+
+
+class SelectorStats:
+    """
+    Per-domain, per-field hit history of site scraper selectors, kept in site memory.
+
+    Stored as ``{field: {selector: [hits, tries, updated_at]}}`` under each domain.
+    """
+
+    def __init__(self, memory=None):
+        self.memory = memory or get_site_memory()
+        self._lock = threading.Lock()
+
+    def for_domain(self, domain):
+        """Copy of a domain's stats, safe to ship to an extraction worker process"""
+        return copy.deepcopy(self.memory.get(domain, MEMORY_KEY, {}))
+
+    def record(self, domain, outcomes):
+        """
+        Fold ``(field, tried, winner)`` outcomes of one extraction into the history.
+
+        Every tried selector gains a try; the winner, if any, also gains a hit.
+        """
+        if not domain or not outcomes:
+            return
+        now = time.time()
+        with self._lock:
+            stats = self.for_domain(domain)
+            for field, tried, winner in outcomes:
+                field_stats = stats.setdefault(field, {})
+                for selector in tried:
+                    entry = field_stats.get(selector)
+                    hits, tries = _decayed(entry, now) if entry else (0.0, 0.0)
+                    if selector == winner:
+                        hits += 1
+                    field_stats[selector] = [round(hits, 4), round(tries + 1, 4), now]
+            self.memory.set(domain, MEMORY_KEY, stats)
+
+    def report(self):
+        """Hit rates per domain and field, with selectors that have stopped matching flagged as dead"""
+        now = time.time()
+        report = {}
+        for domain, values in self.memory.snapshot().items():
+            for field, field_stats in values.get(MEMORY_KEY, {}).items():
+                selectors = []
+                for selector, entry in field_stats.items():
+                    hits, tries = _decayed(entry, now)
+                    selectors.append({
+                        "selector": selector,
+                        "hit_rate": round(hit_rate(entry, now), 3),
+                        "hits": round(hits, 2),
+                        "tries": round(tries, 2),
+                        "dead": hits < 0.5 and tries >= DEAD_SELECTOR_TRIES,
+                    })
+                selectors.sort(key=lambda s: -s["hit_rate"])
+                report.setdefault(domain, {})[field] = selectors
+        return report
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_selector_stats():
+    """Process-wide selector history backed by the shared site memory"""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = SelectorStats()
+        return _stats
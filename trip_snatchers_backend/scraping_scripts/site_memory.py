@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger('ScraperSiteMemory')
+
+SITE_MEMORY_FILE = os.getenv("SCRAPER_SITE_MEMORY_FILE", "scraper_site_memory.json")
+SITE_MEMORY_SAVE_INTERVAL = float(os.getenv("SCRAPER_SITE_MEMORY_SAVE_INTERVAL", "30"))
+
+
+class SiteMemory:
+    """
+    Small per-domain store of what the scrapers have learned about each site.
+
+    Values live in memory and are flushed to a JSON file at most every
+    ``save_interval`` seconds, so learned behaviour survives restarts without a
+    disk write per page.
+    """
+
+    def __init__(self, path=SITE_MEMORY_FILE, save_interval=SITE_MEMORY_SAVE_INTERVAL):
+        self.path = path
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load site memory from {self.path}: {str(e)}")
+            return {}
+
+    def get(self, domain, key, default=None):
+        with self._lock:
+            return self._data.get(domain, {}).get(key, default)
+
+    def set(self, domain, key, value):
+        with self._lock:
+            self._data.setdefault(domain, {})[key] = value
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= self.save_interval
+        if due:
+            self.save()
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._data))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._data, indent=2, sort_keys=True)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save site memory to {self.path}: {str(e)}")
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_site_memory():
+    """Process-wide site memory shared by every scraper component"""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = SiteMemory()
+        return _memory
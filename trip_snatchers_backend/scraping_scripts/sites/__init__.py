@@ -0,0 +1,52 @@
+import importlib
+import logging
+import threading
+
+from ..url_utils import registrable_domain
+
+logger = logging.getLogger('ScraperSiteRegistry')
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _module_name(domain):
+    return domain.replace('.', '_').replace('-', '_')
+
+
+def _load_site(domain):
+    """
+    Import the module for ``domain`` on first use; sites without one get the generic scraper.
+
+    A site is added by dropping ``<domain with dots as underscores>.py`` into this package
+    with a module-level ``SITE`` instance of a SiteScraper subclass.
+    """
+    from .base import GENERIC_SITE
+
+    if not domain:
+        return GENERIC_SITE
+    module_path = f"{__name__}.{_module_name(domain)}"
+    try:
+        module = importlib.import_module(module_path)
+    except ModuleNotFoundError as e:
+        if e.name != module_path:
+            raise
+        return GENERIC_SITE
+    # Helper modules such as base.py share the namespace but define no SITE
+    site = getattr(module, 'SITE', None)
+    if site is None:
+        return GENERIC_SITE
+    logger.info(f"Loaded site scraper for {domain}")
+    return site
+
+
+def get_site_scraper(host):
+    """Scraper for a host or URL, dispatched on its registrable domain"""
+    domain = registrable_domain(host)
+    site = _registry.get(domain)
+    if site is None:
+        with _registry_lock:
+            site = _registry.get(domain)
+            if site is None:
+                site = _registry[domain] = _load_site(domain)
+    return site
@@ -0,0 +1,121 @@
+import logging
+import re
+
+from ..selector_stats import order_selectors
+from ..wait_strategies import AllOf, ElementPresent, NetworkIdle
+
+logger = logging.getLogger('FixedHolidayPriceScraper')
+
+
+class SelectorRun:
+    """
+    (selector, text) matches for one field, best hit rate first, one selector's matches at a time.
+
+    Site code calls ``accept(selector)`` for the selector whose match it uses; iteration stops
+    once that selector's matches are consumed, so the remaining selectors are never queried.
+    The page keeps every run so the extraction can report what was tried and what won.
+    """
+
+    def __init__(self, page, field, selectors):
+        self.page = page
+        self.field = field
+        self.order = order_selectors(page.selector_stats.get(field, {}), selectors)
+        self.tried = []
+        self.winner = None
+        page.selector_runs.append(self)
+
+    def accept(self, selector):
+        if self.winner is None:
+            self.winner = selector
+
+    def outcome(self):
+        return self.field, self.tried, self.winner
+
+    def __iter__(self):
+        position = 0
+        while position < len(self.order) and self.winner is None:
+            remaining = self.order[position:]
+            matches = self.page._collect_candidates(remaining, first_match_only=True)
+            if not matches:
+                self.tried.extend(remaining)
+                return
+            index = matches[0][0]
+            selector = remaining[index]
+            self.tried.extend(remaining[:index + 1])
+            position += index + 1
+            for _, text in matches:
+                yield selector, text
+
+
+class SiteScraper:
+    """
+    Price and date extraction for one site, keyed by its registrable domain.
+
+    Subclasses declare what the fetch pipeline needs to know about the site as class
+    attributes and implement ``scrape_price`` / ``scrape_date``. ``page`` is the live
+    FixedHolidayPriceScraper or a SnapshotScraper; site code reads the loaded page only
+    through its ``_collect_candidates``, ``_page_text`` and ``_current_url`` helpers.
+    This base class is also the generic scraper used for sites without a module.
+    """
+
+    domain = None
+    # Readiness condition the page must meet before prices are read
+    wait_strategy = AllOf(
+        ElementPresent("//*[contains(text(), '£')]", "//*[contains(text(), 'Rs')]"),
+        NetworkIdle(500),
+    )
+    # Fetch tier to use ("http" or "browser"); None lets the fetch engine learn it
+    tier = None
+    # {"rate_per_min", "burst", "max_concurrency"} for the domain scheduler; None uses its defaults
+    rate_limits = None
+    price_selectors = []
+    date_selectors = []
+    # URL canonicalization: host the site serves from, extra query keys that never change the
+    # search, extra query keys holding dates, and the date format the site expects
+    canonical_host = None
+    ignored_params = ()
+    date_params = ()
+    date_format = '%Y-%m-%d'
+
+    def selector_run(self, page, field, selectors):
+        return SelectorRun(page, field, selectors)
+
+    def scrape_price(self, page):
+        """Enhanced generic scraping"""
+        try:
+            body_text = page._page_text()
+            
+            gbp_prices = re.findall(r'£\s*[\d,]+\.?\d*', body_text)
+            pkr_prices = re.findall(r'Rs\s*[\d,]+\.?\d*', body_text)
+            
+            all_prices = []
+            
+            for price in gbp_prices:
+                converted = page._convert_currency(price, 'GBP')
+                if converted:
+                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
+                    if 50 <= numeric <= 50000:
+                        all_prices.append((numeric, converted))
+            
+            for price in pkr_prices:
+                converted = page._convert_currency(price, 'PKR')
+                if converted:
+                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
+                    if 50 <= numeric <= 50000:
+                        all_prices.append((numeric, converted))
+            
+            if all_prices:
+                return max(all_prices, key=lambda x: x[0])[1]
+            
+            return "price not found"
+        
+        except Exception as e:
+            logger.error(f"Error in generic scraping: {str(e)}")
+            return "generic scraping error"
+
+    def scrape_date(self, page, page_text):
+        """Extract departure date for generic scraping"""
+        return page._extract_date(page_text)
+
+
+GENERIC_SITE = SiteScraper()
@@ -0,0 +1,84 @@
+import logging
+import re
+
+from ..wait_strategies import AllOf, DomStable, ElementPresent
+from .base import SiteScraper
+
+logger = logging.getLogger('FixedHolidayPriceScraper')
+
+
+class Jet2Scraper(SiteScraper):
+    domain = "jet2.com"
+    canonical_host = "www.jet2.com"
+    wait_strategy = AllOf(ElementPresent("//*[contains(text(), '£')]"), DomStable(750))
+
+    price_selectors = [
+        "//*[contains(text(), 'Total so far')]//following::*[contains(text(), '£')][1]",
+        "//*[contains(text(), 'Total')]//following::*[contains(text(), '£')][1]",
+        "//*[contains(@class, 'total')]//span[contains(text(), '£')]",
+        "//*[contains(@class, 'price-display')]//span[contains(text(), '£')]",
+        "//*[contains(@class, 'booking-total')]//span[contains(text(), '£')]",
+        "//*[contains(@class, 'price-summary')]//span[contains(text(), '£')]",
+        "//span[contains(@class, 'price')]",
+        "//*[@data-testid='price']",
+        "//div[contains(text(), '£')]"
+    ]
+
+    date_selectors = [
+        "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
+        "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
+        "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jan') or contains(text(), 'Feb') or contains(text(), 'Mar') or contains(text(), 'Apr') or contains(text(), 'May') or contains(text(), 'Jun') or contains(text(), 'Jul') or contains(text(), 'Aug') or contains(text(), 'Sep') or contains(text(), 'Oct') or contains(text(), 'Nov') or contains(text(), 'Dec')]"
+    ]
+
+    def scrape_price(self, page):
+        """Fixed Jet2 scraping"""
+        try:
+            all_prices = []
+            
+            run = self.selector_run(page, 'price', self.price_selectors)
+            for selector, price_text in run:
+                try:
+                    if '£' in price_text and any(char.isdigit() for char in price_text):
+                        converted = page._convert_currency(price_text)
+                        if converted:
+                            numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
+                            if 100 <= numeric <= 50000:
+                                all_prices.append((numeric, converted, price_text))
+                                run.accept(selector)
+                except Exception:
+                    continue
+            
+            if all_prices:
+                all_prices.sort(key=lambda x: x[0], reverse=True)
+                logger.info(f"Found prices: {[p[2] for p in all_prices[:3]]}")
+                return all_prices[0][1]
+            
+            return "price not found"
+        
+        except Exception as e:
+            logger.error(f"Error in Jet2 scraping: {str(e)}")
+            return "jet2 scraping error"
+
+    def scrape_date(self, page, page_text):
+        """Extract departure date from Jet2"""
+        try:
+            run = self.selector_run(page, 'date', self.date_selectors)
+            for selector, date_text in run:
+                try:
+                    logger.info(f"Jet2 found date element: '{date_text}'")
+                    extracted_date = page._extract_date(date_text)
+                    if extracted_date != "date not found":
+                        run.accept(selector)
+                        return extracted_date
+                except Exception as e:
+                    logger.error(f"Error with Jet2 date selector {selector}: {str(e)}")
+                    continue
+            
+            return page._extract_date(page_text)
+        
+        except Exception as e:
+            logger.error(f"Error in Jet2 date scraping: {str(e)}")
+            return "date extraction error"
+
+
+SITE = Jet2Scraper()
@@ -0,0 +1,123 @@
+import logging
+import re
+
+from ..wait_strategies import AllOf, DomStable, ElementPresent
+from .base import SiteScraper
+
+logger = logging.getLogger('FixedHolidayPriceScraper')
+
+
+class TuiScraper(SiteScraper):
+    domain = "tui.co.uk"
+    canonical_host = "www.tui.co.uk"
+    wait_strategy = AllOf(
+        ElementPresent("//*[contains(text(), '£')]", "//*[contains(text(), 'Rs')]", "//*[contains(text(), 'Total')]"),
+        DomStable(1000),
+    )
+
+    price_selectors = [
+        "//*[@data-testid='price' or @data-testid='total-price']",
+        "//*[contains(@class, 'price-display') or contains(@class, 'total-price')]",
+        "//*[contains(@class, 'booking-total') or contains(@class, 'price-summary')]",
+        "//*[contains(text(), 'Total Price') or contains(text(), 'Total')]/following::*[contains(text(), '£') or contains(text(), 'Rs')][1]",
+        "//*[contains(text(), 'Total')]//*[contains(text(), '£') or contains(text(), 'Rs')]",
+        "//span[contains(text(), '£') or contains(text(), 'Rs')]",
+        "//div[contains(text(), '£') or contains(text(), 'Rs')]",
+        "//strong[contains(text(), '£') or contains(text(), 'Rs')]"
+    ]
+
+    date_selectors = [
+        "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
+        "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
+        "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jan') or contains(text(), 'Feb') or contains(text(), 'Mar') or contains(text(), 'Apr') or contains(text(), 'May') or contains(text(), 'Jun') or contains(text(), 'Jul') or contains(text(), 'Aug') or contains(text(), 'Sep') or contains(text(), 'Oct') or contains(text(), 'Nov') or contains(text(), 'Dec')]"
+    ]
+
+    def scrape_price(self, page):
+        """FIXED TUI scraping"""
+        try:
+            page_text = page._page_text()
+            logger.info(f"TUI page text preview: {page_text[:500]}...")
+            
+            is_pkr_page = 'Rs' in page_text or 'PKR' in page_text
+            
+            found_prices = []
+            
+            run = self.selector_run(page, 'price', self.price_selectors)
+            for selector, price_text in run:
+                try:
+                    logger.info(f"TUI found element: '{price_text}'")
+                    
+                    if is_pkr_page and ('Rs' in price_text or 'PKR' in price_text):
+                        numeric_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
+                        if numeric_match:
+                            price_value = float(numeric_match.group().replace(',', ''))
+                            if 50000 <= price_value <= 2000000:
+                                pkr_price = f"Rs {price_value:,.0f}"
+                                found_prices.append((price_value, pkr_price, price_text))
+                                run.accept(selector)
+                    elif '£' in price_text and any(char.isdigit() for char in price_text):
+                        converted = page._convert_currency(price_text)
+                        if converted:
+                            numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
+                            if 200 <= numeric <= 50000:
+                                found_prices.append((numeric, converted, price_text))
+                                run.accept(selector)
+                except Exception as e:
+                    logger.error(f"Error with TUI selector {selector}: {str(e)}")
+                    continue
+            
+            if found_prices:
+                found_prices.sort(key=lambda x: x[0], reverse=True)
+                logger.info(f"TUI found prices: {[(p[2], p[1]) for p in found_prices[:5]]}")
+                return found_prices[0][1]
+            
+            if is_pkr_page:
+                pkr_matches = re.findall(r'Rs\s*[\d,]+\.?\d*', page_text)
+                if pkr_matches:
+                    logger.info(f"TUI PKR fallback found: {pkr_matches}")
+                    for match in pkr_matches:
+                        numeric_match = re.search(r'[\d,]+\.?\d*', match.replace(',', ''))
+                        if numeric_match:
+                            price_value = float(numeric_match.group().replace(',', ''))
+                            if 50000 <= price_value <= 2000000:
+                                return f"Rs {price_value:,.0f}"
+            else:
+                gbp_matches = re.findall(r'£\s*[\d,]+\.?\d*', page_text)
+                if gbp_matches:
+                    logger.info(f"TUI GBP fallback found: {gbp_matches}")
+                    for match in gbp_matches:
+                        converted = page._convert_currency(match)
+                        if converted:
+                            numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
+                            if 200 <= numeric <= 50000:
+                                return converted
+            
+            return "price not found"
+        
+        except Exception as e:
+            logger.error(f"Error in TUI scraping: {str(e)}")
+            return "tui scraping error"
+
+    def scrape_date(self, page, page_text):
+        """Extract departure date from TUI"""
+        try:
+            run = self.selector_run(page, 'date', self.date_selectors)
+            for selector, date_text in run:
+                try:
+                    logger.info(f"TUI found date element: '{date_text}'")
+                    extracted_date = page._extract_date(date_text)
+                    if extracted_date != "date not found":
+                        run.accept(selector)
+                        return extracted_date
+                except Exception as e:
+                    logger.error(f"Error with TUI date selector {selector}: {str(e)}")
+                    continue
+            
+            return page._extract_date(page_text)
+        
+        except Exception as e:
+            logger.error(f"Error in TUI date scraping: {str(e)}")
+            return "date extraction error"
+
+
+SITE = TuiScraper()
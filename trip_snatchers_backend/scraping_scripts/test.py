@@ -11,9 +11,19 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
+from .chromedriver import get_chrome_service
+from .resource_blocking import blocked_patterns_for
+from .selector_stats import get_selector_stats
+from .site_memory import get_site_memory
+from .sites import get_site_scraper
+from .url_utils import registrable_domain
+from .wait_strategies import get_politeness_budget
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # snapshot extraction is unavailable without lxml; pages are then read live
+    lxml_html = None
 
 # Configure logging
 logging.basicConfig(
@@ -21,12 +31,92 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('FixedHolidayPriceScraper')
 
+# Cookie banners: reject patterns first, accept patterns as fallback
+CONSENT_PATTERNS = [
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'reject')]",
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'decline')]",
+    "//button[@id='onetrust-reject-all-handler']",
+    "//button[@data-testid='reject-all']",
+    "//*[contains(@class, 'reject-all')]//button",
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept')]",
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'agree')]",
+    "//button[@id='onetrust-accept-btn-handler']",
+    "//button[@data-testid='accept-all']",
+    "//*[contains(@class, 'accept-all')]//button"
+]
+# Site memory marker for domains where no banner was found
+CONSENT_NONE = "none"
+# How long to keep polling for a banner that is injected after load
+CONSENT_WAIT = float(os.getenv("SCRAPER_CONSENT_WAIT", "0.8"))
+# Shorter poll for domains last seen without a banner, which may still inject one late (A/B tests, geo)
+CONSENT_NONE_WAIT = float(os.getenv("SCRAPER_CONSENT_NONE_WAIT", "0.3"))
+# After this long a domain marked as having no banner gets the full wait again
+CONSENT_NONE_TTL = float(os.getenv("SCRAPER_CONSENT_NONE_TTL_HOURS", "24")) * 3600
+# Cookies set by the common consent platforms once a choice has been made
+CONSENT_COOKIE_PATTERN = r"(^|;\s*)(OptanonAlertBoxClosed|CookieConsent|cookieconsent_status|euconsent-v2|didomi_token|consentUUID)="
+CONSENT_SCRIPT = """
+    const patterns = arguments[0], cookiePattern = arguments[1];
+    if (cookiePattern && new RegExp(cookiePattern).test(document.cookie)) return ['cookie', null];
+    for (let i = 0; i < patterns.length; i++) {
+        let button = null;
+        try {
+            button = document.evaluate(patterns[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } catch (e) {
+            continue;
+        }
+        if (button && button.getClientRects().length && !button.disabled) {
+            button.click();
+            return [i, button];
+        }
+    }
+    return [-1, null];
+"""
+
+# Ship each site's whole selector list to the browser in one execute_script call instead of
+# a find_elements / is_displayed / .text round trip per element
+BATCH_EXTRACTION = os.getenv("SCRAPER_BATCH_EXTRACTION", "1") == "1"
+COLLECT_CANDIDATES_SCRIPT = """
+    const selectors = arguments[0], firstMatchOnly = arguments[1], out = [];
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        if (rect.width <= 0 || rect.height <= 0) return false;
+        const style = window.getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+    };
+    for (let index = 0; index < selectors.length; index++) {
+        const selector = selectors[index];
+        let nodes = [];
+        try {
+            if (selector.startsWith('//')) {
+                const snapshot = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+            } else {
+                nodes = Array.from(document.querySelectorAll(selector));
+            }
+        } catch (e) {
+            continue;
+        }
+        for (const node of nodes) {
+            if (node.nodeType === Node.ELEMENT_NODE && visible(node)) {
+                out.push([index, (node.innerText || '').trim()]);
+            }
+        }
+        if (firstMatchOnly && out.length) break;
+    }
+    return out;
+"""
+
 class FixedHolidayPriceScraper:
-    def __init__(self, headless=False):
+    # PKR to GBP conversion rate
+    PKR_TO_GBP = 0.0028
+
+    def __init__(self, headless=False, profile_dir=None):
         self.chrome_options = Options()
         
-        # PKR to GBP conversion rate
-        self.PKR_TO_GBP = 0.0028
+        # A persistent profile keeps consent cookies between sessions so banners rarely reappear
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+            self.chrome_options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
         
         if headless:
             self.chrome_options.add_argument("--headless=new")
@@ -51,14 +141,28 @@ class FixedHolidayPriceScraper:
         
         try:
             self.driver = webdriver.Chrome(
-                service=ChromeService(ChromeDriverManager().install()),
+                service=get_chrome_service(),
                 options=self.chrome_options
             )
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._blocked_patterns = None
         except Exception as e:
             logger.error(f"Failed to initialize Chrome driver: {str(e)}")
             raise
 
+    def _apply_resource_blocking(self, domain):
+        """Drop images, media, fonts and trackers via DevTools, minus the site's allow-list"""
+        patterns = blocked_patterns_for(domain)
+        if patterns == self._blocked_patterns:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            self._blocked_patterns = patterns
+            logger.info(f"Blocking {len(patterns)} resource patterns for {domain.strip()}")
+        except WebDriverException as e:
+            logger.warning(f"Could not configure resource blocking: {str(e)}")
+
     def _random_delay(self, min_sec=2, max_sec=6):
         """Random delay to mimic human behavior"""
         delay = random.uniform(min_sec, max_sec)
@@ -73,45 +177,97 @@ class FixedHolidayPriceScraper:
             cleaned = 'https://' + cleaned
         return cleaned
 
-    def _handle_cookie_consent(self):
-        """Enhanced cookie consent handling"""
+    def _handle_cookie_consent(self, domain=''):
+        """
+        Clear the cookie banner with one combined in-page check per poll.
+
+        Patterns are tried reject-first, with the selector that last worked for the domain
+        promoted to the front. Domains recently seen without a banner are polled briefly, and
+        pages that already carry a consent cookie from the persistent profile return after a
+        single round trip.
+        """
         try:
-            logger.info("Handling cookie consent")
-            self._random_delay(1, 3)
-            
-            consent_patterns = [
-                # Reject patterns (preferred)
-                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'reject')]",
-                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'decline')]",
-                "//button[@id='onetrust-reject-all-handler']",
-                "//button[@data-testid='reject-all']",
-                "//*[contains(@class, 'reject-all')]//button",
-                
-                # Accept patterns (fallback)
-                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'accept')]",
-                "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'agree')]",
-                "//button[@id='onetrust-accept-btn-handler']",
-                "//button[@data-testid='accept-all']",
-                "//*[contains(@class, 'accept-all')]//button"
-            ]
-            
-            for pattern in consent_patterns:
-                try:
-                    button = WebDriverWait(self.driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, pattern))
-                    )
-                    self.driver.execute_script("arguments[0].click();", button)
+            memory = get_site_memory()
+            site = domain.strip()
+            known = memory.get(site, "consent_selector")
+            if known == CONSENT_NONE and time.time() - memory.get(site, "consent_none_at", 0) >= CONSENT_NONE_TTL:
+                known = None
+            patterns = list(CONSENT_PATTERNS)
+            if known in patterns:
+                patterns.remove(known)
+                patterns.insert(0, known)
+            
+            wait = CONSENT_NONE_WAIT if known == CONSENT_NONE else CONSENT_WAIT
+            deadline = time.monotonic() + wait
+            while True:
+                index, button = self.driver.execute_script(CONSENT_SCRIPT, patterns, CONSENT_COOKIE_PATTERN)
+                if index == 'cookie':
+                    logger.info("Consent cookie already present, skipping banner")
+                    return True
+                if index >= 0:
                     logger.info(f"Clicked cookie consent button")
-                    self._random_delay(1, 2)
+                    memory.set(site, "consent_selector", patterns[index])
+                    self._wait_for_banner_dismissed(button)
                     return True
-                except (TimeoutException, NoSuchElementException):
-                    continue
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(0.15)
             
+            if known is None:
+                memory.set(site, "consent_selector", CONSENT_NONE)
+                memory.set(site, "consent_none_at", time.time())
             return False
         except Exception as e:
             logger.error(f"Cookie handling failed: {str(e)}")
             return False
 
+    def _wait_for_banner_dismissed(self, button, timeout=0.5):
+        """Wait for a clicked consent banner to leave the DOM instead of sleeping"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                EC.any_of(EC.staleness_of(button), EC.invisibility_of_element(button))
+            )
+        except TimeoutException:
+            pass
+
+    def _wait_until_ready(self, domain):
+        """Block only as long as the page actually takes to render its prices"""
+        strategy = get_site_scraper(domain).wait_strategy
+        started = time.monotonic()
+        ready = strategy.wait(self.driver)
+        elapsed = time.monotonic() - started
+        if ready:
+            logger.info(f"Page ready after {elapsed:.1f}s ({strategy!r})")
+        else:
+            logger.warning(f"Page not ready after {elapsed:.1f}s ({strategy!r}), extracting anyway")
+        return ready
+
+    def _collect_candidates(self, selectors, first_match_only=False):
+        """
+        Return (selector_index, text) for every visible element matched by ``selectors``,
+        in selector order then document order. XPaths start with '//', anything else is CSS.
+        With ``first_match_only`` querying stops at the first selector that matches anything.
+        """
+        if BATCH_EXTRACTION:
+            try:
+                return [(index, text) for index, text in self.driver.execute_script(COLLECT_CANDIDATES_SCRIPT, selectors, first_match_only)]
+            except WebDriverException as e:
+                logger.warning(f"Batch extraction failed, querying selectors one by one: {str(e)}")
+
+        candidates = []
+        for index, selector in enumerate(selectors):
+            try:
+                by = By.XPATH if selector.startswith('//') else By.CSS_SELECTOR
+                for element in self.driver.find_elements(by, selector):
+                    if element.is_displayed():
+                        candidates.append((index, element.text.strip()))
+            except Exception as e:
+                logger.error(f"Error with selector {selector}: {str(e)}")
+                continue
+            if first_match_only and candidates:
+                break
+        return candidates
+
     def _convert_currency(self, price_text, currency='GBP'):
         """Convert prices to GBP if needed"""
         if not price_text:
@@ -210,6 +366,47 @@ class FixedHolidayPriceScraper:
         except Exception as e:
             logger.error(f"Error saving individual result to CSV: {str(e)}")
 
+    def _page_text(self):
+        """Visible text of the loaded page"""
+        return self.driver.find_element(By.TAG_NAME, "body").text
+
+    def _current_url(self):
+        """URL of the loaded page after any redirects"""
+        return self.driver.current_url
+
+    def _load_page(self, clean_url, domain):
+        """Navigate, clear the consent banner and wait for the site's readiness condition"""
+        get_politeness_budget().wait_turn(domain.strip())
+        self._apply_resource_blocking(domain)
+        logger.info(f"Attempting to visit: {clean_url}")
+        self.driver.get(clean_url)
+        
+        self._handle_cookie_consent(domain)
+        
+        self._wait_until_ready(domain)
+
+    def _selector_stats(self, domain):
+        """Selector hit history used to order the site's selectors, best first"""
+        return get_selector_stats().for_domain(registrable_domain(domain))
+
+    def _selector_outcomes(self):
+        return [run.outcome() for run in self.selector_runs]
+
+    def _record_selector_outcomes(self, domain):
+        get_selector_stats().record(registrable_domain(domain), self._selector_outcomes())
+
+    def _extract_price_and_date(self, domain):
+        """Run the site-specific price and date extraction against the loaded page"""
+        self.selector_stats = self._selector_stats(domain)
+        self.selector_runs = []
+        page_text = self._page_text()
+        site = get_site_scraper(domain)
+        price = site.scrape_price(self)
+        departure_date = site.scrape_date(self, page_text)
+        self._record_selector_outcomes(domain)
+        
+        return price, departure_date
+
     def _scrape_price_and_date(self, url):
         """Enhanced price and date scraping with website-specific logic"""
         clean_url = self._clean_url(url)
@@ -219,52 +416,8 @@ class FixedHolidayPriceScraper:
         domain = urlparse(clean_url).netloc.replace('www.',' ')
         
         try:
-            logger.info(f"Attempting to visit: {clean_url}")
-            self.driver.get(clean_url)
-            
-            self._random_delay(9, 13)
-            
-            self._handle_cookie_consent()
-            
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            departure_date = self._extract_date(page_text)
-            
-            if 'firstchoice.co.uk' in domain:
-                price = self._scrape_firstchoice()
-                departure_date = self._scrape_firstchoice_date(page_text)
-            elif 'lastminute.com' in domain:
-                price = self._scrape_lastminute()
-                departure_date = self._scrape_lastminute_date(page_text)
-            elif 'loveholidays.com' in domain:
-                price = self._scrape_loveholidays_fixed()
-                departure_date = self._scrape_loveholidays_date(page_text)
-            elif 'onthebeach.co.uk' in domain:
-                price = self._scrape_onthebeach_fixed()
-                departure_date = self._scrape_onthebeach_date(page_text)
-            elif 'skyscanner.pk' in domain:
-                price = self._scrape_skyscanner_fixed()
-                departure_date = self._scrape_skyscanner_date(page_text)
-            elif 'expedia.co.uk' in domain:
-                price = self._scrape_expedia()
-                departure_date = self._scrape_expedia_date(page_text)
-            elif 'kayak.co.uk' in domain:
-                price = self._scrape_kayak()
-                departure_date = self._scrape_kayak_date(page_text)
-            elif 'tui.co.uk' in domain:
-                price = self._scrape_tui_fixed()
-                departure_date = self._scrape_tui_date(page_text)
-            elif 'jet2.com' in domain:
-                price = self._scrape_jet2()
-                departure_date = self._scrape_jet2_date(page_text)
-            else:
-                price = self._scrape_generic()
-                departure_date = self._extract_date(page_text)
-        
-            return price, departure_date
+            self._load_page(clean_url, domain)
+            return self._extract_price_and_date(domain)
         
         except WebDriverException as e:
             logger.error(f"WebDriver error for {clean_url}: {str(e)}")
@@ -273,898 +426,27 @@ class FixedHolidayPriceScraper:
             logger.error(f"Error scraping {clean_url}: {str(e)}")
             return "scraping error", "scraping error"
 
-    def _scrape_loveholidays_fixed(self):
-        """IMPROVED Love Holidays scraping"""
-        try:
-            WebDriverWait(self.driver, 30).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Total price')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'From £')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-                )
-            )
-            
-            self._random_delay(10, 13)
-            
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            logger.info(f"Love Holidays page text preview: {page_text[:500]}...")
-            
-            price_selectors = [
-                "//*[text()='Total price']/following-sibling::*[contains(text(), 'From £1,498')]",
-                "//*[text()='Total price']/following-sibling::*[contains(text(), 'From £1,4')]",
-                "//*[contains(text(), 'Total price')]/following-sibling::*[contains(text(), 'From £1,498')]",
-                "//*[contains(text(), 'Total price')]/following-sibling::*[contains(text(), 'From £1,4')]",
-                "//div[contains(@class, 'sidebar') or contains(@class, 'booking')]//span[contains(text(), 'From £1,498')]",
-                "//div[contains(@class, 'sidebar') or contains(@class, 'booking')]//span[contains(text(), 'From £1,4')]",
-                "//*[text()='From £1,498']",
-                "//*[contains(text(), 'From £1,498')]",
-                "//*[contains(text(), 'From £1,4') and contains(text(), '98')]",
-                "//*[contains(text(), 'Total price')]/parent::*//*[contains(text(), '£1,4')]",
-                "//*[contains(text(), 'Total price')]/ancestor::div[1]//*[contains(text(), '£1,4')]",
-                "//*[contains(text(), '£1,498')]",
-                "//*[contains(text(), '1,498')]",
-                "//*[contains(text(), '£1,4') and (contains(text(), '9') or contains(text(), '8'))]"
-            ]
-            
-            found_prices = []
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            logger.info(f"Love Holidays found element: '{price_text}'")
-                            
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                numbers = re.findall(r'£\s*[\d,]+\.?\d*', price_text)
-                                for number in numbers:
-                                    converted = self._convert_currency(number)
-                                    if converted:
-                                        numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                                        if 1495 <= numeric <= 1501:
-                                            priority = 0
-                                            found_prices.append((priority, numeric, converted, price_text))
-                                        elif 1400 <= numeric <= 1600:
-                                            priority = 1
-                                            found_prices.append((priority, numeric, converted, price_text))
-                                        elif 1000 <= numeric <= 2000:
-                                            priority = 2
-                                            found_prices.append((priority, numeric, converted, price_text))
-                except Exception as e:
-                    logger.error(f"Error with Love Holidays selector {selector}: {str(e)}")
-                    continue
-            
-            if found_prices:
-                found_prices.sort(key=lambda x: (x[0], abs(x[1] - 1498)))
-                logger.info(f"Love Holidays found prices: {[(p[3], p[2]) for p in found_prices[:5]]}")
-                return found_prices[0][2]
-            
-            specific_patterns = [
-                r'From £1,?498',
-                r'£1,?498',
-                r'Total price.*?From £1,?4\d{2}',
-                r'From £1,?4\d{2}',
-            ]
-            
-            for pattern in specific_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                if matches:
-                    logger.info(f"Love Holidays regex found: {matches}")
-                    for match in matches:
-                        converted = self._convert_currency(match)
-                        if converted:
-                            numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                            if 1400 <= numeric <= 1600:
-                                return converted
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in Love Holidays scraping: {str(e)}")
-            return "loveholidays scraping error"
-
-    def _scrape_loveholidays_date(self, page_text):
-        """Extract departure date from Love Holidays"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Date')]/following-sibling::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Departing') or contains(text(), 'Travel')]/parent::*//*[contains(text(), '202') or contains(text(), 'Nov') or contains(text(), '9')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"Love Holidays found date element: '{date_text}'")
-                            if 'Nov' in date_text or '9' in date_text:  # Target 9 Nov from URL
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with Love Holidays date selector {selector}: {str(e)}")
-                    continue
-            
-            # Fallback to URL parameter if not found in page
-            date_match = re.search(r'date=(\d{4}-\d{2}-\d{2})', self.driver.current_url)
-            if date_match:
-                return date_match.group(1)
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in Love Holidays date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_onthebeach_fixed(self):
-        """FIXED On The Beach scraping"""
-        try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-            )
-            
-            self._random_delay(9, 12)
-            
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            logger.info(f"On The Beach page text preview: {page_text[:500]}...")
-            
-            price_selectors = [
-                "//*[contains(text(), 'Total Price') or contains(text(), 'Total price')]/following::*[contains(text(), '£')][1]",
-                "//*[contains(text(), 'Total Price') or contains(text(), 'Total price')]/preceding::*[contains(text(), '£')][1]",
-                "//*[contains(text(), 'Total Price') or contains(text(), 'Total price')]//parent::*//*[contains(text(), '£')]",
-                "//*[contains(@class, 'booking-summary') or contains(@class, 'price-summary')]//span[contains(text(), '£')]",
-                "//*[contains(@class, 'total') or contains(@class, 'final')]//span[contains(text(), '£')]",
-                "//*[contains(text(), '£1,') and contains(text(), '3')]",
-                "//*[contains(text(), '£1,') and contains(text(), '0')]",
-                "//span[contains(text(), '£1,3') or contains(text(), '£1,2') or contains(text(), '£1,4')]",
-                "//*[contains(text(), '£1,')]",
-                "//*[contains(text(), '£2,')]"
-            ]
-            
-            found_prices = []
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            logger.info(f"On The Beach found element: '{price_text}'")
-                            
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                numbers = re.findall(r'£\s*[\d,]+\.?\d*', price_text)
-                                for number in numbers:
-                                    converted = self._convert_currency(number)
-                                    if converted:
-                                        numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                                        if 1200 <= numeric <= 1400:
-                                            priority = 1
-                                            found_prices.append((priority, numeric, converted, price_text))
-                                        elif 1000 <= numeric <= 2000:
-                                            priority = 2
-                                            found_prices.append((priority, numeric, converted, price_text))
-                except Exception as e:
-                    logger.error(f"Error with On The Beach selector {selector}: {str(e)}")
-                    continue
-            
-            if found_prices:
-                found_prices.sort(key=lambda x: (x[0], abs(x[1] - 1306)))
-                logger.info(f"On The Beach found prices: {[(p[3], p[2]) for p in found_prices[:5]]}")
-                return found_prices[0][2]
-            
-            high_value_patterns = [
-                r'£1,?3\d{2}',
-                r'£1,?[2-4]\d{2}',
-                r'Total.*?£1,?\d{3}',
-            ]
-            
-            for pattern in high_value_patterns:
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                if matches:
-                    logger.info(f"On The Beach regex found: {matches}")
-                    for match in matches:
-                        converted = self._convert_currency(match)
-                        if converted:
-                            numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                            if 1000 <= numeric <= 2000:
-                                return converted
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in On The Beach scraping: {str(e)}")
-            return "onthebeach scraping error"
-
-    def _scrape_onthebeach_date(self, page_text):
-        """Extract departure date from On The Beach"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jul') or contains(text(), '27')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"On The Beach found date element: '{date_text}'")
-                            if 'Jul' in date_text or '27' in date_text:  # Target 27 Jul from URL
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with On The Beach date selector {selector}: {str(e)}")
-                    continue
-            
-            # Fallback to URL parameter if not found in page
-            date_match = re.search(r'departureDate=(\d{4}-\d{2}-\d{2})', self.driver.current_url)
-            if date_match:
-                return date_match.group(1)
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in On The Beach date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_skyscanner_fixed(self):
-        """FIXED Skyscanner scraping"""
-        try:
-            WebDriverWait(self.driver, 25).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Rs')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'PKR')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-                )
-            )
-            
-            self._random_delay(10, 13)
-            
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            logger.info(f"Skyscanner page text preview: {page_text[:500]}...")
-            
-            price_selectors = [
-                "//*[@data-testid='price']",
-                "//*[contains(@class, 'Price')]",
-                "//*[contains(@class, 'BpkText') and (contains(text(), 'Rs') or contains(text(), 'PKR'))]",
-                "//*[contains(@class, 'FlightPrice')]",
-                "//span[contains(text(), 'Rs ') or contains(text(), 'PKR')]",
-                "//div[contains(text(), 'Rs ') or contains(text(), 'PKR')]",
-                "//button//*[contains(text(), 'Rs') or contains(text(), 'PKR')]",
-                "//*[contains(@class, 'price-text')]",
-                "//*[contains(@id, 'price')]"
-            ]
-            
-            found_prices = []
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            logger.info(f"Skyscanner found element: '{price_text}'")
-                            
-                            if ('Rs' in price_text or 'PKR' in price_text) and any(char.isdigit() for char in price_text):
-                                numeric_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                                if numeric_match:
-                                    price_value = float(numeric_match.group().replace(',', ''))
-                                    if 10000 <= price_value <= 500000:
-                                        pkr_price = f"Rs {price_value:,.0f}"
-                                        found_prices.append((price_value, pkr_price, price_text))
-                except Exception as e:
-                    logger.error(f"Error with Skyscanner selector {selector}: {str(e)}")
-                    continue
-            
-            if found_prices:
-                found_prices.sort(key=lambda x: x[0])
-                logger.info(f"Skyscanner found PKR prices: {[(p[2], p[1]) for p in found_prices[:5]]}")
-                return found_prices[0][1]
-            
-            pkr_patterns = [
-                r'Rs\s*[\d,]+\.?\d*',
-                r'PKR\s*[\d,]+\.?\d*'
-            ]
-            
-            for pattern in pkr_patterns:
-                matches = re.findall(pattern, page_text)
-                if matches:
-                    logger.info(f"Skyscanner regex found PKR: {matches}")
-                    valid_pkr_prices = []
-                    for match in matches:
-                        numeric_match = re.search(r'[\d,]+\.?\d*', match.replace(',', ''))
-                        if numeric_match:
-                            price_value = float(numeric_match.group().replace(',', ''))
-                            if 10000 <= price_value <= 500000:
-                                pkr_price = f"Rs {price_value:,.0f}"
-                                valid_pkr_prices.append((price_value, pkr_price))
-                    
-                    if valid_pkr_prices:
-                        valid_pkr_prices.sort(key=lambda x: x[0])
-                        return valid_pkr_prices[0][1]
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in Skyscanner scraping: {str(e)}")
-            return "skyscanner scraping error"
-
-    def _scrape_skyscanner_date(self, page_text):
-        """Extract departure date from Skyscanner"""
-        try:
-            date_selectors = [
-                "//*[contains(@class, 'date') or contains(@class, 'departure')]/span",
-                "//*[contains(text(), 'Depart') or contains(text(), 'Date')]/following::*[1]",
-                "//*[contains(@class, 'flight-date') or contains(@class, 'travel-date')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"Skyscanner found date element: '{date_text}'")
-                            if 'Sat' in date_text or '26' in date_text or '7' in date_text:  # Target Sat 26/7
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with Skyscanner date selector {selector}: {str(e)}")
-                    continue
-            
-            # Fallback to URL parameters
-            date_match = re.search(r'/(\d{6})/(\d{6})', self.driver.current_url)
-            if date_match:
-                outbound = date_match.group(1)
-                inbound = date_match.group(2)
-                day_out = outbound[:2]
-                month_out = outbound[2:4]
-                year_out = outbound[4:]
-                parsed_date = datetime.strptime(f"{year_out}-{month_out}-{day_out}", '%Y-%m-%d')
-                return parsed_date.strftime('%Y-%m-%d')
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in Skyscanner date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_tui_fixed(self):
-        """FIXED TUI scraping"""
-        try:
-            WebDriverWait(self.driver, 25).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Rs')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Total')]"))
-                )
-            )
-            
-            self._random_delay(10, 13)
-            
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            logger.info(f"TUI page text preview: {page_text[:500]}...")
-            
-            is_pkr_page = 'Rs' in page_text or 'PKR' in page_text
-            
-            price_selectors = [
-                "//*[@data-testid='price' or @data-testid='total-price']",
-                "//*[contains(@class, 'price-display') or contains(@class, 'total-price')]",
-                "//*[contains(@class, 'booking-total') or contains(@class, 'price-summary')]",
-                "//*[contains(text(), 'Total Price') or contains(text(), 'Total')]/following::*[contains(text(), '£') or contains(text(), 'Rs')][1]",
-                "//*[contains(text(), 'Total')]//*[contains(text(), '£') or contains(text(), 'Rs')]",
-                "//span[contains(text(), '£') or contains(text(), 'Rs')]",
-                "//div[contains(text(), '£') or contains(text(), 'Rs')]",
-                "//strong[contains(text(), '£') or contains(text(), 'Rs')]"
-            ]
-            
-            found_prices = []
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            logger.info(f"TUI found element: '{price_text}'")
-                            
-                            if is_pkr_page and ('Rs' in price_text or 'PKR' in price_text):
-                                numeric_match = re.search(r'[\d,]+\.?\d*', price_text.replace(',', ''))
-                                if numeric_match:
-                                    price_value = float(numeric_match.group().replace(',', ''))
-                                    if 50000 <= price_value <= 2000000:
-                                        pkr_price = f"Rs {price_value:,.0f}"
-                                        found_prices.append((price_value, pkr_price, price_text))
-                            elif '£' in price_text and any(char.isdigit() for char in price_text):
-                                converted = self._convert_currency(price_text)
-                                if converted:
-                                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                                    if 200 <= numeric <= 50000:
-                                        found_prices.append((numeric, converted, price_text))
-                except Exception as e:
-                    logger.error(f"Error with TUI selector {selector}: {str(e)}")
-                    continue
-            
-            if found_prices:
-                found_prices.sort(key=lambda x: x[0], reverse=True)
-                logger.info(f"TUI found prices: {[(p[2], p[1]) for p in found_prices[:5]]}")
-                return found_prices[0][1]
-            
-            if is_pkr_page:
-                pkr_matches = re.findall(r'Rs\s*[\d,]+\.?\d*', page_text)
-                if pkr_matches:
-                    logger.info(f"TUI PKR fallback found: {pkr_matches}")
-                    for match in pkr_matches:
-                        numeric_match = re.search(r'[\d,]+\.?\d*', match.replace(',', ''))
-                        if numeric_match:
-                            price_value = float(numeric_match.group().replace(',', ''))
-                            if 50000 <= price_value <= 2000000:
-                                return f"Rs {price_value:,.0f}"
-            else:
-                gbp_matches = re.findall(r'£\s*[\d,]+\.?\d*', page_text)
-                if gbp_matches:
-                    logger.info(f"TUI GBP fallback found: {gbp_matches}")
-                    for match in gbp_matches:
-                        converted = self._convert_currency(match)
-                        if converted:
-                            numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                            if 200 <= numeric <= 50000:
-                                return converted
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in TUI scraping: {str(e)}")
-            return "tui scraping error"
-
-    def _scrape_tui_date(self, page_text):
-        """Extract departure date from TUI"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jan') or contains(text(), 'Feb') or contains(text(), 'Mar') or contains(text(), 'Apr') or contains(text(), 'May') or contains(text(), 'Jun') or contains(text(), 'Jul') or contains(text(), 'Aug') or contains(text(), 'Sep') or contains(text(), 'Oct') or contains(text(), 'Nov') or contains(text(), 'Dec')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"TUI found date element: '{date_text}'")
-                            extracted_date = self._extract_date(date_text)
-                            if extracted_date != "date not found":
-                                return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with TUI date selector {selector}: {str(e)}")
-                    continue
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in TUI date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_firstchoice(self):
-        """Fixed First Choice scraping"""
-        try:
-            WebDriverWait(self.driver, 15).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Total price')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-                )
-            )
-            
-            price_selectors = [
-                "//*[contains(text(), 'Total price')]//following::*[contains(text(), '£')][1]",
-                "//*[contains(text(), 'Total price')]//preceding::*[contains(text(), '£')][1]",
-                "//*[contains(text(), 'Total price')]//parent::*//span[contains(text(), '£')]",
-                "//*[contains(@class, 'price-breakdown')]//span[contains(text(), '£')]",
-                "//*[contains(@class, 'total')]//span[contains(text(), '£')]",
-                "//span[contains(@class, 'price')]",
-                "//div[contains(@class, 'price')]",
-                "//*[@data-testid='price']",
-                "//strong[contains(text(), '£')]"
-            ]
-            
-            all_prices = []
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                converted = self._convert_currency(price_text)
-                                if converted:
-                                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                                    if 100 <= numeric <= 50000:
-                                        all_prices.append((numeric, converted, price_text))
-                except Exception:
-                    continue
-            
-            if all_prices:
-                all_prices.sort(key=lambda x: x[0], reverse=True)
-                logger.info(f"Found prices: {[p[2] for p in all_prices[:3]]}")
-                return all_prices[0][1]
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in First Choice scraping: {str(e)}")
-            return "firstchoice scraping error"
-
-    def _scrape_firstchoice_date(self, page_text):
-        """Extract departure date from First Choice"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Aug')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"First Choice found date element: '{date_text}'")
-                            if 'Aug' in date_text:  # Target August date
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with First Choice date selector {selector}: {str(e)}")
-                    continue
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in First Choice date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_lastminute(self):
-        """Scrape LastMinute.com"""
-        try:
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-            )
-            
-            price_selectors = [
-                "//*[@data-testid='price']",
-                "//span[contains(@class, 'price')]",
-                "//*[contains(@class, 'total-price')]",
-                "//div[contains(@class, 'price-display')]",
-                "//strong[contains(text(), '£')]"
-            ]
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                converted = self._convert_currency(price_text)
-                                if converted:
-                                    return converted
-                except Exception:
-                    continue
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in LastMinute scraping: {str(e)}")
-            return "lastminute scraping error"
-
-    def _scrape_lastminute_date(self, page_text):
-        """Extract departure date from LastMinute.com"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Aug') or contains(text(), '6')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"LastMinute found date element: '{date_text}'")
-                            if 'Aug' in date_text or '6' in date_text:  # Target 6 Aug from URL
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with LastMinute date selector {selector}: {str(e)}")
-                    continue
-            
-            # Fallback to URL parameter if not found in page
-            date_match = re.search(r'dateFrom=(\d{4}-\d{2}-\d{2})', self.driver.current_url)
-            if date_match:
-                return date_match.group(1)
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in LastMinute date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_expedia(self):
-        """Enhanced Expedia scraping"""
-        try:
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-            )
-            
-            price_selectors = [
-                "[data-test-id*='price']",
-                ".price-current",
-                ".full-price",
-                ".price-summary",
-                "//span[contains(@class, 'price')]",
-                "//div[contains(@class, 'price')]"
-            ]
-            
-            for selector in price_selectors:
-                try:
-                    if selector.startswith('//'):
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                converted = self._convert_currency(price_text)
-                                if converted:
-                                    return converted
-                except Exception:
-                    continue
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in Expedia scraping: {str(e)}")
-            return "expedia scraping error"
-
-    def _scrape_expedia_date(self, page_text):
-        """Extract departure date from Expedia"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Check-in')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jul') or contains(text(), '23')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"Expedia found date element: '{date_text}'")
-                            if 'Jul' in date_text or '23' in date_text:  # Target 23 Jul from URL
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with Expedia date selector {selector}: {str(e)}")
-                    continue
-            
-            # Fallback to URL parameter if not found in page
-            date_match = re.search(r'chkin=(\d{4}-\d{2}-\d{2})', self.driver.current_url)
-            if date_match:
-                return date_match.group(1)
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in Expedia date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_kayak(self):
-        """Scrape Kayak"""
-        try:
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-            )
-            
-            price_selectors = [
-                "//span[contains(@class, 'price')]",
-                "//*[@data-testid='price']",
-                "//div[contains(@class, 'price-text')]",
-                "//span[contains(text(), '£')]"
-            ]
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                converted = self._convert_currency(price_text)
-                                if converted:
-                                    return converted
-                except Exception:
-                    continue
-            
-            return "price not found"
-        
-        except Exception as e:
-            logger.error(f"Error in Kayak scraping: {str(e)}")
-            return "kayak scraping error"
-
-    def _scrape_kayak_date(self, page_text):
-        """Extract departure date from Kayak"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jul') or contains(text(), '26') or contains(text(), 'Sat')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"Kayak found date element: '{date_text}'")
-                            if 'Jul' in date_text or '26' in date_text or 'Sat' in date_text:  # Target Sat 26/7
-                                extracted_date = self._extract_date(date_text)
-                                if extracted_date != "date not found":
-                                    return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with Kayak date selector {selector}: {str(e)}")
-                    continue
-            
-            # Fallback to URL parameter if not found in page
-            date_match = re.search(r'/(\d{4}-\d{2}-\d{2})/(\d{4}-\d{2}-\d{2})', self.driver.current_url)
-            if date_match:
-                return date_match.group(1)  # Return outbound date
-            
-            return self._extract_date(page_text)
-        
-        except Exception as e:
-            logger.error(f"Error in Kayak date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_jet2(self):
-        """Fixed Jet2 scraping"""
-        try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]"))
-            )
-            
-            self._random_delay(3, 5)
-            
-            price_selectors = [
-                "//*[contains(text(), 'Total so far')]//following::*[contains(text(), '£')][1]",
-                "//*[contains(text(), 'Total')]//following::*[contains(text(), '£')][1]",
-                "//*[contains(@class, 'total')]//span[contains(text(), '£')]",
-                "//*[contains(@class, 'price-display')]//span[contains(text(), '£')]",
-                "//*[contains(@class, 'booking-total')]//span[contains(text(), '£')]",
-                "//*[contains(@class, 'price-summary')]//span[contains(text(), '£')]",
-                "//span[contains(@class, 'price')]",
-                "//*[@data-testid='price']",
-                "//div[contains(text(), '£')]"
-            ]
-            
-            all_prices = []
-            
-            for selector in price_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            price_text = element.text.strip()
-                            if '£' in price_text and any(char.isdigit() for char in price_text):
-                                converted = self._convert_currency(price_text)
-                                if converted:
-                                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                                    if 100 <= numeric <= 50000:
-                                        all_prices.append((numeric, converted, price_text))
-                except Exception:
-                    continue
-            
-            if all_prices:
-                all_prices.sort(key=lambda x: x[0], reverse=True)
-                logger.info(f"Found prices: {[p[2] for p in all_prices[:3]]}")
-                return all_prices[0][1]
-            
-            return "price not found"
+    def _capture_snapshot(self, url):
+        """
+        Load ``url`` and capture its page_source so extraction can run without holding the browser.
+        """
+        clean_url = self._clean_url(url)
+        if not clean_url:
+            return PageSnapshot(url, "", error="invalid url")
         
-        except Exception as e:
-            logger.error(f"Error in Jet2 scraping: {str(e)}")
-            return "jet2 scraping error"
-
-    def _scrape_jet2_date(self, page_text):
-        """Extract departure date from Jet2"""
-        try:
-            date_selectors = [
-                "//*[contains(text(), 'Depart') or contains(text(), 'Travel')]/following::*[1]",
-                "//*[contains(@class, 'departure-date') or contains(@class, 'travel-date')]",
-                "//*[contains(text(), 'Date')]/parent::*//*[contains(text(), '202') or contains(text(), 'Jan') or contains(text(), 'Feb') or contains(text(), 'Mar') or contains(text(), 'Apr') or contains(text(), 'May') or contains(text(), 'Jun') or contains(text(), 'Jul') or contains(text(), 'Aug') or contains(text(), 'Sep') or contains(text(), 'Oct') or contains(text(), 'Nov') or contains(text(), 'Dec')]"
-            ]
-            
-            for selector in date_selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed():
-                            date_text = element.text.strip()
-                            logger.info(f"Jet2 found date element: '{date_text}'")
-                            extracted_date = self._extract_date(date_text)
-                            if extracted_date != "date not found":
-                                return extracted_date
-                except Exception as e:
-                    logger.error(f"Error with Jet2 date selector {selector}: {str(e)}")
-                    continue
-            
-            return self._extract_date(page_text)
+        domain = urlparse(clean_url).netloc.replace('www.',' ')
         
-        except Exception as e:
-            logger.error(f"Error in Jet2 date scraping: {str(e)}")
-            return "date extraction error"
-
-    def _scrape_generic(self):
-        """Enhanced generic scraping"""
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), '£')]")),
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Rs')]"))
-                )
-            )
-            
-            body_text = self.driver.find_element(By.TAG_NAME, "body").text
-            
-            gbp_prices = re.findall(r'£\s*[\d,]+\.?\d*', body_text)
-            pkr_prices = re.findall(r'Rs\s*[\d,]+\.?\d*', body_text)
-            
-            all_prices = []
-            
-            for price in gbp_prices:
-                converted = self._convert_currency(price, 'GBP')
-                if converted:
-                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                    if 50 <= numeric <= 50000:
-                        all_prices.append((numeric, converted))
-            
-            for price in pkr_prices:
-                converted = self._convert_currency(price, 'PKR')
-                if converted:
-                    numeric = float(re.search(r'[\d,]+\.?\d*', converted.replace('£', '').replace(',', '')).group())
-                    if 50 <= numeric <= 50000:
-                        all_prices.append((numeric, converted))
-            
-            if all_prices:
-                return max(all_prices, key=lambda x: x[0])[1]
-            
-            return "price not found"
+            self._load_page(clean_url, domain)
+            return PageSnapshot(clean_url, domain, html=self.driver.page_source, current_url=self.driver.current_url,
+                                selector_stats=self._selector_stats(domain))
         
+        except WebDriverException as e:
+            logger.error(f"WebDriver error for {clean_url}: {str(e)}")
+            return PageSnapshot(clean_url, domain, error="webdriver error")
         except Exception as e:
-            logger.error(f"Error in generic scraping: {str(e)}")
-            return "generic scraping error"
-
-    def _scrape_generic_date(self, page_text):
-        """Extract departure date for generic scraping"""
-        return self._extract_date(page_text)
+            logger.error(f"Error scraping {clean_url}: {str(e)}")
+            return PageSnapshot(clean_url, domain, error="scraping error")
 
     def run_scraper(self, urls, output_file='fixed_prices.csv'):
         """Run fixed scraper for all URLs with immediate CSV saving"""
@@ -1200,9 +482,6 @@ class FixedHolidayPriceScraper:
             
             logger.info(f"Result: {price}, {departure_date}")
             print(f"{result['timestamp']},{result['url']},{result['price']},{result['departure_date']}")
-            
-            if i < len(urls):
-                self._random_delay(13, 20)
         
         try:
             logger.info(f"Final CSV verification for {output_file}:")
@@ -1224,6 +503,127 @@ class FixedHolidayPriceScraper:
         except Exception as e:
             logger.error(f"Error closing browser: {str(e)}")
 
+class PageSnapshot:
+    """A rendered page captured from the browser, or the error that prevented capturing it"""
+
+    def __init__(self, url, domain, html=None, current_url=None, error=None, selector_stats=None):
+        self.url = url
+        self.domain = domain
+        self.html = html
+        self.current_url = current_url or url
+        self.error = error
+        # The parent's selector history; worker processes don't share its site memory
+        self.selector_stats = selector_stats or {}
+
+
+class SnapshotScraper(FixedHolidayPriceScraper):
+    """
+    Runs the site-specific extraction on a captured page_source with lxml instead of a live DOM.
+
+    Visibility can't be computed without layout, so elements are treated as hidden only
+    when they or an ancestor are marked hidden in markup (hidden attribute, aria-hidden,
+    inline display:none / visibility:hidden).
+    """
+
+    HIDDEN_STYLE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.IGNORECASE)
+    BLOCK_TAGS = {
+        'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'fieldset',
+        'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header',
+        'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'td', 'th', 'ul'
+    }
+
+    def __init__(self, snapshot):
+        self.driver = None
+        self.snapshot = snapshot
+        self.document = lxml_html.fromstring(snapshot.html)
+        for element in self.document.xpath('//script | //style | //noscript | //template'):
+            element.drop_tree()
+        self._hidden_cache = {}
+
+    def _is_hidden_node(self, element):
+        if element.get('hidden') is not None or element.get('aria-hidden') == 'true':
+            return True
+        return bool(self.HIDDEN_STYLE.search(element.get('style') or ''))
+
+    def _is_visible(self, element):
+        for node in [element] + list(element.iterancestors()):
+            hidden = self._hidden_cache.get(node)
+            if hidden is None:
+                hidden = self._hidden_cache[node] = self._is_hidden_node(node)
+            if hidden:
+                return False
+        return True
+
+    def _inner_text(self, element):
+        """Approximate innerText: visible text with line breaks around block elements"""
+        parts = []
+
+        def walk(node):
+            if not isinstance(node.tag, str) or self._is_hidden_node(node):
+                return
+            block = node.tag in self.BLOCK_TAGS
+            if block:
+                parts.append('\n')
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if block:
+                parts.append('\n')
+
+        walk(element)
+        lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+    def _page_text(self):
+        body = self.document.find('.//body')
+        return self._inner_text(body if body is not None else self.document)
+
+    def _current_url(self):
+        return self.snapshot.current_url
+
+    def _selector_stats(self, domain):
+        return self.snapshot.selector_stats
+
+    def _record_selector_outcomes(self, domain):
+        pass  # outcomes travel back to the parent process with the result
+
+    def _collect_candidates(self, selectors, first_match_only=False):
+        candidates = []
+        for index, selector in enumerate(selectors):
+            try:
+                if selector.startswith('//'):
+                    elements = self.document.xpath(selector)
+                else:
+                    elements = self.document.cssselect(selector)
+            except Exception as e:
+                logger.error(f"Error with snapshot selector {selector}: {str(e)}")
+                continue
+            for element in elements:
+                if isinstance(getattr(element, 'tag', None), str) and self._is_visible(element):
+                    candidates.append((index, self._inner_text(element)))
+            if first_match_only and candidates:
+                break
+        return candidates
+
+    def close(self):
+        pass
+
+
+def extract_from_snapshot(snapshot):
+    """Process-pool entry point: (price, departure_date, selector_outcomes) for a captured page"""
+    if snapshot.error:
+        return snapshot.error, snapshot.error, []
+    try:
+        scraper = SnapshotScraper(snapshot)
+        price, departure_date = scraper._extract_price_and_date(snapshot.domain)
+        return price, departure_date, scraper._selector_outcomes()
+    except Exception as e:
+        logger.error(f"Error extracting snapshot of {snapshot.url}: {str(e)}")
+        return "scraping error", "scraping error", []
+
 def load_urls_from_csv(file_path):
     """Load URLs from CSV file with flexible column detection"""
     urls = []
@@ -0,0 +1,113 @@
+import re
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Query keys that only identify the visitor, campaign or session and never change the search
+TRACKING_PARAMS = {
+    'gclid', 'gbraid', 'wbraid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'ttclid', 'twclid', 'igshid',
+    '_ga', '_gl', '_hsenc', '_hsmi', 'mc_cid', 'mc_eid', 'mkt_tok', 'cmpid', 'affid', 'aff_id',
+    'affiliate', 'awc', 'clickid', 'ref', 'referrer',
+    'sessionid', 'session_id', 'sid', 'jsessionid', 'phpsessid', 'aspsessionid', 'sessiontoken',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_')
+SESSION_PATH_PARAM = re.compile(r';(?:jsessionid|phpsessid|sid|sessionid)=[^/?#]*', re.IGNORECASE)
+
+# Query keys holding a travel date; their values are rewritten in the site's date format
+DATE_PARAMS = {
+    'date', 'departuredate', 'departure_date', 'datefrom', 'dateto', 'returndate', 'return_date',
+    'startdate', 'enddate', 'checkin', 'checkout', 'chkin', 'chkout', 'fromdate', 'todate',
+}
+DATE_INPUT_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y%m%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y')
+
+
+def _split(url):
+    cleaned = url.strip('", \n\r\t')
+    if cleaned and not cleaned.lower().startswith(('http://', 'https://')):
+        cleaned = 'https://' + cleaned
+    return urlsplit(cleaned)
+
+
+def _normalize_host(hostname):
+    host = (hostname or '').lower().rstrip('.')
+    try:
+        return host.encode('idna').decode('ascii')
+    except UnicodeError:
+        return host
+
+
+def _normalize_date(value, date_format):
+    for input_format in DATE_INPUT_FORMATS:
+        try:
+            return datetime.strptime(value, input_format).strftime(date_format)
+        except ValueError:
+            continue
+    return value
+
+
+def _is_tracking_param(key, site):
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES) or key in site.ignored_params
+
+
+def canonicalize_url(url):
+    """
+    Normalise a tracked holiday URL so the same search always maps to the same key.
+
+    Tracking and session parameters are dropped, the remaining ones sorted, dates written
+    in one format and the host normalised, using the per-site rules of its SiteScraper.
+    """
+    from .sites import get_site_scraper
+
+    if not url:
+        return ""
+    parts = _split(url)
+    host = _normalize_host(parts.hostname)
+    site = get_site_scraper(host)
+    if site.canonical_host and host in (site.domain, 'www.' + site.domain):
+        host = site.canonical_host
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = SESSION_PATH_PARAM.sub('', parts.path) or '/'
+
+    date_params = DATE_PARAMS | set(site.date_params)
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if _is_tracking_param(key, site):
+            continue
+        if key.lower() in date_params:
+            value = _normalize_date(value, site.date_format)
+        params.append((key, value))
+    params.sort(key=lambda item: item[0])
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(params, safe=',:|'), ''))
+
+
+def url_domain(url):
+    """
+    Host of a tracked URL without the 'www.' prefix, used to group work per site.
+    """
+    host = _normalize_host(_split(url or '').hostname)
+    return host[4:] if host.startswith('www.') else host
+
+
+# Public suffixes with two labels that appear in the sites we scrape; enough to find the
+# registrable domain without shipping the full public suffix list
+MULTI_LABEL_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'ltd.uk', 'plc.uk',
+    'com.pk', 'org.pk', 'com.au', 'net.au', 'co.nz', 'co.za', 'co.in',
+    'com.br', 'com.mx', 'com.sg', 'com.tr', 'co.jp',
+}
+
+
+def registrable_domain(host_or_url):
+    """
+    Registrable domain (e.g. 'tui.co.uk') for a host or URL, used to key per-site scrapers.
+    """
+    host = (host_or_url or '').strip().lower()
+    if '/' in host:
+        host = _normalize_host(_split(host).hostname)
+    host = host.split(':')[0].strip('.')
+    labels = [label for label in host.split('.') if label]
+    if len(labels) >= 3 and '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
@@ -0,0 +1,194 @@
+import logging
+import os
+import random
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+logger = logging.getLogger('ScraperWaitStrategies')
+
+# Politeness budget: the minimum (randomised) gap between two requests to the same domain.
+# SCRAPER_POLITENESS_DELAY="min,max" sets the default, SCRAPER_POLITENESS_OVERRIDES
+# takes "domain=min:max" pairs, e.g. "tui.co.uk=4:8,loveholidays.com=3:6".
+DEFAULT_POLITENESS_DELAY = tuple(
+    float(v) for v in os.getenv("SCRAPER_POLITENESS_DELAY", "2,5").split(",")
+)
+DEFAULT_READY_TIMEOUT = float(os.getenv("SCRAPER_READY_TIMEOUT", "30"))
+
+
+def _parse_politeness_overrides(raw):
+    overrides = {}
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        domain, bounds = item.split("=", 1)
+        try:
+            low, high = (float(v) for v in bounds.split(":"))
+        except ValueError:
+            logger.warning(f"Ignoring malformed politeness override: {item}")
+            continue
+        overrides[domain.strip().lower()] = (low, high)
+    return overrides
+
+
+POLITENESS_OVERRIDES = _parse_politeness_overrides(os.getenv("SCRAPER_POLITENESS_OVERRIDES"))
+
+
+class WaitStrategy:
+    """
+    A readiness condition a site scraper declares for its pages.
+
+    ``wait`` blocks until the page is ready or ``timeout`` seconds pass and returns
+    whether the condition was met, so callers can still try to extract on a slow page.
+    """
+
+    def wait(self, driver, timeout=DEFAULT_READY_TIMEOUT):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+
+class ElementPresent(WaitStrategy):
+    """Ready as soon as any of the given XPaths (typically the price node) is in the DOM"""
+
+    def __init__(self, *xpaths):
+        self.xpaths = xpaths
+
+    def wait(self, driver, timeout=DEFAULT_READY_TIMEOUT):
+        conditions = [EC.presence_of_element_located((By.XPATH, xpath)) for xpath in self.xpaths]
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.2).until(EC.any_of(*conditions))
+            return True
+        except TimeoutException:
+            return False
+
+
+class NetworkIdle(WaitStrategy):
+    """Ready once the document has loaded and no new resource has been fetched for ``idle_ms``"""
+
+    _SCRIPT = """
+        const idleMs = arguments[0], deadline = Date.now() + arguments[1], done = arguments[2];
+        let lastCount = -1, quietSince = Date.now();
+        (function poll() {
+            const count = performance.getEntriesByType('resource').length;
+            if (count !== lastCount) { lastCount = count; quietSince = Date.now(); }
+            if (document.readyState === 'complete' && Date.now() - quietSince >= idleMs) return done(true);
+            if (Date.now() > deadline) return done(false);
+            setTimeout(poll, 100);
+        })();
+    """
+
+    def __init__(self, idle_ms=500):
+        self.idle_ms = idle_ms
+
+    def wait(self, driver, timeout=DEFAULT_READY_TIMEOUT):
+        return _run_async_wait(driver, self._SCRIPT, self.idle_ms, timeout)
+
+    def __repr__(self):
+        return f"NetworkIdle({self.idle_ms}ms)"
+
+
+class DomStable(WaitStrategy):
+    """Ready once the DOM has gone ``stable_ms`` without a mutation, e.g. after prices hydrate"""
+
+    _SCRIPT = """
+        const stableMs = arguments[0], deadline = Date.now() + arguments[1], done = arguments[2];
+        let timer = null, finished = false;
+        const finish = (result) => {
+            if (finished) return;
+            finished = true;
+            observer.disconnect();
+            clearTimeout(timer);
+            clearTimeout(giveUp);
+            done(result);
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(timer);
+            timer = setTimeout(() => finish(true), stableMs);
+        });
+        observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+        timer = setTimeout(() => finish(true), stableMs);
+        const giveUp = setTimeout(() => finish(false), Math.max(0, deadline - Date.now()));
+    """
+
+    def __init__(self, stable_ms=750):
+        self.stable_ms = stable_ms
+
+    def wait(self, driver, timeout=DEFAULT_READY_TIMEOUT):
+        return _run_async_wait(driver, self._SCRIPT, self.stable_ms, timeout)
+
+    def __repr__(self):
+        return f"DomStable({self.stable_ms}ms)"
+
+
+class AllOf(WaitStrategy):
+    """Apply several conditions in order, sharing a single timeout budget"""
+
+    def __init__(self, *strategies):
+        self.strategies = strategies
+
+    def wait(self, driver, timeout=DEFAULT_READY_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        ready = True
+        for strategy in self.strategies:
+            remaining = max(0.5, deadline - time.monotonic())
+            ready = strategy.wait(driver, remaining) and ready
+        return ready
+
+    def __repr__(self):
+        return f"AllOf({', '.join(repr(s) for s in self.strategies)})"
+
+
+def _run_async_wait(driver, script, window_ms, timeout):
+    try:
+        driver.set_script_timeout(timeout + 5)
+        return bool(driver.execute_async_script(script, window_ms, int(timeout * 1000)))
+    except TimeoutException:
+        return False
+
+
+class PolitenessBudget:
+    """
+    Per-domain politeness jitter, kept separate from page readiness.
+
+    Rather than sleeping a fixed amount after every page, a worker only waits when the
+    previous request to the same domain was more recent than that domain's jittered gap.
+    """
+
+    def __init__(self, default_delay=DEFAULT_POLITENESS_DELAY, overrides=None):
+        self.default_delay = default_delay
+        self.overrides = dict(POLITENESS_OVERRIDES if overrides is None else overrides)
+        self._lock = threading.Lock()
+        self._next_allowed = {}
+
+    def delay_for(self, domain):
+        domain = (domain or "").lower()
+        for key, bounds in self.overrides.items():
+            if domain == key or domain.endswith("." + key):
+                return bounds
+        return self.default_delay
+
+    def wait_turn(self, domain):
+        """Block until this domain may be requested again, then book the next slot"""
+        low, high = self.delay_for(domain)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(domain, now))
+            self._next_allowed[domain] = start + random.uniform(low, high)
+        pause = start - now
+        if pause > 0:
+            logger.info(f"Politeness pause of {pause:.1f}s before next request to {domain}")
+            time.sleep(pause)
+
+
+_politeness = PolitenessBudget()
+
+
+def get_politeness_budget():
+    """Process-wide budget so pooled browsers share per-domain spacing"""
+    return _politeness
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from app import models
+from app.alert_digest import DIGEST_MAX_DELAY_SECONDS, flush_alert_digests
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def _alert(db, user, url, price, age_seconds=0):
+    db.add(models.PendingAlert(
+        user_id=user.id, to_email=user.email, holiday_url=url, price=price,
+        created_at=NOW - timedelta(seconds=age_seconds)
+    ))
+    db.commit()
+
+
+def _user(db, email):
+    user = models.User(email=email)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_alerts_wait_for_the_digest_delay(db):
+    user = _user(db, "a@example.com")
+    _alert(db, user, "https://example.com/1", 90.0)
+
+    assert flush_alert_digests(db, now=NOW) == 0
+    assert flush_alert_digests(db, now=NOW + timedelta(seconds=DIGEST_MAX_DELAY_SECONDS)) == 1
+    assert db.query(models.PendingAlert).count() == 0
+
+
+def test_each_user_gets_one_email_for_all_their_alerts(db):
+    alice, bob = _user(db, "alice@example.com"), _user(db, "bob@example.com")
+    _alert(db, alice, "https://example.com/1", 90.0)
+    _alert(db, alice, "https://example.com/2", 80.0)
+    _alert(db, bob, "https://example.com/1", 90.0)
+
+    assert flush_alert_digests(db, force=True, now=NOW) == 2
+
+    emails = {email.to_email: email for email in db.query(models.EmailOutbox)}
+    assert set(emails) == {"alice@example.com", "bob@example.com"}
+    assert "2 holidays" in emails["alice@example.com"].subject
+    assert "https://example.com/1" in emails["alice@example.com"].body
+    assert "https://example.com/2" in emails["alice@example.com"].body
+    assert emails["bob@example.com"].subject == "Your Trip Snatchers Alert!"
+
+
+def test_only_users_with_a_due_alert_are_flushed(db):
+    due, recent = _user(db, "due@example.com"), _user(db, "recent@example.com")
+    _alert(db, due, "https://example.com/1", 90.0, age_seconds=DIGEST_MAX_DELAY_SECONDS)
+    # A newer alert rides along with the user's oldest one
+    _alert(db, due, "https://example.com/2", 80.0)
+    _alert(db, recent, "https://example.com/3", 70.0)
+
+    assert flush_alert_digests(db, now=NOW) == 1
+
+    assert [email.to_email for email in db.query(models.EmailOutbox)] == ["due@example.com"]
+    assert [alert.to_email for alert in db.query(models.PendingAlert)] == ["recent@example.com"]
+
+
+def test_flushed_alerts_are_not_mailed_again(session_factory):
+    first, second = session_factory(), session_factory()
+    try:
+        user = _user(first, "a@example.com")
+        _alert(first, user, "https://example.com/1", 90.0)
+
+        assert flush_alert_digests(first, force=True, now=NOW) == 1
+        assert flush_alert_digests(second, force=True, now=NOW) == 0
+        assert first.query(models.EmailOutbox).count() == 1
+    finally:
+        first.close()
+        second.close()
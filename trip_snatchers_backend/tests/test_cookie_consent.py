@@ -0,0 +1,57 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from scraping_scripts import test as scraper_module
+from scraping_scripts.site_memory import SiteMemory
+from scraping_scripts.test import CONSENT_NONE, CONSENT_NONE_TTL, FixedHolidayPriceScraper
+
+
+class _NoBannerDriver:
+    """Page without a consent banner; counts the in-page checks"""
+
+    def __init__(self):
+        self.checks = 0
+
+    def execute_script(self, script, *args):
+        self.checks += 1
+        return -1, None
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    memory = SiteMemory(path=None)
+    monkeypatch.setattr(scraper_module, "get_site_memory", lambda: memory)
+    monkeypatch.setattr(scraper_module, "CONSENT_WAIT", 0.3)
+    monkeypatch.setattr(scraper_module, "CONSENT_NONE_WAIT", 0.05)
+    return memory
+
+
+def _handle(driver, domain="example.com"):
+    started = time.monotonic()
+    FixedHolidayPriceScraper._handle_cookie_consent(SimpleNamespace(driver=driver), domain)
+    return time.monotonic() - started
+
+
+def test_domain_without_banner_is_remembered(memory):
+    assert _handle(_NoBannerDriver()) >= 0.3
+    assert memory.get("example.com", "consent_selector") == CONSENT_NONE
+
+
+def test_remembered_domain_still_polls_briefly_for_a_late_banner(memory):
+    _handle(_NoBannerDriver())
+
+    driver = _NoBannerDriver()
+    elapsed = _handle(driver)
+
+    assert 0.05 <= elapsed < 0.3
+    assert driver.checks > 1
+
+
+def test_no_banner_memory_expires(memory):
+    memory.set("example.com", "consent_selector", CONSENT_NONE)
+    memory.set("example.com", "consent_none_at", time.time() - CONSENT_NONE_TTL)
+
+    assert _handle(_NoBannerDriver()) >= 0.3
+    assert memory.get("example.com", "consent_none_at") > time.time() - 5
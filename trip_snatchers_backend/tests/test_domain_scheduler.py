@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from scraping_scripts.domain_scheduler import DomainLimits, DomainScheduler, TokenBucket
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = DomainScheduler(
+        workers=1,
+        limits={"paused.com": DomainLimits(0, 1, 1)},
+        default_limits=DomainLimits(600, 5, 2)
+    )
+    yield scheduler
+    scheduler.shutdown()
+
+
+def test_bucket_reports_the_wait_for_the_next_token():
+    bucket = TokenBucket(rate_per_min=60, burst=1)
+    assert bucket.try_take() == 0
+    assert 0 < bucket.try_take() <= 1
+
+
+def test_bucket_without_refill_reports_no_wait():
+    bucket = TokenBucket(rate_per_min=0, burst=1)
+    assert bucket.try_take() == 0
+    assert bucket.try_take() is None
+
+
+def test_paused_domain_fails_its_jobs_and_keeps_the_worker_alive(scheduler):
+    first = scheduler.submit("paused.com", lambda: "burst")
+    assert first.result(timeout=5) == "burst"
+
+    paused = scheduler.submit("paused.com", lambda: "never")
+    with pytest.raises(RuntimeError, match="paused"):
+        paused.result(timeout=5)
+
+    # Other domains are still served by the same worker
+    assert scheduler.submit("example.com", lambda: "ok").result(timeout=5) == "ok"
+    assert scheduler.stats()["paused.com"]["queued"] == 0
+
+
+def test_rate_limited_domain_waits_for_its_next_token(scheduler):
+    scheduler.limits["slow.com"] = DomainLimits(60, 1, 1)
+    started = time.monotonic()
+    futures = [scheduler.submit("slow.com", time.monotonic) for _ in range(2)]
+
+    first, second = (future.result(timeout=5) for future in futures)
+
+    assert first - started < 0.5
+    assert second - first >= 0.9
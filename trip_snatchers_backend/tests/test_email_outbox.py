@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+from app import models
+from app.email_outbox import (
+    BACKOFF_SECONDS, FAILED, LEASE_SECONDS, MAX_ATTEMPTS, MAX_BACKOFF_SECONDS, PENDING, SENT,
+    claim_due_emails, record_result, retry_delay
+)
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def _queue(db, to_email, due_at=NOW, attempts=0):
+    email = models.EmailOutbox(
+        to_email=to_email, subject="Subject", body="<p>Body</p>", attempts=attempts, next_attempt_at=due_at
+    )
+    db.add(email)
+    db.commit()
+    return email.id
+
+
+def test_claim_returns_due_emails_and_counts_the_attempt(db):
+    due = _queue(db, "due@example.com")
+    _queue(db, "later@example.com", due_at=NOW + timedelta(minutes=1))
+
+    claimed = claim_due_emails(db, now=NOW)
+
+    assert [(email.id, email.attempts) for email in claimed] == [(due, 1)]
+    row = db.get(models.EmailOutbox, due)
+    assert row.status == PENDING
+    assert row.next_attempt_at == NOW + timedelta(seconds=LEASE_SECONDS)
+
+
+def test_claimed_email_is_not_claimed_again_until_the_lease_expires(session_factory):
+    first, second = session_factory(), session_factory()
+    try:
+        email_id = _queue(first, "a@example.com")
+        assert len(claim_due_emails(first, now=NOW)) == 1
+
+        assert claim_due_emails(second, now=NOW) == []
+        assert claim_due_emails(second, now=NOW + timedelta(seconds=LEASE_SECONDS - 1)) == []
+
+        reclaimed = claim_due_emails(second, now=NOW + timedelta(seconds=LEASE_SECONDS))
+        assert [(email.id, email.attempts) for email in reclaimed] == [(email_id, 2)]
+    finally:
+        first.close()
+        second.close()
+
+
+def test_claim_respects_the_limit(db):
+    for i in range(3):
+        _queue(db, f"{i}@example.com", due_at=NOW - timedelta(minutes=i))
+
+    claimed = claim_due_emails(db, now=NOW, limit=2)
+
+    # Longest overdue first
+    assert {email.to_email for email in claimed} == {"2@example.com", "1@example.com"}
+    assert len(claim_due_emails(db, now=NOW)) == 1
+
+
+def test_sent_email_is_never_claimed_again(db):
+    email_id = _queue(db, "a@example.com")
+    email = claim_due_emails(db, now=NOW)[0]
+
+    record_result(db, email.id, email.attempts, now=NOW)
+
+    row = db.get(models.EmailOutbox, email_id)
+    db.refresh(row)
+    assert (row.status, row.sent_at, row.last_error) == (SENT, NOW, None)
+    assert claim_due_emails(db, now=NOW + timedelta(days=1)) == []
+
+
+def test_failed_send_is_retried_with_backoff(db):
+    email_id = _queue(db, "a@example.com")
+    email = claim_due_emails(db, now=NOW)[0]
+
+    record_result(db, email.id, email.attempts, error="timed out", now=NOW)
+
+    row = db.get(models.EmailOutbox, email_id)
+    db.refresh(row)
+    assert (row.status, row.last_error) == (PENDING, "timed out")
+    assert row.next_attempt_at == NOW + timedelta(seconds=BACKOFF_SECONDS)
+    assert claim_due_emails(db, now=row.next_attempt_at - timedelta(seconds=1)) == []
+    assert len(claim_due_emails(db, now=row.next_attempt_at)) == 1
+
+
+def test_email_fails_after_max_attempts(db):
+    email_id = _queue(db, "a@example.com", attempts=MAX_ATTEMPTS - 1)
+    email = claim_due_emails(db, now=NOW)[0]
+    assert email.attempts == MAX_ATTEMPTS
+
+    record_result(db, email.id, email.attempts, error="refused", now=NOW)
+
+    row = db.get(models.EmailOutbox, email_id)
+    db.refresh(row)
+    assert (row.status, row.last_error) == (FAILED, "refused")
+    assert claim_due_emails(db, now=NOW + timedelta(days=1)) == []
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert retry_delay(1) == BACKOFF_SECONDS
+    assert retry_delay(2) == BACKOFF_SECONDS * 2
+    assert retry_delay(3) == BACKOFF_SECONDS * 4
+    assert retry_delay(100) == MAX_BACKOFF_SECONDS
@@ -0,0 +1,59 @@
+from email import message_from_string
+
+from app import email_templates
+from app.email_templates import EmailTemplate, render_price_alert, render_price_alert_digest
+from app.email_utils import build_message, verification_email
+
+HOSTILE_URL = 'https://example.com/?a=1&b="><script>alert(1)</script>'
+
+
+def test_context_values_are_escaped():
+    _, body = render_price_alert(HOSTILE_URL, 99.5)
+
+    assert "<script>" not in body
+    assert "&lt;script&gt;" in body
+    assert 'href="https://example.com/?a=1&amp;b=&quot;&gt;' in body
+    assert "€99.5" in body
+
+
+def test_html_fields_are_inserted_as_they_are():
+    template = EmailTemplate("{title}", "<p>{text}</p>{rows_html}", wrap=False)
+
+    subject, body = template.render(title="Hi", text="<b>", rows_html="<tr></tr>")
+
+    assert subject == "Hi"
+    assert body == "<p>&lt;b&gt;</p><tr></tr>"
+
+
+def test_templates_are_wrapped_in_the_shared_layout():
+    _, body = render_price_alert("https://example.com/", 10)
+
+    assert body.startswith(email_templates.HEADER)
+    assert body.endswith(email_templates.FOOTER)
+
+
+def test_digest_lists_every_alert_and_escapes_each_row():
+    subject, body = render_price_alert_digest([("https://example.com/1", 90.0), (HOSTILE_URL, 80.0)])
+
+    assert subject == "Your Trip Snatchers Alert: 2 holidays hit your target price!"
+    assert body.count("<tr>") == 2
+    assert "https://example.com/1" in body
+    assert "<script>" not in body
+
+
+def test_price_alert_is_rendered_once_per_url_and_price():
+    render_price_alert.cache_clear()
+    first = render_price_alert("https://example.com/", 10)
+
+    assert render_price_alert("https://example.com/", 10) is first
+    assert render_price_alert.cache_info().hits == 1
+
+
+def test_built_message_is_one_utf8_html_part():
+    subject, body = verification_email("token")
+    msg = message_from_string(build_message("a@example.com", subject, body).as_string())
+
+    assert (msg["To"], msg["Subject"]) == ("a@example.com", "Verify Your Trip Snatchers Account")
+    assert msg.get_content_type() == "text/html"
+    assert msg.get_content_charset() == "utf-8"
+    assert "verify-email?token=token" in msg.get_payload(decode=True).decode("utf-8")
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.password_hasher import PasswordHasher, build_context
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, context=build_context(rounds=4))
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_verifies_and_is_counted(hasher):
+    async def run():
+        hashed = await hasher.hash("secret")
+        return hashed, await hasher.verify_and_update("secret", hashed), await hasher.verify_and_update("wrong", hashed)
+
+    hashed, right, wrong = asyncio.run(run())
+
+    assert right == (True, None)
+    assert wrong == (False, None)
+    stats = hasher.stats()
+    assert (stats["completed"], stats["running"], stats["queued"], stats["rehashed"]) == (3, 0, 0, 0)
+
+
+def test_hash_below_the_current_cost_is_replaced():
+    old_hash = build_context(rounds=4).hash("secret")
+    hasher = PasswordHasher(workers=1, context=build_context(rounds=5))
+    try:
+        valid, new_hash = asyncio.run(hasher.verify_and_update("secret", old_hash))
+    finally:
+        hasher.shutdown()
+
+    assert valid
+    assert new_hash and "$05$" in new_hash
+    assert hasher.stats()["rehashed"] == 1
+
+
+def test_cancelled_requests_leave_the_counts_right(hasher):
+    release = threading.Event()
+
+    async def run():
+        running = asyncio.ensure_future(hasher._run(release.wait))
+        queued = asyncio.ensure_future(hasher._run(lambda: "never"))
+        await asyncio.sleep(0.05)
+        assert (hasher.stats()["running"], hasher.stats()["queued"]) == (1, 1)
+
+        running.cancel()
+        queued.cancel()
+        await asyncio.sleep(0.05)
+        # The running job still holds its worker; the queued one is gone without running
+        assert (hasher.stats()["running"], hasher.stats()["queued"], hasher.stats()["completed"]) == (1, 0, 0)
+
+        release.set()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    stats = hasher.stats()
+    assert (stats["running"], stats["queued"], stats["completed"]) == (0, 0, 1)
+
+
+def test_refused_submit_releases_its_queue_slot(hasher):
+    hasher.shutdown()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(hasher.hash("secret"))
+    assert hasher.stats()["queued"] == 0
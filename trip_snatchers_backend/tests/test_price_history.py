@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+
+from app import models
+from app.price_history import (
+    DAY, HOUR, HOURLY_RETENTION_DAYS, RAW_RETENTION_DAYS, compact_price_history, get_price_series
+)
+
+START = datetime(2026, 1, 1, 10, 0)
+
+
+@pytest.fixture
+def holiday_url_id(db):
+    holiday_url = models.HolidayUrl(url="https://example.com/holiday")
+    db.add(holiday_url)
+    db.commit()
+    return holiday_url.id
+
+
+def _observe(db, holiday_url_id, *points):
+    for minutes, price in points:
+        db.add(models.PriceObservation(
+            holiday_url_id=holiday_url_id, observed_at=START + timedelta(minutes=minutes), price=price
+        ))
+    db.commit()
+
+
+def _total_samples(db):
+    rolled = db.query(func.coalesce(func.sum(models.PriceRollup.samples), 0)).scalar()
+    return rolled + db.query(models.PriceObservation).count()
+
+
+def _rollups(db, resolution):
+    return db.query(models.PriceRollup).filter(models.PriceRollup.resolution == resolution)\
+        .order_by(models.PriceRollup.bucket_start).all()
+
+
+def test_old_observations_fold_into_hourly_rollups(db, holiday_url_id):
+    _observe(db, holiday_url_id, (5, 100.0), (30, 80.0), (50, 90.0), (70, 70.0))
+    now = START + timedelta(days=RAW_RETENTION_DAYS, hours=3)
+    _observe(db, holiday_url_id, ((now - START).total_seconds() / 60 - 5, 60.0))
+
+    compact_price_history(db, now=now)
+
+    first, second = _rollups(db, HOUR)
+    assert (first.bucket_start, first.min_price, first.max_price, first.last_price, first.samples) == \
+        (START, 80.0, 100.0, 90.0, 3)
+    assert first.last_observed_at == START + timedelta(minutes=50)
+    assert (second.bucket_start, second.last_price, second.samples) == (START + timedelta(hours=1), 70.0, 1)
+    # The recent observation stays raw
+    assert [o.price for o in db.query(models.PriceObservation)] == [60.0]
+
+
+def test_compaction_is_idempotent(db, holiday_url_id):
+    _observe(db, holiday_url_id, (5, 100.0), (30, 80.0), (70, 70.0))
+    now = START + timedelta(days=RAW_RETENTION_DAYS, hours=3)
+
+    compact_price_history(db, now=now)
+    after_first = [(r.bucket_start, r.min_price, r.max_price, r.last_price, r.samples) for r in _rollups(db, HOUR)]
+    compact_price_history(db, now=now)
+
+    assert [(r.bucket_start, r.min_price, r.max_price, r.last_price, r.samples) for r in _rollups(db, HOUR)] \
+        == after_first
+    assert _total_samples(db) == 3
+
+
+def test_late_observation_merges_into_existing_bucket(db, holiday_url_id):
+    _observe(db, holiday_url_id, (5, 100.0), (30, 80.0))
+    now = START + timedelta(days=RAW_RETENTION_DAYS, hours=3)
+    compact_price_history(db, now=now)
+
+    _observe(db, holiday_url_id, (55, 60.0), (10, 120.0))
+    compact_price_history(db, now=now)
+
+    (bucket,) = _rollups(db, HOUR)
+    assert (bucket.min_price, bucket.max_price, bucket.last_price, bucket.samples) == (60.0, 120.0, 60.0, 4)
+    assert bucket.last_observed_at == START + timedelta(minutes=55)
+
+
+def test_old_hourly_rollups_fold_into_daily_ones(db, holiday_url_id):
+    _observe(db, holiday_url_id, (5, 100.0), (70, 80.0), (130, 90.0), (60 * 24 + 5, 50.0))
+    compact_price_history(db, now=START + timedelta(days=RAW_RETENTION_DAYS + 2))
+    assert len(_rollups(db, HOUR)) == 4
+
+    now = START + timedelta(days=HOURLY_RETENTION_DAYS + 2)
+    compact_price_history(db, now=now)
+    compact_price_history(db, now=now)
+
+    assert _rollups(db, HOUR) == []
+    first, second = _rollups(db, DAY)
+    assert (first.bucket_start, first.min_price, first.max_price, first.last_price, first.samples) == \
+        (START.replace(hour=0), 80.0, 100.0, 90.0, 3)
+    assert (second.bucket_start, second.last_price, second.samples) == \
+        (START.replace(hour=0) + timedelta(days=1), 50.0, 1)
+    assert _total_samples(db) == 4
+
+
+def test_series_within_budget_is_returned_as_stored(db, holiday_url_id):
+    _observe(db, holiday_url_id, (0, 100.0), (10, 90.0))
+
+    assert get_price_series(db, holiday_url_id, points=5) == (0, [
+        (START, 100.0, 100.0, 100.0),
+        (START + timedelta(minutes=10), 90.0, 90.0, 90.0),
+    ])
+
+
+def test_series_is_downsampled_into_equal_buckets(db, holiday_url_id):
+    prices = [100.0, 95.0, 105.0, 90.0, 80.0, 85.0, 70.0, 75.0, 60.0, 65.0]
+    _observe(db, holiday_url_id, *((minute, price) for minute, price in enumerate(prices)))
+
+    bucket_seconds, series = get_price_series(db, holiday_url_id, points=4)
+
+    # 9 minutes span, plus one second so the last point falls inside the last bucket
+    assert bucket_seconds == 136
+    assert len(series) <= 4
+    assert series == [
+        (START, 95.0, 105.0, 105.0),
+        (START + timedelta(seconds=136), 80.0, 90.0, 80.0),
+        (START + timedelta(seconds=272), 70.0, 85.0, 70.0),
+        (START + timedelta(seconds=408), 60.0, 75.0, 65.0),
+    ]
+
+
+def test_series_combines_rollups_and_recent_observations(db, holiday_url_id):
+    _observe(db, holiday_url_id, (5, 100.0), (30, 80.0), (70, 70.0))
+    now = START + timedelta(days=RAW_RETENTION_DAYS, hours=3)
+    compact_price_history(db, now=now)
+    _observe(db, holiday_url_id, ((now - START).total_seconds() / 60, 50.0))
+
+    bucket_seconds, series = get_price_series(db, holiday_url_id, points=10)
+
+    assert bucket_seconds == 0
+    assert [(low, high, last) for _, low, high, last in series] == [
+        (80.0, 100.0, 80.0), (70.0, 70.0, 70.0), (50.0, 50.0, 50.0)
+    ]
@@ -0,0 +1,144 @@
+import smtplib
+import threading
+import time
+from email.mime.text import MIMEText
+
+import pytest
+
+from app import smtp_pool
+from app.smtp_pool import SmtpPool
+
+
+class FakeSMTP:
+    """Records logins and sends; ``fail_next`` makes the next send raise that exception"""
+
+    instances = []
+    delay = 0
+
+    def __init__(self, host, port, timeout=None):
+        self.logins = 0
+        self.sent = []
+        self.resets = 0
+        self.closed = False
+        self.fail_next = None
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        if self.fail_next is not None:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        time.sleep(self.delay)
+        self.sent.append(msg["To"])
+
+    def rset(self):
+        self.resets += 1
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(FakeSMTP, "delay", 0)
+    monkeypatch.setattr(smtp_pool.smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+def _message(to):
+    msg = MIMEText("body")
+    msg["To"] = to
+    return msg
+
+
+def _pool(**kwargs):
+    return SmtpPool("smtp.example.com", 587, "user", "secret", **kwargs)
+
+
+def test_sessions_are_reused_for_many_messages():
+    pool = _pool(size=2)
+    for i in range(5):
+        pool.send(_message(f"{i}@example.com"))
+
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+    assert pool.stats()["sent"] == 5
+
+
+def test_concurrent_sends_never_open_more_than_size_sessions():
+    pool = _pool(size=2)
+    FakeSMTP.delay = 0.05
+    threads = [threading.Thread(target=pool.send, args=(_message(f"{i}@example.com"),)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(FakeSMTP.instances) == 2
+    assert sum(len(smtp.sent) for smtp in FakeSMTP.instances) == 8
+
+
+def test_session_is_replaced_after_max_messages():
+    pool = _pool(size=1, max_messages=2)
+    for i in range(3):
+        pool.send(_message(f"{i}@example.com"))
+
+    first, second = FakeSMTP.instances
+    assert (len(first.sent), first.closed) == (2, True)
+    assert len(second.sent) == 1
+
+
+def test_idle_session_is_replaced_rather_than_tried():
+    pool = _pool(size=1, max_idle_seconds=0)
+    pool.send(_message("a@example.com"))
+    time.sleep(0.01)
+    pool.send(_message("b@example.com"))
+
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].closed
+
+
+def test_dropped_session_is_reconnected_and_the_message_retried_once():
+    pool = _pool(size=1)
+    pool.send(_message("a@example.com"))
+    FakeSMTP.instances[0].fail_next = smtplib.SMTPServerDisconnected("gone")
+
+    pool.send(_message("b@example.com"))
+
+    first, second = FakeSMTP.instances
+    assert first.closed
+    assert second.sent == ["b@example.com"]
+    assert pool.stats()["reconnects"] == 1
+
+
+def test_refused_message_keeps_the_session():
+    pool = _pool(size=1)
+    pool.send(_message("a@example.com"))
+    FakeSMTP.instances[0].fail_next = smtplib.SMTPRecipientsRefused({"b@example.com": (550, b"no")})
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send(_message("b@example.com"))
+    pool.send(_message("c@example.com"))
+
+    (smtp,) = FakeSMTP.instances
+    assert smtp.resets == 1
+    assert smtp.sent == ["a@example.com", "c@example.com"]
+
+
+def test_closed_pool_logs_out_and_refuses_sends():
+    pool = _pool(size=1)
+    pool.send(_message("a@example.com"))
+    pool.close()
+
+    assert FakeSMTP.instances[0].closed
+    with pytest.raises(RuntimeError):
+        pool.send(_message("b@example.com"))
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models, snatch_engine
+
+
+@pytest.fixture(autouse=True)
+def wakes(monkeypatch):
+    """Count dispatcher wake-ups instead of starting the real dispatcher"""
+    calls = []
+    monkeypatch.setattr(snatch_engine, "wake_email_dispatcher", lambda: calls.append(1))
+    return calls
+
+
+def _add_track(db, target_price=100.0, latest_price=90.0, email="a@example.com"):
+    user = db.query(models.User).filter(models.User.email == email).first()
+    if user is None:
+        user = models.User(email=email)
+        db.add(user)
+    holiday_url = models.HolidayUrl(url=f"https://example.com/{email}", latest_price=latest_price)
+    track = models.HolidayTrack(
+        user=user, holiday_url=holiday_url, url=holiday_url.url, target_price=target_price
+    )
+    db.add(track)
+    db.commit()
+    return track
+
+
+def _pending_matches(db):
+    return db.query(*snatch_engine._track_columns(), models.HolidayUrl.latest_price.label("price"))\
+        .join(models.HolidayUrl, models.HolidayTrack.holiday_url_id == models.HolidayUrl.id)\
+        .join(models.User, models.HolidayTrack.user_id == models.User.id)\
+        .filter(models.HolidayTrack.is_active == True).all()
+
+
+def test_snatch_writes_deal_and_alert_and_deactivates(db, wakes):
+    track = _add_track(db)
+
+    assert snatch_engine.evaluate_snatches(db) == 1
+
+    db.refresh(track)
+    assert not track.is_active
+    deal = db.query(models.SnatchedDeal).one()
+    assert (deal.holiday_track_id, deal.snatched_price, deal.target_price) == (track.id, 90.0, 100.0)
+    alert = db.query(models.PendingAlert).one()
+    assert (alert.to_email, alert.price) == ("a@example.com", 90.0)
+    assert wakes == [1]
+
+
+def test_price_above_target_is_not_snatched(db, wakes):
+    track = _add_track(db, target_price=80.0)
+
+    assert snatch_engine.snatch_for_price(db, track.holiday_url_id, 85.0) == 0
+    assert db.query(models.SnatchedDeal).count() == 0
+    assert wakes == []
+
+
+def test_stale_matches_snatch_a_track_once(session_factory, wakes):
+    """Two workers that both saw the track active: only the first compare-and-set wins"""
+    first, second = session_factory(), session_factory()
+    try:
+        _add_track(first)
+        first_matches, second_matches = _pending_matches(first), _pending_matches(second)
+
+        assert snatch_engine._snatch(first, first_matches) == 1
+        assert snatch_engine._snatch(second, second_matches) == 0
+
+        assert first.query(models.SnatchedDeal).count() == 1
+        assert first.query(models.PendingAlert).count() == 1
+        assert wakes == [1]
+    finally:
+        first.close()
+        second.close()
+
+
+def test_concurrent_snatches_of_one_track_write_one_deal(tmp_path, wakes):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    setup = Session()
+    _add_track(setup)
+    setup.close()
+
+    barrier = threading.Barrier(2)
+    results = []
+
+    def worker():
+        db = Session()
+        try:
+            matches = _pending_matches(db)
+            db.commit()  # release the read transaction so both writers only meet at the update
+            barrier.wait()
+            results.append(snatch_engine._snatch(db, matches))
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    check = Session()
+    try:
+        assert sorted(results) == [0, 1]
+        assert check.query(models.SnatchedDeal).count() == 1
+        assert check.query(models.PendingAlert).count() == 1
+    finally:
+        check.close()
+        engine.dispose()
+
+
+def test_batch_snatches_only_the_tracks_it_claims(db, wakes):
+    cheap = _add_track(db, email="a@example.com")
+    other = _add_track(db, email="b@example.com")
+    matches = _pending_matches(db)
+    db.query(models.HolidayTrack).filter(models.HolidayTrack.id == other.id).update({"is_active": False})
+    db.commit()
+
+    assert snatch_engine._snatch(db, matches) == 1
+    assert [deal.holiday_track_id for deal in db.query(models.SnatchedDeal)] == [cheap.id]